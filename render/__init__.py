@@ -0,0 +1,4 @@
+# NanoChat Manim Video render tooling.
+#
+# Each module is a standalone tool run from the repository root, e.g.
+#   uv run python -m render.adaptive IntroScene -q h
@@ -0,0 +1,186 @@
+"""
+Adaptive frame rate rendering.
+
+Low-motion stretches of a scene (slow fades, static waits) are rasterized at a
+reduced internal rate: after every rasterized frame the pixel delta to the
+previous one decides how many of the following frames reuse it instead of
+being drawn again. Reused frames are not re-encoded either; the encoder holds
+the previous frame for a longer duration, so the output keeps the scene frame
+rate (60 fps at -qh) with variable frame durations.
+
+Usage:
+    uv run python -m render.adaptive IntroScene -q h
+    uv run python -m render.adaptive TransformerScene -q h --max-stride 8 --cfr
+"""
+
+import av
+import numpy as np
+from manim import logger, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from .common import build_parser, get_scene_class, scene_config
+
+
+def frame_delta(previous, frame, step: int = 4) -> float:
+    """Mean absolute RGB difference of two frames in [0, 1], on a sparse grid."""
+    a = previous[::step, ::step, :3].astype(np.int16)
+    b = frame[::step, ::step, :3].astype(np.int16)
+    return float(np.abs(a - b).mean()) / 255
+
+
+# =============================================================================
+# Encoder
+# =============================================================================
+
+class VariableFrameRateWriter(SceneFileWriter):
+    """
+    Scene file writer that encodes a repeated frame once.
+
+    A frame object handed over again (by ``AdaptiveRenderer``) or written with
+    ``num_frames > 1`` (static waits) only advances the presentation timestamp,
+    so the previous frame is shown for longer. When the renderer asks for a
+    constant frame rate the duplicates are encoded as usual.
+    """
+
+    def __init__(self, renderer, scene_name: str, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.frames_written = 0
+        self.frames_held = 0
+
+    def open_partial_movie_stream(self, file_path=None):
+        self._pts = 0
+        self._held_frame = None
+        self._held_pts = 0
+        super().open_partial_movie_stream(file_path)
+        if getattr(self.renderer, "variable_frame_rate", True):
+            # B-frame reordering makes x264 emit timestamps that hide the gaps
+            # between held frames, so the muxer would drop their durations
+            self.video_stream.codec_context.max_b_frames = 0
+
+    def encode_and_write_frame(self, frame, num_frames: int) -> None:
+        self.frames_written += num_frames
+        if not getattr(self.renderer, "variable_frame_rate", True):
+            super().encode_and_write_frame(frame, num_frames)
+            return
+        if frame is not self._held_frame:
+            self._encode_at(frame, self._pts)
+            self._held_frame = frame
+            self._held_pts = self._pts
+            num_frames -= 1
+            self._pts += 1
+        self.frames_held += num_frames
+        self._pts += num_frames
+
+    def close_partial_movie_stream(self) -> None:
+        self.queue.put((-1, None))
+        self.writer_thread.join()
+
+        # Repeat the held frame on the last tick so the clip keeps its duration
+        if self._held_frame is not None and self._pts - 1 > self._held_pts:
+            self._encode_at(self._held_frame, self._pts - 1)
+
+        for packet in self.video_stream.encode():
+            self.video_container.mux(packet)
+        self.video_container.close()
+
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
+
+    def _encode_at(self, frame, pts: int) -> None:
+        av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+        # The codec time base is 1 / frame_rate, so pts counts output frames
+        av_frame.pts = pts
+        for packet in self.video_stream.encode(av_frame):
+            self.video_container.mux(packet)
+
+
+# =============================================================================
+# Renderer
+# =============================================================================
+
+class AdaptiveRenderer(CairoRenderer):
+    """
+    Cairo renderer that skips rasterizing frames while the picture barely moves.
+
+    After each rasterized frame, a delta below ``threshold`` doubles the stride
+    (up to ``max_stride``) and a larger delta resets it to 1. Frames inside a
+    stride reuse the last rasterized frame. Every ``play()`` starts afresh,
+    with a rasterized frame and a stride of 1.
+    """
+
+    def __init__(self, threshold: float = 0.002, max_stride: int = 4,
+                 variable_frame_rate: bool = True, **kwargs):
+        kwargs.setdefault("file_writer_class", VariableFrameRateWriter)
+        super().__init__(**kwargs)
+        self.threshold = threshold
+        self.max_stride = max_stride
+        self.variable_frame_rate = variable_frame_rate
+        self.stride = 1
+        self.frames_rasterized = 0
+        self.frames_reused = 0
+        self._last_frame = None
+        self._frames_to_reuse = 0
+
+    def play(self, scene, *args, **kwargs):
+        # A fast cut after a static play must not inherit its stride
+        self.stride = 1
+        self._last_frame = None
+        self._frames_to_reuse = 0
+        super().play(scene, *args, **kwargs)
+
+    def render(self, scene, time, moving_mobjects=None):
+        if self._frames_to_reuse > 0:
+            self._frames_to_reuse -= 1
+            self.frames_reused += 1
+            self.add_frame(self._last_frame)
+            return
+
+        self.update_frame(scene, moving_mobjects)
+        frame = self.get_frame()
+        self.frames_rasterized += 1
+        if self._last_frame is not None:
+            if frame_delta(self._last_frame, frame) < self.threshold:
+                self.stride = min(self.stride * 2, self.max_stride)
+            else:
+                self.stride = 1
+        self._last_frame = frame
+        self._frames_to_reuse = self.stride - 1
+        self.add_frame(frame)
+
+
+def main():
+    parser = build_parser("Render a scene with an adaptive internal frame rate.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.002,
+        help="Mean pixel delta below which a segment counts as low motion",
+    )
+    parser.add_argument(
+        "--max-stride", type=int, default=4,
+        help="Render at most every N-th frame in low-motion segments",
+    )
+    parser.add_argument(
+        "--cfr", action="store_true",
+        help="Encode reused frames as duplicates instead of longer frame durations",
+    )
+    args = parser.parse_args()
+
+    scene_cls = get_scene_class(args.scene)
+    with tempconfig(scene_config(scene_cls, args.quality)):
+        renderer = AdaptiveRenderer(
+            threshold=args.threshold,
+            max_stride=args.max_stride,
+            variable_frame_rate=not args.cfr,
+        )
+        scene_cls(renderer=renderer).render()
+
+    writer = renderer.file_writer
+    total = renderer.frames_rasterized + renderer.frames_reused
+    print(f"{scene_cls.__name__}: rasterized {renderer.frames_rasterized} of {total} animated frames")
+    print(f"Encoded {writer.frames_written - writer.frames_held} of {writer.frames_written} output frames")
+
+
+if __name__ == "__main__":
+    main()
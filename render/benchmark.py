@@ -0,0 +1,167 @@
+"""
+Render benchmark suite.
+
+Renders a fixed set of representative sections at a fixed quality with the
+cache disabled, several trials each, every trial in a fresh process. Records
+frames per second, wall time and peak RSS, writes them to a results file and
+compares the throughput with a stored baseline: the run fails (exit code 1)
+when a section got slower than the allowed percentage.
+
+Usage:
+    uv run python -m render.benchmark --save-baseline
+    uv run python -m render.benchmark --trials 5 --max-regression 10
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import config, tempconfig
+
+from .common import QUALITY_FLAGS, SectionRenderer, get_scene_class, scene_config
+from .sections import wrap_sections
+
+# (scene, section) pairs covering text-heavy, grid-heavy and plot-heavy sections
+BENCHMARK_SECTIONS = [
+    ("IntroScene", "play_title_sequence"),
+    ("TransformerScene", "play_attention"),
+    ("InferenceScene", "play_kv_cache"),
+    ("BaseTrainingScene", "play_lr_schedule"),
+]
+
+
+class BenchmarkRenderer(SectionRenderer):
+    """Section renderer that counts the frames and times the section it renders."""
+
+    def __init__(self, section: str, **kwargs):
+        super().__init__(section, **kwargs)
+        self.frames = 0
+        self.wall = 0.0
+
+    def track(self, name, method):
+        wrapped = super().track(name, method)
+        if name != self.section:
+            return wrapped
+
+        def section(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return wrapped(*args, **kwargs)
+            finally:
+                self.wall = time.perf_counter() - start
+        return section
+
+    def add_frame(self, frame, num_frames: int = 1):
+        if not self.skip_animations:
+            self.frames += num_frames
+        super().add_frame(frame, num_frames)
+
+
+def run_trial(scene_name: str, section: str, quality: str) -> dict:
+    """Render one section once; meant to run in a fresh process."""
+    scene_cls = get_scene_class(scene_name)
+    # Movies go to a scratch directory, the text and LaTeX caches stay warm
+    with tempfile.TemporaryDirectory() as video_dir:
+        overrides = {"disable_caching": True, "video_dir": video_dir}
+        with tempconfig(scene_config(scene_cls, quality, **overrides)):
+            renderer = BenchmarkRenderer(section)
+            scene = scene_cls(renderer=renderer)
+            wrap_sections(scene, renderer.track)
+            scene.render()
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss_mb = peak_rss / (2**20 if sys.platform == "darwin" else 2**10)
+    return {
+        "frames": renderer.frames,
+        "wall": renderer.wall,
+        "fps": renderer.frames / renderer.wall,
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def run_suite(quality: str, trials: int) -> dict:
+    results = {"quality": quality, "trials": trials, "sections": {}}
+    # One process per trial so peak RSS and caches never leak between trials
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for scene_name, section in BENCHMARK_SECTIONS:
+            runs = [pool.submit(run_trial, scene_name, section, quality) for _ in range(trials)]
+            runs = [run.result() for run in runs]
+            results["sections"][f"{scene_name}.{section}"] = {
+                "frames": runs[0]["frames"],
+                "fps": statistics.median(run["fps"] for run in runs),
+                "wall": statistics.median(run["wall"] for run in runs),
+                "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+                "runs": runs,
+            }
+    return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Print the comparison, return the sections that regressed too much."""
+    regressions = []
+    print(f"{'section':<44}{'fps':>8}{'base':>8}{'change':>9}{'wall s':>9}{'rss MB':>9}")
+    for name, result in results["sections"].items():
+        base = baseline.get("sections", {}).get(name)
+        line = f"{name:<44}{result['fps']:>8.1f}"
+        if base:
+            change = 100 * (result["fps"] - base["fps"]) / base["fps"]
+            line += f"{base['fps']:>8.1f}{change:>+8.1f}%"
+            if -change > max_regression:
+                regressions.append(name)
+        else:
+            line += f"{'-':>8}{'-':>9}"
+        line += f"{result['wall']:>9.2f}{result['peak_rss_mb']:>9.0f}"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark render throughput of representative sections.")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument(
+        "--max-regression", type=float, default=10.0,
+        help="Fail when frames/sec drop by more than this percentage",
+    )
+    parser.add_argument("--output", help="Results file (default: media/benchmarks/results-<quality>.json)")
+    parser.add_argument("--baseline", help="Baseline file (default: media/benchmarks/baseline-<quality>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    directory = Path(config.media_dir) / "benchmarks"
+    directory.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output or directory / f"results-{args.quality}.json")
+    baseline_path = Path(args.baseline or directory / f"baseline-{args.quality}.json")
+
+    results = run_suite(args.quality, args.trials)
+    with output.open("w") as fp:
+        json.dump(results, fp, indent=2)
+
+    baseline = {}
+    if baseline_path.exists():
+        with baseline_path.open() as fp:
+            baseline = json.load(fp)
+    regressions = compare(results, baseline, args.max_regression)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        with baseline_path.open("w") as fp:
+            json.dump(results, fp, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+    elif not baseline:
+        print(f"No baseline at {baseline_path}, run with --save-baseline to store one")
+
+    if regressions and not args.save_baseline:
+        print(f"Throughput regressed more than {args.max_regression:g}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
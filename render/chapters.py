@@ -0,0 +1,243 @@
+"""
+Chapter markers and seek index.
+
+Builds one chapter per play_* section from the captured scene timelines (see
+render.timeline): the chapter title is the first line of the section's
+docstring, its start is the first frame the section writes. The chapters are
+embedded into the movie as MP4 chapters (the "chpl" atom read by ffmpeg, mpv
+and VLC) and written next to it as WebVTT chapters for web players, together
+with a JSON seek index mapping every scene and section to its start time,
+frame, and the keyframe and byte offset to seek to.
+
+Pass the movie of a single scene with that scene's name, or the full
+NanoChatVideo movie with no scene names.
+
+Usage:
+    uv run python -m render.chapters media/videos/main/1080p60/NanoChatVideo.mp4 -q h
+    uv run python -m render.chapters RLScene media/videos/scene_08_rl/480p15/RLScene.mp4
+"""
+
+import bisect
+import json
+import shutil
+import struct
+from pathlib import Path
+
+import av
+
+from .common import SCENE_CLASSES, build_parser, get_scene_class, scene_config
+from .sections import section_title
+from .timeline import ensure_timeline, load_timeline, play_frames
+
+
+def chapter_list(scene_names: list, frame_rate: float) -> list:
+    """One chapter per section of the scenes, played back to back."""
+    chapters = []
+    frame = 0
+    for scene_name in scene_names:
+        scene_cls = get_scene_class(scene_name)
+        # Captured again when the scene sources changed since the last capture
+        for entry in load_timeline(ensure_timeline(scene_cls))["plays"]:
+            if not chapters or (chapters[-1]["scene"], chapters[-1]["section"]) != (scene_name, entry["section"]):
+                chapters.append({
+                    "scene": scene_name,
+                    "section": entry["section"],
+                    "title": section_title(scene_cls, entry["section"]),
+                    "frame": frame,
+                    "start": frame / frame_rate,
+                })
+            frame += play_frames(entry, frame_rate)
+    for chapter, following in zip(chapters, chapters[1:] + [None]):
+        chapter["end"] = following["start"] if following else frame / frame_rate
+    return chapters
+
+
+# =============================================================================
+# MP4 chapters
+# =============================================================================
+
+# Boxes on the way from moov to the chunk offset tables
+CONTAINER_BOXES = {"moov", "trak", "mdia", "minf", "stbl"}
+
+
+def _boxes(data: bytes):
+    offset = 0
+    while offset < len(data):
+        size, kind = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = len(data) - offset
+        yield kind.decode("latin-1"), data[offset + header:offset + size]
+        offset += size
+
+
+def _box(kind: str, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind.encode("latin-1")) + payload
+
+
+def _top_level_boxes(fp):
+    """``(kind, offset, size)`` of the top-level boxes of an open MP4 file."""
+    fp.seek(0, 2)
+    file_size = fp.tell()
+    offset = 0
+    while offset < file_size:
+        fp.seek(offset)
+        size, kind = struct.unpack(">I4s", fp.read(8))
+        if size == 1:
+            size = struct.unpack(">Q", fp.read(8))[0]
+        elif size == 0:
+            size = file_size - offset
+        yield kind.decode("latin-1"), offset, size
+        offset += size
+
+
+def _chpl(chapters: list) -> bytes:
+    # Nero chapters: version 1, a reserved word, then start in 100 ns units and title
+    payload = struct.pack(">II", 0x01000000, 0) + struct.pack(">B", min(len(chapters), 255))
+    for chapter in chapters[:255]:
+        title = chapter["title"].encode("utf-8")[:255]
+        payload += struct.pack(">QB", round(chapter["start"] * 10**7), len(title)) + title
+    return _box("chpl", payload)
+
+
+def _rebuild(kind: str, payload: bytes, shift: int, after: int, chpl: bytes) -> bytes:
+    if kind in CONTAINER_BOXES:
+        children = [
+            _rebuild(child, child_payload, shift, after, chpl)
+            for child, child_payload in _boxes(payload)
+            if not (kind == "moov" and child == "udta")
+        ]
+        if kind == "moov":
+            udta = next((p for child, p in _boxes(payload) if child == "udta"), b"")
+            udta = b"".join(_box(child, p) for child, p in _boxes(udta) if child != "chpl")
+            children.append(_box("udta", udta + chpl))
+        return _box(kind, b"".join(children))
+    if kind in ("stco", "co64"):
+        # Media data behind the moov box moves by the growth of the moov box
+        version_flags, count = struct.unpack_from(">II", payload)
+        fmt = ">" + ("I" if kind == "stco" else "Q") * count
+        offsets = struct.unpack_from(fmt, payload, 8)
+        offsets = [offset + shift if offset > after else offset for offset in offsets]
+        return _box(kind, struct.pack(">II", version_flags, count) + struct.pack(fmt, *offsets))
+    return _box(kind, payload)
+
+
+def write_mp4_chapters(movie, chapters: list):
+    """Embed ``chapters`` into an MP4 file, replacing any previous ones."""
+    movie = Path(movie)
+    with movie.open("rb") as fp:
+        boxes = list(_top_level_boxes(fp))
+        _, moov_offset, moov_size = next(box for box in boxes if box[0] == "moov")
+        fp.seek(moov_offset)
+        moov = next(_boxes(fp.read(moov_size)))[1]
+
+    chpl = _chpl(chapters)
+    # The size of the new moov box does not depend on the offsets it holds
+    shift = len(_rebuild("moov", moov, 0, moov_offset, chpl)) - moov_size
+    new_moov = _rebuild("moov", moov, shift, moov_offset, chpl)
+
+    temporary = movie.with_name(f"{movie.stem}_chapters{movie.suffix}")
+    with movie.open("rb") as source, temporary.open("wb") as target:
+        shutil.copyfileobj(_Slice(source, 0, moov_offset), target)
+        target.write(new_moov)
+        source.seek(moov_offset + moov_size)
+        shutil.copyfileobj(source, target)
+    temporary.replace(movie)
+
+
+class _Slice:
+    """File-like view of ``size`` bytes of ``fp`` from ``offset``, for copyfileobj."""
+
+    def __init__(self, fp, offset: int, size: int):
+        fp.seek(offset)
+        self.fp = fp
+        self.remaining = size
+
+    def read(self, n: int = -1) -> bytes:
+        if n < 0 or n > self.remaining:
+            n = self.remaining
+        self.remaining -= n
+        return self.fp.read(n)
+
+
+# =============================================================================
+# Sidecar files
+# =============================================================================
+
+def vtt_timestamp(seconds: float) -> str:
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+def write_webvtt(path, chapters: list):
+    lines = ["WEBVTT", ""]
+    for i, chapter in enumerate(chapters, 1):
+        lines += [
+            f"Chapter {i}",
+            f"{vtt_timestamp(chapter['start'])} --> {vtt_timestamp(chapter['end'])}",
+            chapter["title"],
+            "",
+        ]
+    Path(path).write_text("\n".join(lines))
+
+
+def keyframes(movie) -> list:
+    """``(time, byte offset)`` of every keyframe of a movie, from its packets only."""
+    with av.open(str(movie)) as container:
+        stream = container.streams.video[0]
+        return [
+            (float(packet.pts * packet.time_base), packet.pos)
+            for packet in container.demux(stream)
+            if packet.is_keyframe and packet.pts is not None
+        ]
+
+
+def seek_index(movie, chapters: list) -> dict:
+    """Scenes and sections with their start time, frame and the keyframe to seek to."""
+    points = keyframes(movie)
+    times = [time for time, _ in points]
+    scenes = []
+    for chapter in chapters:
+        keyframe_time, keyframe_pos = points[max(bisect.bisect_right(times, chapter["start"] + 1e-6) - 1, 0)]
+        section = {**chapter, "keyframe": keyframe_time, "byte_offset": keyframe_pos}
+        if not scenes or scenes[-1]["scene"] != chapter["scene"]:
+            scenes.append({
+                "scene": chapter["scene"],
+                "title": get_scene_class(chapter["scene"]).__doc__.strip().splitlines()[0].rstrip("."),
+                "start": chapter["start"],
+                "frame": chapter["frame"],
+                "sections": [],
+            })
+        scenes[-1]["end"] = chapter["end"]
+        scenes[-1]["sections"].append({key: value for key, value in section.items() if key != "scene"})
+    return {"movie": Path(movie).name, "scenes": scenes}
+
+
+def main():
+    parser = build_parser("Add chapter markers and a seek index to a rendered movie.", multiple_scenes=True)
+    parser.add_argument("movie", help="MP4 file to add the chapters to")
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    frame_rate = scene_config(get_scene_class(scene_names[0]), args.quality)["frame_rate"]
+    chapters = chapter_list(scene_names, frame_rate)
+
+    movie = Path(args.movie)
+    write_mp4_chapters(movie, chapters)
+    write_webvtt(movie.with_suffix(".chapters.vtt"), chapters)
+    with movie.with_suffix(".seek.json").open("w") as fp:
+        json.dump(seek_index(movie, chapters), fp, indent=2)
+
+    for chapter in chapters:
+        print(f"{vtt_timestamp(chapter['start'])}  {chapter['title']}")
+    print(f"\n{len(chapters)} chapters written to {movie}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Chunked parallel rendering of a single scene.
+
+A first pass fast-forwards the scene without drawing anything to measure the
+duration of every play() and wait(). The plays are then split at their
+boundaries into contiguous chunks of similar duration, and every chunk is
+rendered and encoded in its own process: the plays before it are
+fast-forwarded, so each chunk starts from the exact scene state of a full
+render. Every partial movie file is an x264 stream of its own that opens on
+an IDR frame, so the chunks are closed GOPs and join by remuxing, without
+re-encoding.
+
+Unlike render.timeline this runs the scene code itself, so it also works for
+scenes holding lambdas or closures.
+
+Usage:
+    uv run python -m render.chunked TransformerScene -q h --jobs 4
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import tempconfig
+
+from .common import (
+    FastForwardRenderer,
+    PlayRangeRenderer,
+    build_parser,
+    concat_movies,
+    get_scene_class,
+    scene_config,
+)
+from .timeline import split_plays
+
+
+class PlayDurationRecorder(FastForwardRenderer):
+    """Fast-forwarding renderer that records the duration of every play."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.plays = []
+
+    def advance(self, scene):
+        self.plays.append({"duration": scene.duration})
+        super().advance(scene)
+
+
+def measure_plays(scene_cls, quality: str = "l") -> list:
+    """``[{"duration": ...}]`` for every play of a scene, in order."""
+    with tempconfig(scene_config(scene_cls, quality, write_to_movie=False)):
+        renderer = PlayDurationRecorder()
+        scene_cls(renderer=renderer).render()
+    return renderer.plays
+
+
+def render_chunk(scene_name: str, quality: str, start: int, stop: int, chunk: int) -> Path:
+    """Render plays ``start`` to ``stop - 1`` of a scene to a chunk movie."""
+    scene_cls = get_scene_class(scene_name)
+    overrides = {
+        "output_file": f"{scene_name}_chunk{chunk:02}",
+        # Chunks render concurrently, keep their partial movie files apart
+        "partial_movie_dir": f"{{video_dir}}/partial_movie_files/{{scene_name}}/chunk{chunk:02}",
+        "disable_caching": True,
+    }
+    with tempconfig(scene_config(scene_cls, quality, **overrides)):
+        renderer = PlayRangeRenderer(start, stop)
+        scene_cls(renderer=renderer).render()
+        return renderer.file_writer.movie_file_path
+
+
+def render_chunked(scene_name: str, quality: str = "l", jobs: int = None) -> Path:
+    """Render a scene in ``jobs`` parallel chunks and join them into its movie."""
+    jobs = jobs or os.cpu_count()
+    plays = measure_plays(get_scene_class(scene_name), quality)
+    ranges = split_plays(plays, jobs)
+    print(f"{scene_name}: {len(plays)} plays in {len(ranges)} chunks")
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [
+            pool.submit(render_chunk, scene_name, quality, start, stop, chunk)
+            for chunk, (start, stop) in enumerate(ranges)
+        ]
+        chunks = [future.result() for future in futures]
+
+    output = concat_movies(chunks, chunks[0].with_name(f"{scene_name}{chunks[0].suffix}"))
+    for chunk in chunks:
+        chunk.unlink()
+    return output
+
+
+def main():
+    parser = build_parser("Render one scene in parallel chunks split at play() boundaries.")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of chunks (default: CPU count)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    output = render_chunked(args.scene, args.quality, args.jobs)
+    print(f"Rendered {output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
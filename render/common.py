@@ -0,0 +1,234 @@
+"""
+Shared helpers for the render tooling.
+Resolves scene classes by name and builds the manim config for a quality.
+"""
+
+import argparse
+import inspect
+from pathlib import Path
+
+import av
+from manim.constants import QUALITIES
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.exceptions import EndSceneEarlyException
+
+import scenes
+
+# =============================================================================
+# Scenes
+# =============================================================================
+
+# Scene classes in the order NanoChatVideo plays them
+SCENE_CLASSES = [getattr(scenes, name) for name in scenes.__all__]
+
+# manim CLI quality flags (-ql, -qm, -qh, -qp, -qk) to manim quality names
+QUALITY_FLAGS = {
+    quality["flag"]: name
+    for name, quality in QUALITIES.items()
+    if quality["flag"] is not None
+}
+
+
+def get_scene_class(name: str):
+    """Look up a scene class by its class name, e.g. ``"IntroScene"``."""
+    for scene_cls in SCENE_CLASSES:
+        if scene_cls.__name__ == name:
+            return scene_cls
+    choices = ", ".join(cls.__name__ for cls in SCENE_CLASSES)
+    raise ValueError(f"Unknown scene {name!r}, choose from: {choices}")
+
+
+# =============================================================================
+# Config
+# =============================================================================
+
+def scene_config(scene_cls, quality: str = "l", **overrides) -> dict:
+    """
+    Build a ``tempconfig`` dict that renders ``scene_cls`` like
+    ``manim -q<quality> scene_xx.py SceneName`` would.
+
+    The renderer and its camera read the config when they are constructed,
+    so create them inside the ``tempconfig`` block.
+    """
+    resolution = QUALITIES[QUALITY_FLAGS[quality]]
+    options = {
+        "pixel_width": resolution["pixel_width"],
+        "pixel_height": resolution["pixel_height"],
+        "frame_rate": resolution["frame_rate"],
+        # Output lands in media/videos/<scene module>/<quality>/ as with the CLI
+        "input_file": inspect.getfile(scene_cls),
+    }
+    options.update(overrides)
+    return options
+
+
+# =============================================================================
+# Renderers
+# =============================================================================
+
+class FastForwardRenderer(CairoRenderer):
+    """
+    Renderer that advances every animation to its end state in a single step
+    without drawing or writing any frame. Call ``snapshot()`` to rasterize the
+    current state of the scene on demand.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["skip_animations"] = True
+        super().__init__(**kwargs)
+
+    def play(self, scene, *args, **kwargs):
+        scene.compile_animation_data(*args, **kwargs)
+        self.advance(scene)
+
+    def advance(self, scene):
+        """Run the compiled animations of ``scene`` to their end."""
+        scene.begin_animations()
+        if not scene.is_current_animation_frozen_frame():
+            scene.play_internal(skip_rendering=True)
+        self.time += scene.duration
+        self.num_plays += 1
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def snapshot(self, scene):
+        """Rasterize everything currently in ``scene`` and return it as a PIL image."""
+        self.static_image = None
+        super().update_frame(scene)
+        return self.camera.get_image()
+
+    def scene_finished(self, scene):
+        pass
+
+
+class SectionRenderer(FastForwardRenderer):
+    """
+    Renderer that writes a movie of a single play_* section.
+
+    The sections before it are fast-forwarded, so the section starts from the
+    exact scene state it has in a full render, and the scene stops right after
+    it. Hook it into the scene with ``wrap_sections(scene, renderer.track)``.
+    """
+
+    def __init__(self, section: str, **kwargs):
+        super().__init__(**kwargs)
+        self.section = section
+        self.active = False
+
+    def track(self, name, method):
+        if name != self.section:
+            return method
+
+        def section(*args, **kwargs):
+            self.active = True
+            self._original_skipping_status = False
+            method(*args, **kwargs)
+            raise EndSceneEarlyException()
+        return section
+
+    def play(self, scene, *args, **kwargs):
+        if self.active:
+            CairoRenderer.play(self, scene, *args, **kwargs)
+        else:
+            # Keeps partial movie files indexed by num_plays
+            self.file_writer.add_partial_movie_file(None)
+            super().play(scene, *args, **kwargs)
+
+    def update_frame(self, *args, **kwargs):
+        if self.active:
+            CairoRenderer.update_frame(self, *args, **kwargs)
+
+    def scene_finished(self, scene):
+        CairoRenderer.scene_finished(self, scene)
+
+
+class PlayRangeRenderer(FastForwardRenderer):
+    """
+    Renderer that writes a movie of the plays ``start`` to ``stop - 1`` of a
+    scene, counting every ``play()`` and ``wait()`` call. Earlier plays are
+    fast-forwarded and the scene stops at ``stop``.
+    """
+
+    def __init__(self, start: int, stop: int, **kwargs):
+        super().__init__(**kwargs)
+        self.start = start
+        self.stop = stop
+
+    @property
+    def active(self) -> bool:
+        return self.start <= self.num_plays < self.stop
+
+    def play(self, scene, *args, **kwargs):
+        if self.num_plays >= self.stop:
+            raise EndSceneEarlyException()
+        if self.active:
+            self._original_skipping_status = False
+            CairoRenderer.play(self, scene, *args, **kwargs)
+        else:
+            # Keeps partial movie files indexed by num_plays
+            self.file_writer.add_partial_movie_file(None)
+            super().play(scene, *args, **kwargs)
+
+    def update_frame(self, *args, **kwargs):
+        if self.active:
+            CairoRenderer.update_frame(self, *args, **kwargs)
+
+    def scene_finished(self, scene):
+        CairoRenderer.scene_finished(self, scene)
+
+
+# =============================================================================
+# Movie files
+# =============================================================================
+
+def concat_movies(inputs: list, output) -> Path:
+    """
+    Losslessly join movie files that share codec settings, the same way manim
+    combines partial movie files: packets are remuxed, never re-encoded.
+    """
+    output = Path(output)
+    file_list = output.with_name(f"{output.stem}_concat.txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        for path in inputs:
+            fp.write(f"file 'file:{Path(path).absolute().as_posix()}'\n")
+
+    with av.open(str(file_list), format="concat", options={"safe": "0"}) as source:
+        input_stream = source.streams.video[0]
+        with av.open(str(output), mode="w") as target:
+            output_stream = target.add_stream(template=input_stream)
+            for packet in source.demux(input_stream):
+                # Skip the flushing packets demux() generates
+                if packet.dts is None:
+                    continue
+                # dts of consecutive files need not increase, let libav recompute it
+                packet.dts = None
+                packet.stream = output_stream
+                target.mux(packet)
+
+    file_list.unlink()
+    return output
+
+
+# =============================================================================
+# Command line
+# =============================================================================
+
+def build_parser(description: str, multiple_scenes: bool = False) -> argparse.ArgumentParser:
+    """Argument parser with the scene and quality options every tool shares."""
+    parser = argparse.ArgumentParser(description=description)
+    if multiple_scenes:
+        parser.add_argument(
+            "scenes",
+            nargs="*",
+            help="Scene class names (default: every scene of the video)",
+        )
+    else:
+        parser.add_argument("scene", help="Scene class name, e.g. IntroScene")
+    parser.add_argument(
+        "-q", "--quality",
+        choices=sorted(QUALITY_FLAGS),
+        default="l",
+        help="Render quality, as in manim -q<flag> (default: l)",
+    )
+    return parser
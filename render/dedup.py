@@ -0,0 +1,112 @@
+"""
+Identical-frame detection in the encoder path.
+
+Every frame handed to the file writer is fingerprinted with a hash of a
+downsampled copy. When the fingerprint matches the previous frame of the
+same play (and a full comparison confirms it), only a duplicate marker goes
+to the writer thread: the previous frame is held for one more tick instead of
+its pixels being converted and encoded again. Static waits, settled
+animations and updaters that do not move anything all end up as held frames.
+
+Usage:
+    uv run python -m render.dedup
+    uv run python -m render.dedup TransformerScene -q h
+"""
+
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from .adaptive import VariableFrameRateWriter
+from .common import SCENE_CLASSES, build_parser, get_scene_class, scene_config
+
+
+def frame_signature(frame, step: int = 8) -> int:
+    """Cheap fingerprint of a frame: CRC32 of every ``step``-th pixel."""
+    return zlib.crc32(np.ascontiguousarray(frame[::step, ::step]).tobytes())
+
+
+class DeduplicatingFileWriter(VariableFrameRateWriter):
+    """
+    Scene file writer that sends a frame identical to the previous one as a
+    duplicate marker, the previous frame object, which the variable frame
+    rate writer holds instead of encoding. Duplicates are counted in
+    ``frames_duplicated``.
+    """
+
+    def __init__(self, renderer, scene_name: str, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.frames_duplicated = 0
+        self._last_frame = None
+        self._last_signature = None
+
+    def open_partial_movie_stream(self, file_path=None):
+        # A partial movie file is a stream of its own, nothing to hold across it
+        self._last_frame = None
+        self._last_signature = None
+        super().open_partial_movie_stream(file_path)
+
+    def write_frame(self, frame_or_renderer, num_frames: int = 1):
+        if isinstance(frame_or_renderer, np.ndarray) and frame_or_renderer is not self._last_frame:
+            signature = frame_signature(frame_or_renderer)
+            if signature == self._last_signature and np.array_equal(frame_or_renderer, self._last_frame):
+                self.frames_duplicated += num_frames
+                frame_or_renderer = self._last_frame
+            else:
+                self._last_frame = frame_or_renderer
+                self._last_signature = signature
+        super().write_frame(frame_or_renderer, num_frames)
+
+
+def render_scene(scene_cls, quality: str = "l", variable_frame_rate: bool = True) -> dict:
+    """Render a scene with duplicate detection and return its frame counts."""
+    # Cached partial movie files would skip plays, and with them their frames
+    with tempconfig(scene_config(scene_cls, quality, disable_caching=True)):
+        renderer = CairoRenderer(file_writer_class=DeduplicatingFileWriter)
+        renderer.variable_frame_rate = variable_frame_rate
+        scene_cls(renderer=renderer).render()
+
+    writer = renderer.file_writer
+    return {
+        "frames": writer.frames_written,
+        "duplicates": writer.frames_duplicated,
+        # Static waits arrive as one frame written several times
+        "held": writer.frames_held,
+        "encoded": writer.frames_written - writer.frames_held,
+        "movie": str(writer.movie_file_path),
+    }
+
+
+def main():
+    parser = build_parser("Render scenes, holding identical frames instead of encoding them.", multiple_scenes=True)
+    parser.add_argument(
+        "--cfr", action="store_true",
+        help="Still detect and count duplicates, but encode them at a constant frame rate",
+    )
+    parser.add_argument("--output", help="JSON report path (default: media/dedup/<quality>.json)")
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    report = {}
+    print(f"{'scene':<24}{'frames':>9}{'duplicates':>12}{'encoded':>9}{'saved':>8}")
+    for scene_name in scene_names:
+        stats = report[scene_name] = render_scene(get_scene_class(scene_name), args.quality, not args.cfr)
+        saved = 100 * (1 - stats["encoded"] / stats["frames"]) if stats["frames"] else 0.0
+        print(
+            f"{scene_name:<24}{stats['frames']:>9}{stats['duplicates']:>12}"
+            f"{stats['encoded']:>9}{saved:>7.1f}%"
+        )
+
+    output = Path(args.output or Path(config.media_dir) / "dedup" / f"{args.quality}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(report, fp, indent=2)
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
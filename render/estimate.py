@@ -0,0 +1,440 @@
+"""
+Static render-cost estimator.
+
+Predicts, without rendering anything, how long every play_* section runs and
+how many frames it produces at each quality, by reading the scene sources:
+the run_time of every self.play() and the duration of every self.wait() are
+summed, with loops over literal sequences, ranges and VGroups built in the
+same method multiplied out, and helper methods followed. Render times are
+predicted from the per-frame cost measured by render.benchmark (or, failing
+that, render.profiler); qualities without measurements are scaled by pixel
+count from one that has them.
+
+Loops or durations that cannot be resolved statically count once and are
+marked with a "~" in the report.
+
+Usage:
+    uv run python -m render.estimate
+    uv run python -m render.estimate TransformerScene -q l -q k
+"""
+
+import argparse
+import ast
+import json
+import math
+from pathlib import Path
+
+from manim import config
+from manim.constants import QUALITIES
+
+from .common import QUALITY_FLAGS
+from .sections import construct_sections
+
+SCENES_DIR = Path(__file__).resolve().parent.parent / "scenes"
+
+# manim defaults for animations and waits without an explicit duration
+DEFAULT_RUN_TIME = 1.0
+DEFAULT_WAIT_TIME = 1.0
+
+# Calls whose length is the number of their (unpacked) arguments
+GROUP_CLASSES = {"VGroup", "Group"}
+# Calls whose length is the length of their single argument
+SEQUENCE_FUNCTIONS = {"list", "tuple", "reversed", "sorted", "enumerate"}
+
+
+# =============================================================================
+# Source analysis
+# =============================================================================
+
+class MethodTimer:
+    """
+    Walks the statements of one scene method and collects its plays and waits
+    as ``(kind, duration, count)`` events, ``count`` being how many times the
+    surrounding loops run them.
+    """
+
+    def __init__(self, methods: dict, stack=()):
+        self.methods = methods
+        self.stack = stack
+        self.values = {}
+        self.lengths = {}
+        self.events = []
+        self.exact = True
+
+    # -- expressions ----------------------------------------------------------
+
+    def number(self, node):
+        """Value of a numeric expression, or None."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self.values.get(node.id)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = self.number(node.operand)
+            return None if value is None else -value
+        if isinstance(node, ast.BinOp):
+            left, right = self.number(node.left), self.number(node.right)
+            if left is None or right is None:
+                return None
+            operators = {
+                ast.Add: lambda a, b: a + b,
+                ast.Sub: lambda a, b: a - b,
+                ast.Mult: lambda a, b: a * b,
+                ast.Div: lambda a, b: a / b if b else None,
+                ast.FloorDiv: lambda a, b: a // b if b else None,
+            }
+            operator = operators.get(type(node.op))
+            return operator(left, right) if operator else None
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == "len"
+            and len(node.args) == 1
+        ):
+            return self.length(node.args[0])
+        return None
+
+    def length(self, node):
+        """Number of items of a sequence expression, or None."""
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return self._items(node.elts)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return len(node.value)
+        if isinstance(node, ast.Name):
+            return self.lengths.get(node.id)
+        if isinstance(node, (ast.ListComp, ast.GeneratorExp)):
+            total = 1
+            for generator in node.generators:
+                size = self.length(generator.iter)
+                if size is None or generator.ifs:
+                    return None
+                total *= size
+            return total
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice):
+            size = self.length(node.value)
+            if size is None or node.slice.step is not None:
+                return None
+            bounds = []
+            for bound in (node.slice.lower, node.slice.upper):
+                value = None if bound is None else self.number(bound)
+                if bound is not None and not isinstance(value, int):
+                    return None
+                bounds.append(value)
+            return len(range(size)[bounds[0]:bounds[1]])
+        if isinstance(node, ast.Call):
+            return self._call_length(node)
+        return None
+
+    def _items(self, elements: list):
+        total = 0
+        for element in elements:
+            if isinstance(element, ast.Starred):
+                size = self.length(element.value)
+                if size is None:
+                    return None
+                total += size
+            else:
+                total += 1
+        return total
+
+    def _call_length(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            # "a b c".split(), group.copy()
+            if func.attr == "split" and isinstance(func.value, ast.Constant):
+                return len(func.value.value.split())
+            if func.attr == "copy":
+                return self.length(func.value)
+            return None
+        if not isinstance(func, ast.Name):
+            return None
+        if func.id == "range":
+            bounds = [self.number(arg) for arg in node.args]
+            if not bounds or any(not isinstance(bound, int) for bound in bounds):
+                return None
+            return len(range(*bounds))
+        if func.id == "zip":
+            sizes = [self.length(arg) for arg in node.args]
+            return None if None in sizes else min(sizes, default=0)
+        if func.id in SEQUENCE_FUNCTIONS and len(node.args) == 1:
+            return self.length(node.args[0])
+        if func.id in GROUP_CLASSES:
+            return self._items(node.args)
+        return None
+
+    def run_time(self, node: ast.Call):
+        """Duration of a ``self.play(...)`` call, or None."""
+        for keyword in node.keywords:
+            if keyword.arg == "run_time":
+                return self.number(keyword.value)
+        # Without a play-level run_time the longest animation sets the duration
+        durations = []
+        for arg in node.args:
+            duration = DEFAULT_RUN_TIME
+            if isinstance(arg, ast.Call):
+                for keyword in arg.keywords:
+                    if keyword.arg == "run_time":
+                        duration = self.number(keyword.value)
+            if duration is None:
+                return None
+            durations.append(duration)
+        return max(durations, default=DEFAULT_RUN_TIME)
+
+    def wait_time(self, node: ast.Call):
+        """Duration of a ``self.wait(...)`` call, or None."""
+        if node.args:
+            return self.number(node.args[0])
+        for keyword in node.keywords:
+            if keyword.arg == "duration":
+                return self.number(keyword.value)
+        return DEFAULT_WAIT_TIME
+
+    # -- statements -----------------------------------------------------------
+
+    def block(self, statements: list, count: int = 1):
+        for statement in statements:
+            self.statement(statement, count)
+
+    def statement(self, node, count: int):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self._bind(target.id, node.value)
+        elif isinstance(node, ast.For):
+            size = self.length(node.iter)
+            if size is None:
+                # Run the body once; it only matters if it plays something
+                # or grows a group that is looped over later
+                events, lengths = len(self.events), dict(self.lengths)
+                self.block(node.body, count)
+                if len(self.events) > events:
+                    self.exact = False
+                for name, value in list(self.lengths.items()):
+                    if lengths.get(name) != value:
+                        del self.lengths[name]
+            else:
+                self.block(node.body, count * size)
+            self.block(node.orelse, count)
+        elif isinstance(node, ast.While):
+            self.exact = False
+            self.block(node.body, count)
+        elif isinstance(node, ast.If):
+            # Take the longer branch
+            branches = []
+            for body in (node.body, node.orelse):
+                events = self.events
+                self.events = []
+                self.block(body, count)
+                branches.append(self.events)
+                self.events = events
+            self.events.extend(max(branches, key=seconds))
+        elif isinstance(node, (ast.With, ast.Try)):
+            self.block(node.body, count)
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            self.call(node.value, count)
+
+    def _bind(self, name: str, value):
+        self.values.pop(name, None)
+        self.lengths.pop(name, None)
+        number = self.number(value)
+        if number is not None:
+            self.values[name] = number
+        size = self.length(value)
+        if size is not None:
+            self.lengths[name] = size
+
+    def call(self, node: ast.Call, count: int):
+        func = node.func
+        if not isinstance(func, ast.Attribute):
+            return
+        if isinstance(func.value, ast.Name) and func.value.id == "self":
+            if func.attr == "play":
+                self._event("play", self.run_time(node), count)
+            elif func.attr == "wait":
+                self._event("wait", self.wait_time(node), count)
+            elif func.attr in self.methods and func.attr not in self.stack:
+                helper = MethodTimer(self.methods, self.stack + (func.attr,))
+                helper.block(self.methods[func.attr].body)
+                self.exact &= helper.exact
+                self.events.extend((kind, duration, n * count) for kind, duration, n in helper.events)
+        elif func.attr in ("add", "append") and isinstance(func.value, ast.Name):
+            # group = VGroup(); for ...: group.add(...)
+            name = func.value.id
+            if name in self.lengths:
+                self.lengths[name] += count * len(node.args)
+
+    def _event(self, kind: str, duration, count: int):
+        if duration is None:
+            duration = DEFAULT_RUN_TIME if kind == "play" else DEFAULT_WAIT_TIME
+            self.exact = False
+        self.events.append((kind, duration, count))
+
+
+def seconds(events: list) -> float:
+    return sum(duration * count for _, duration, count in events)
+
+
+def frames(events: list, frame_rate: float) -> int:
+    """Frames manim writes for the events at ``frame_rate``."""
+    total = 0
+    for kind, duration, count in events:
+        if kind == "play":
+            # One frame per tick of np.arange(0, run_time, 1 / frame_rate)
+            total += count * math.ceil(duration * frame_rate - 1e-9)
+        else:
+            # A static wait freezes int(duration / dt) frames
+            total += count * int(duration * frame_rate + 1e-9)
+    return total
+
+
+def estimate_sections(directory=SCENES_DIR) -> dict:
+    """``{scene: {section: (events, exact)}}`` for every scene class in the sources."""
+    estimates = {}
+    for path in sorted(Path(directory).glob("scene_*.py")):
+        tree = ast.parse(path.read_text())
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            methods = {
+                item.name: item for item in node.body
+                if isinstance(item, ast.FunctionDef)
+            }
+            if "construct" not in methods:
+                continue
+            estimates[node.name] = {}
+            for section in construct_sections(methods["construct"]):
+                timer = MethodTimer(methods, (section,))
+                timer.block(methods[section].body)
+                estimates[node.name][section] = (timer.events, timer.exact)
+    return estimates
+
+
+# =============================================================================
+# Calibration
+# =============================================================================
+
+def measured_frame_cost(quality: str):
+    """Seconds per frame measured by render.benchmark or render.profiler, or None."""
+    media_dir = Path(config.media_dir)
+    benchmark = media_dir / "benchmarks" / f"results-{quality}.json"
+    if benchmark.exists():
+        sections = json.loads(benchmark.read_text())["sections"].values()
+        return sum(section["wall"] for section in sections) / sum(section["frames"] for section in sections)
+    profile = media_dir / "profiles" / f"{quality}.json"
+    if profile.exists():
+        sections = [
+            section
+            for scene in json.loads(profile.read_text())["scenes"].values()
+            for section in scene.values()
+        ]
+        written = sum(section["frames"] for section in sections)
+        if written:
+            return sum(section["wall"] for section in sections) / written
+    return None
+
+
+def frame_costs(qualities: list) -> dict:
+    """
+    ``{quality: (seconds per frame, source quality)}``. Qualities without
+    measurements borrow the one of a measured quality, scaled by pixel count.
+    """
+    measured = {flag: measured_frame_cost(flag) for flag in QUALITY_FLAGS}
+    measured = {flag: cost for flag, cost in measured.items() if cost is not None}
+    costs = {}
+    for quality in qualities:
+        if quality in measured:
+            costs[quality] = (measured[quality], quality)
+        elif measured:
+            source = max(measured, key=lambda flag: pixels(flag))
+            costs[quality] = (measured[source] * pixels(quality) / pixels(source), source)
+    return costs
+
+
+def pixels(quality: str) -> int:
+    resolution = QUALITIES[QUALITY_FLAGS[quality]]
+    return resolution["pixel_width"] * resolution["pixel_height"]
+
+
+def frame_rate(quality: str) -> float:
+    return QUALITIES[QUALITY_FLAGS[quality]]["frame_rate"]
+
+
+# =============================================================================
+# Command line
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate frames and render time of every play_* section.")
+    parser.add_argument("scenes", nargs="*", help="Scene class names (default: every scene)")
+    parser.add_argument(
+        "-q", "--quality", action="append", choices=sorted(QUALITY_FLAGS),
+        help="Quality to estimate, repeatable (default: l and h)",
+    )
+    parser.add_argument("--output", help="Also write the estimates to this JSON file")
+    args = parser.parse_args()
+
+    qualities = args.quality or ["l", "h"]
+    costs = frame_costs(qualities)
+    estimates = estimate_sections()
+    scene_names = args.scenes or list(estimates)
+    unknown = set(scene_names) - set(estimates)
+    if unknown:
+        parser.error(f"Unknown scenes: {', '.join(sorted(unknown))}")
+
+    header = f"{'section':<52}{'plays':>6}{'seconds':>9}"
+    header += "".join(f"{'frames -q' + q:>14}{'est -q' + q:>11}" for q in qualities)
+    print(header)
+    print("-" * len(header))
+
+    report = {"frame_costs": {q: cost for q, (cost, _) in costs.items()}, "scenes": {}}
+    totals = {q: [0, 0.0] for q in qualities}
+    total_seconds = 0.0
+    for scene_name in scene_names:
+        report["scenes"][scene_name] = {}
+        for section, (events, exact) in estimates[scene_name].items():
+            plays = sum(count for kind, _, count in events if kind == "play")
+            duration = seconds(events)
+            total_seconds += duration
+            row = {"plays": plays, "seconds": duration, "exact": exact, "frames": {}, "render_seconds": {}}
+            mark = " " if exact else "~"
+            line = f"{mark}{scene_name + '.' + section:<51}{plays:>6}{duration:>9.1f}"
+            for q in qualities:
+                count = frames(events, frame_rate(q))
+                totals[q][0] += count
+                row["frames"][q] = count
+                line += f"{count:>14}"
+                if q in costs:
+                    render_seconds = count * costs[q][0]
+                    totals[q][1] += render_seconds
+                    row["render_seconds"][q] = render_seconds
+                    line += f"{render_seconds:>10.0f}s"
+                else:
+                    line += f"{'-':>11}"
+            report["scenes"][scene_name][section] = row
+            print(line)
+
+    print("-" * len(header))
+    line = f"{'total':<52}{'':>6}{total_seconds:>9.1f}"
+    for q in qualities:
+        line += f"{totals[q][0]:>14}"
+        line += f"{totals[q][1]:>10.0f}s" if q in costs else f"{'-':>11}"
+    print(line)
+
+    for q in qualities:
+        if q not in costs:
+            print(f"\nNo measured frame cost; run render.benchmark -q {q} to predict -q{q} render times")
+        elif costs[q][1] != q:
+            print(f"\n-q{q} render times scaled by pixel count from the -q{costs[q][1]} measurements")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w") as fp:
+            json.dump(report, fp, indent=2)
+        print(f"\nEstimates written to {output}")
+
+
+if __name__ == "__main__":
+    main()
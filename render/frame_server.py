@@ -0,0 +1,221 @@
+"""
+Random-access frame server.
+
+Serves single frames of any scene, or of the whole NanoChatVideo timeline,
+over HTTP. Frames come from captured timelines (see render.timeline): the
+play covering the requested time is loaded, its animations are interpolated
+straight to that moment and only that one frame is rasterized. Missing or
+stale timelines are captured on startup. Recently served frames are kept in
+an LRU cache.
+
+Usage:
+    uv run python -m render.frame_server -q l
+    uv run python -m render.frame_server RLScene InferenceScene -q m --port 8765
+
+    GET /frame?t=1234.5                                         time in the full video
+    GET /frame?scene=RLScene&t=42.5                             time in one scene
+    GET /frame?scene=RLScene&section=play_gsm8k_example&t=3     time in one section
+    GET /index                        scenes, sections and their start times
+"""
+
+import bisect
+import io
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from manim import Scene, tempconfig
+
+from .common import (
+    SCENE_CLASSES,
+    FastForwardRenderer,
+    build_parser,
+    get_scene_class,
+    scene_config,
+)
+from .timeline import capture, is_current, load_play, load_timeline, timeline_dir
+
+
+def _capture(scene_name: str):
+    return capture(get_scene_class(scene_name))
+
+
+class FrameServer:
+    """Random access to the frames of captured scene timelines."""
+
+    def __init__(self, scene_names: list, quality: str = "l", cache_size: int = 256):
+        self.scene_names = scene_names
+        self.quality = quality
+        self.timelines = {name: load_timeline(timeline_dir(name)) for name in scene_names}
+        self.offsets = []
+        offset = 0.0
+        for name in scene_names:
+            self.offsets.append(offset)
+            offset += self.timelines[name]["duration"]
+        self.duration = offset
+        self.frame_rate = scene_config(get_scene_class(scene_names[0]), quality)["frame_rate"]
+        self._scenes = {}
+        self.frame_png = lru_cache(maxsize=cache_size)(self._frame_png)
+
+    def locate(self, t: float):
+        """Map a time of the full video to ``(scene_name, scene_time)``."""
+        t = min(max(t, 0.0), self.duration)
+        i = bisect.bisect_right(self.offsets, t) - 1
+        return self.scene_names[i], t - self.offsets[i]
+
+    def clamp(self, scene_name: str, t: float) -> float:
+        """Clamp a scene time to ``[0, duration]`` of the scene."""
+        return min(max(t, 0.0), self.timelines[scene_name]["duration"])
+
+    def find_play(self, scene_name: str, t: float) -> dict:
+        """The timeline entry of the play running at scene time ``t``."""
+        plays = self.timelines[scene_name]["plays"]
+        starts = [entry["start"] for entry in plays]
+        return plays[max(bisect.bisect_right(starts, t) - 1, 0)]
+
+    def sections(self, scene_name: str) -> list:
+        """``(section, start, end)`` of every play_* section of a scene."""
+        sections = []
+        for entry in self.timelines[scene_name]["plays"]:
+            end = entry["start"] + entry["duration"]
+            if sections and sections[-1][0] == entry["section"]:
+                sections[-1] = (entry["section"], sections[-1][1], end)
+            else:
+                sections.append((entry["section"], entry["start"], end))
+        return sections
+
+    def frame(self, scene_name: str, t: float):
+        """Rasterize the frame shown at scene time ``t`` as a PIL image."""
+        frame_index = int(t * self.frame_rate)
+        return self._rasterize(scene_name, frame_index)
+
+    def _frame_png(self, scene_name: str, frame_index: int) -> bytes:
+        buffer = io.BytesIO()
+        self._rasterize(scene_name, frame_index).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def _rasterize(self, scene_name: str, frame_index: int):
+        t = frame_index / self.frame_rate
+        entry = self.find_play(scene_name, t)
+        scene = self._scene(scene_name)
+
+        mobjects, foreground_mobjects, animations = load_play(timeline_dir(scene_name), entry)
+        scene.mobjects = mobjects
+        scene.foreground_mobjects = foreground_mobjects
+        scene.compile_animation_data(*animations)
+        scene.begin_animations()
+        if not scene.is_current_animation_frozen_frame():
+            scene.update_to_time(min(max(t - entry["start"], 0.0), scene.duration))
+        return scene.renderer.snapshot(scene)
+
+    def _scene(self, scene_name: str) -> Scene:
+        # One idle scene per scene name, sized for the served quality
+        if scene_name not in self._scenes:
+            scene_cls = get_scene_class(scene_name)
+            with tempconfig(scene_config(scene_cls, self.quality, write_to_movie=False)):
+                scene = Scene(renderer=FastForwardRenderer())
+            scene.camera.background_color = self.timelines[scene_name]["background_color"]
+            self._scenes[scene_name] = scene
+        return self._scenes[scene_name]
+
+    def index(self) -> dict:
+        return {
+            "duration": self.duration,
+            "frame_rate": self.frame_rate,
+            "scenes": [
+                {
+                    "scene": name,
+                    "start": offset,
+                    "duration": self.timelines[name]["duration"],
+                    "sections": [
+                        {"section": section, "start": start, "end": end}
+                        for section, start, end in self.sections(name)
+                    ],
+                }
+                for name, offset in zip(self.scene_names, self.offsets)
+            ],
+        }
+
+
+class FrameRequestHandler(BaseHTTPRequestHandler):
+    server_version = "NanoChatFrameServer"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        frames = self.server.frames
+
+        if url.path == "/index":
+            self._send(200, "application/json", json.dumps(frames.index()).encode())
+        elif url.path == "/frame" and "t" in query:
+            try:
+                t = float(query["t"])
+            except ValueError:
+                t = math.nan
+            if not math.isfinite(t):
+                self._send(400, "text/plain", f"t must be a number of seconds, got {query['t']!r}".encode())
+                return
+            if "scene" in query:
+                scene_name = query["scene"]
+                if scene_name not in frames.timelines:
+                    self._send(404, "text/plain", f"Unknown scene {scene_name}".encode())
+                    return
+                if "section" in query:
+                    starts = {name: start for name, start, _ in frames.sections(scene_name)}
+                    if query["section"] not in starts:
+                        self._send(404, "text/plain", f"Unknown section {query['section']}".encode())
+                        return
+                    t += starts[query["section"]]
+                t = frames.clamp(scene_name, t)
+            else:
+                scene_name, t = frames.locate(t)
+            entry = frames.find_play(scene_name, t)
+            png = frames.frame_png(scene_name, int(t * frames.frame_rate))
+            self._send(200, "image/png", png, {
+                "X-Scene": scene_name,
+                "X-Section": entry["section"],
+                "X-Scene-Time": f"{t:.3f}",
+            })
+        else:
+            self._send(404, "text/plain", b"Use /frame?t=<seconds>[&scene=<SceneName>] or /index")
+
+    def _send(self, status: int, content_type: str, body: bytes, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = build_parser(
+        "Serve random-access frames of the scenes over HTTP.",
+        multiple_scenes=True,
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--cache-size", type=int, default=256,
+        help="Number of recently served frames to keep",
+    )
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    missing = [name for name in scene_names if not is_current(timeline_dir(name))]
+    if missing:
+        print(f"Capturing missing or stale timelines of {', '.join(missing)}")
+        with ProcessPoolExecutor() as pool:
+            list(pool.map(_capture, missing))
+
+    server = HTTPServer(("127.0.0.1", args.port), FrameRequestHandler)
+    server.frames = FrameServer(scene_names, args.quality, args.cache_size)
+    print(f"Serving {server.frames.duration:.1f}s of video on http://127.0.0.1:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
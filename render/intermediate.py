@@ -0,0 +1,185 @@
+"""
+Lossless intra-only intermediate for partial movie files.
+
+manim encodes every play() to a lossy x264 partial movie file and joins them
+by remuxing. Here partial movie files are written losslessly instead (x264 in
+RGB at qp 0, every frame a keyframe, ultrafast preset), which is cheaper to
+write and never degrades, and the scene movie gets a single lossy encode
+when the partial files are combined.
+
+The partial movie files go to a directory of their own, so the cache never
+mixes them with lossy ones.
+
+Usage:
+    uv run python -m render.intermediate InferenceScene -q h
+    uv run python -m render.intermediate InferenceScene -q h --benchmark
+"""
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from queue import Queue
+
+import av
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+
+from .common import build_parser, get_scene_class, scene_config
+
+INTERMEDIATE_CODEC = "libx264rgb"
+INTERMEDIATE_PIX_FMT = "rgb24"
+INTERMEDIATE_OPTIONS = {"qp": "0", "g": "1", "preset": "ultrafast"}
+
+# Same settings manim uses for its partial movie files
+DELIVERY_CODEC = "libx264"
+DELIVERY_PIX_FMT = "yuv420p"
+DELIVERY_OPTIONS = {"crf": "23"}
+
+
+class IntermediateFileWriter(SceneFileWriter):
+    """Writes lossless intra-only partial movie files and encodes the movie once."""
+
+    def open_partial_movie_stream(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+
+        self.video_container = av.open(str(file_path), mode="w")
+        self.video_stream = self.video_container.add_stream(
+            INTERMEDIATE_CODEC,
+            rate=to_av_frame_rate(config.frame_rate),
+            options=INTERMEDIATE_OPTIONS,
+        )
+        self.video_stream.pix_fmt = INTERMEDIATE_PIX_FMT
+        self.video_stream.width = config.pixel_width
+        self.video_stream.height = config.pixel_height
+
+        self.queue = Queue()
+        self.writer_thread = threading.Thread(target=self.listen_and_write)
+        self.writer_thread.start()
+
+    def combine_files(self, input_files, output_file, create_gif=False, includes_sound=False):
+        if create_gif:
+            super().combine_files(input_files, output_file, create_gif, includes_sound)
+            return
+
+        file_list = self.partial_movie_directory / "partial_movie_file_list.txt"
+        with file_list.open("w", encoding="utf-8") as fp:
+            for path in input_files:
+                fp.write(f"file 'file:{Path(path).as_posix()}'\n")
+
+        with av.open(str(file_list), format="concat", options={"safe": "0", "an": "1"}) as source, \
+                av.open(str(output_file), mode="w") as output:
+            stream = output.add_stream(
+                DELIVERY_CODEC,
+                rate=to_av_frame_rate(config.frame_rate),
+                options=DELIVERY_OPTIONS,
+            )
+            stream.pix_fmt = DELIVERY_PIX_FMT
+            stream.width = config.pixel_width
+            stream.height = config.pixel_height
+            for index, frame in enumerate(source.decode(video=0)):
+                frame.pts = index
+                frame.time_base = stream.codec_context.time_base
+                for packet in stream.encode(frame):
+                    output.mux(packet)
+            for packet in stream.encode():
+                output.mux(packet)
+
+
+def intermediate_config(scene_cls, quality: str, **overrides) -> dict:
+    return scene_config(
+        scene_cls, quality,
+        partial_movie_dir="{video_dir}/partial_movie_files/{scene_name}/intermediate",
+        **overrides,
+    )
+
+
+def render_scene(scene_cls, quality: str = "h") -> Path:
+    with tempconfig(intermediate_config(scene_cls, quality)):
+        renderer = CairoRenderer(file_writer_class=IntermediateFileWriter)
+        scene_cls(renderer=renderer).render()
+        return renderer.file_writer.movie_file_path
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def measured(writer_cls):
+    """Subclass of ``writer_cls`` that measures partial writes and assembly."""
+
+    class MeasuredFileWriter(writer_cls):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.stats = {"partial_write": 0.0, "partial_bytes": 0, "assembly": 0.0}
+
+        def encode_and_write_frame(self, frame, num_frames: int):
+            start = time.perf_counter()
+            super().encode_and_write_frame(frame, num_frames)
+            self.stats["partial_write"] += time.perf_counter() - start
+
+        def close_partial_movie_stream(self):
+            start = time.perf_counter()
+            super().close_partial_movie_stream()
+            self.stats["partial_write"] += time.perf_counter() - start
+
+        def combine_files(self, input_files, output_file, *args, **kwargs):
+            self.stats["partial_bytes"] = sum(Path(path).stat().st_size for path in input_files)
+            start = time.perf_counter()
+            super().combine_files(input_files, output_file, *args, **kwargs)
+            self.stats["assembly"] = time.perf_counter() - start
+            self.stats["movie_bytes"] = Path(output_file).stat().st_size
+
+    return MeasuredFileWriter
+
+
+def benchmark(scene_cls, quality: str = "h") -> dict:
+    """Render a scene with manim's lossy partial files and with the lossless intermediate."""
+    results = {}
+    for name, writer_cls in [("lossy", SceneFileWriter), ("intermediate", IntermediateFileWriter)]:
+        with tempfile.TemporaryDirectory() as video_dir:
+            overrides = {"disable_caching": True, "video_dir": video_dir}
+            with tempconfig(intermediate_config(scene_cls, quality, **overrides)):
+                renderer = CairoRenderer(file_writer_class=measured(writer_cls))
+                start = time.perf_counter()
+                scene_cls(renderer=renderer).render()
+                results[name] = {"wall": time.perf_counter() - start, **renderer.file_writer.stats}
+    return results
+
+
+def main():
+    parser = build_parser("Render with lossless intermediate partial movie files.")
+    parser.set_defaults(quality="h")
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="Compare disk usage, partial write and assembly time with manim's lossy partial files",
+    )
+    parser.add_argument("--output", help="Benchmark JSON path (default: media/benchmarks/intermediate-<quality>.json)")
+    args = parser.parse_args()
+
+    scene_cls = get_scene_class(args.scene)
+    if not args.benchmark:
+        print(f"Rendered {render_scene(scene_cls, args.quality)}")
+        return
+
+    results = benchmark(scene_cls, args.quality)
+    print(f"{'partial files':<16}{'partial MB':>12}{'write s':>10}{'assembly s':>12}{'movie MB':>10}{'wall s':>9}")
+    for name, stats in results.items():
+        print(
+            f"{name:<16}{stats['partial_bytes'] / 2**20:>12.1f}{stats['partial_write']:>10.2f}"
+            f"{stats['assembly']:>12.2f}{stats['movie_bytes'] / 2**20:>10.1f}{stats['wall']:>9.1f}"
+        )
+
+    output = Path(args.output or Path(config.media_dir) / "benchmarks" / f"intermediate-{args.quality}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump({"scene": args.scene, "quality": args.quality, **results}, fp, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Multi-rendition ladder from a single rasterization pass.
+
+The scene is rasterized once, at the top rendition of the ladder (1080p with
+-qh). Every frame written to the movie is also fanned out to one encoder per
+rendition, the top one included (1080p, 720p and 480p by default); each
+encoder runs on a thread of its own and downscales and encodes its frames
+while the renderer draws the next ones. All renditions share one fixed
+keyframe interval with scene-cut keyframes disabled, so their segments line
+up. The top rendition is the scene's movie itself: manim's partial movie
+files and the step combining them are skipped, so no frame is encoded twice.
+
+The renditions can be packaged for adaptive streaming as HLS (a master
+playlist over one playlist per rendition) or DASH (one manifest), by
+remuxing, without re-encoding.
+
+Usage:
+    uv run python -m render.ladder IntroScene -q h
+    uv run python -m render.ladder IntroScene -q h --renditions 720 480 360 --hls --dash
+"""
+
+import heapq
+import threading
+from fractions import Fraction
+from pathlib import Path
+from queue import Queue
+
+import av
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from .common import build_parser, get_scene_class, scene_config
+
+# Keyframe interval of every rendition, in seconds, so streaming segments
+# can be cut at the same points in every rendition
+KEYFRAME_INTERVAL = 2
+
+
+# =============================================================================
+# Encoders
+# =============================================================================
+
+class RenditionEncoder:
+    """Downscales and encodes frames into one movie file, on its own thread."""
+
+    def __init__(self, path, width: int, height: int, frame_rate: float, aspect_ratio: Fraction):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.container = av.open(str(self.path), mode="w")
+        keyint = str(int(frame_rate * KEYFRAME_INTERVAL))
+        self.stream = self.container.add_stream(
+            "libx264",
+            rate=int(frame_rate),
+            # Keyframes only every keyint frames: no scene-cut keyframes in
+            # between, which would differ from one rendition to the next
+            options={"crf": "23", "g": keyint, "keyint_min": keyint, "sc_threshold": "0"},
+        )
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = width
+        self.stream.height = height
+        # Even widths rarely hit 16:9 exactly (854x480), non-square pixels keep
+        # the display aspect ratio of every rendition identical
+        self.stream.codec_context.sample_aspect_ratio = aspect_ratio / Fraction(width, height)
+        self.frames = 0
+        # Bounded, so a slow rendition holds back the renderer instead of
+        # buffering the whole scene in memory
+        self.queue = Queue(maxsize=8)
+        self.thread = threading.Thread(target=self._run)
+        self.thread.start()
+
+    def put(self, frame, num_frames: int = 1):
+        self.queue.put((num_frames, frame))
+
+    def close(self):
+        self.queue.put((0, None))
+        self.thread.join()
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+    def _run(self):
+        while True:
+            num_frames, frame = self.queue.get()
+            if frame is None:
+                return
+            source = av.VideoFrame.from_ndarray(frame, format="rgba")
+            for _ in range(num_frames):
+                # A fresh frame per tick, encoders keep references to their input
+                scaled = source.reformat(
+                    width=self.width, height=self.height,
+                    format="yuv420p", interpolation="AREA",
+                )
+                scaled.pts = self.frames
+                self.frames += 1
+                for packet in self.stream.encode(scaled):
+                    self.container.mux(packet)
+
+
+def rendition_size(height: int) -> tuple:
+    """Frame size of a rendition of the configured aspect ratio, with even sides."""
+    width = round(height * config.pixel_width / config.pixel_height / 2) * 2
+    return width, height
+
+
+class LadderFileWriter(SceneFileWriter):
+    """
+    Scene file writer that feeds every frame to a ``RenditionEncoder`` per
+    height in ``renderer.ladder`` instead of manim's partial movie files. The
+    rendition at the rendered height is written as the movie, the others as
+    ``<movie>_<height>p.mp4`` next to it.
+    """
+
+    def __init__(self, renderer, scene_name: str, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.renditions = {}
+
+    def begin_animation(self, allow_write: bool = False, file_path=None):
+        # No partial movie file: the renditions encode every frame themselves
+        pass
+
+    def end_animation(self, allow_write: bool = False):
+        pass
+
+    def write_frame(self, frame_or_renderer, num_frames: int = 1):
+        if not self.renditions:
+            movie = Path(self.movie_file_path)
+            aspect_ratio = Fraction(config.pixel_width, config.pixel_height)
+            for height in self.renderer.ladder:
+                width, height = rendition_size(height)
+                path = movie
+                if height != config.pixel_height:
+                    path = movie.with_name(f"{movie.stem}_{height}p{movie.suffix}")
+                self.renditions[height] = RenditionEncoder(
+                    path, width, height, config.frame_rate, aspect_ratio
+                )
+        for encoder in self.renditions.values():
+            encoder.put(frame_or_renderer, num_frames)
+
+    def finish(self):
+        # Nothing to combine: the movie is the top rendition
+        for encoder in self.renditions.values():
+            encoder.close()
+        if self.renditions:
+            self.print_file_ready_message(self.movie_file_path)
+        if self.subcaptions:
+            self.write_subcaption_file()
+
+    def rendition_files(self) -> dict:
+        """Movie file per rendition height, highest first."""
+        files = {height: encoder.path for height, encoder in self.renditions.items()}
+        return dict(sorted(files.items(), reverse=True))
+
+
+def render_ladder(scene_cls, quality: str = "h", ladder=(720, 480)) -> dict:
+    """Render a scene once and return ``{height: movie file}`` for every rendition."""
+    # Cached plays write no frames, and would be missing from the renditions
+    with tempconfig(scene_config(scene_cls, quality, disable_caching=True)):
+        top = config.pixel_height
+        renderer = CairoRenderer(file_writer_class=LadderFileWriter)
+        # The top rendition, the movie, is encoded like the others so that
+        # every rendition has the same keyframes
+        renderer.ladder = [top] + [height for height in ladder if height < top]
+        scene_cls(renderer=renderer).render()
+        return renderer.file_writer.rendition_files()
+
+
+# =============================================================================
+# Streaming packages
+# =============================================================================
+
+def _bandwidth(path: Path) -> int:
+    with av.open(str(path)) as container:
+        seconds = container.duration / av.time_base
+    return int(path.stat().st_size * 8 / seconds)
+
+
+def package_hls(renditions: dict, directory) -> Path:
+    """Segment every rendition into ``<height>p/index.m3u8`` and write ``master.m3u8``."""
+    directory = Path(directory)
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for height, path in renditions.items():
+        target = directory / f"{height}p"
+        target.mkdir(parents=True, exist_ok=True)
+        options = {
+            "hls_time": str(KEYFRAME_INTERVAL * 2),
+            "hls_playlist_type": "vod",
+            "hls_segment_filename": str(target / "segment_%04d.ts"),
+        }
+        with av.open(str(path)) as source, \
+                av.open(str(target / "index.m3u8"), mode="w", format="hls", options=options) as output:
+            stream = source.streams.video[0]
+            resolution = f"{stream.width}x{stream.height}"
+            _remux([stream], output)
+        lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={_bandwidth(path)},RESOLUTION={resolution}")
+        lines.append(f"{height}p/index.m3u8")
+    master = directory / "master.m3u8"
+    master.write_text("\n".join(lines) + "\n")
+    return master
+
+
+def package_dash(renditions: dict, directory) -> Path:
+    """Write a DASH manifest with one representation per rendition."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = directory / "manifest.mpd"
+    sources = [av.open(str(path)) for path in renditions.values()]
+    try:
+        # The DASH muxer only groups representations whose width:height match
+        # exactly (it cannot see the sample aspect ratio of remuxed streams),
+        # so 854x480 ends up in an adaptation set of its own
+        groups = {}
+        for index, source in enumerate(sources):
+            stream = source.streams.video[0]
+            groups.setdefault(Fraction(stream.width, stream.height), []).append(str(index))
+        adaptation_sets = " ".join(
+            f"id={i},streams={','.join(streams)}" for i, streams in enumerate(groups.values())
+        )
+        options = {"seg_duration": str(KEYFRAME_INTERVAL * 2), "adaptation_sets": adaptation_sets}
+        with av.open(str(manifest), mode="w", format="dash", options=options) as output:
+            _remux([source.streams.video[0] for source in sources], output)
+    finally:
+        for source in sources:
+            source.close()
+    return manifest
+
+
+def _remux(streams: list, output):
+    """Copy the packets of ``streams`` into ``output``, interleaved by time."""
+    targets = {stream: output.add_stream(template=stream) for stream in streams}
+
+    def packets(stream):
+        for packet in stream.container.demux(stream):
+            # Skip the flushing packets demux() generates
+            if packet.dts is not None:
+                yield float(packet.dts * packet.time_base), id(packet), packet, targets[stream]
+
+    for _, _, packet, target in heapq.merge(*(packets(stream) for stream in streams)):
+        packet.stream = target
+        output.mux(packet)
+
+
+def main():
+    parser = build_parser("Render a scene once into a ladder of renditions.")
+    parser.set_defaults(quality="h")
+    parser.add_argument(
+        "--renditions", type=int, nargs="+", default=[720, 480],
+        help="Heights of the downscaled renditions (default: 720 480)",
+    )
+    parser.add_argument("--hls", action="store_true", help="Also package the ladder as HLS")
+    parser.add_argument("--dash", action="store_true", help="Also package the ladder as DASH")
+    args = parser.parse_args()
+
+    renditions = render_ladder(get_scene_class(args.scene), args.quality, args.renditions)
+    for height, path in renditions.items():
+        print(f"{height}p: {path}")
+
+    directory = next(iter(renditions.values())).parent / f"{args.scene}_stream"
+    if args.hls:
+        print(f"HLS: {package_hls(renditions, directory / 'hls')}")
+    if args.dash:
+        print(f"DASH: {package_dash(renditions, directory / 'dash')}")
+
+
+if __name__ == "__main__":
+    main()
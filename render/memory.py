@@ -0,0 +1,138 @@
+"""
+Live mobject and memory tracker.
+
+Runs scenes and records, at the end of every play_* section, how many
+mobjects are still in the scene (with their submobjects), how many bezier
+points they hold and the process RSS. Mobjects a section added and did not
+remove are flagged: they stay in the scene for the rest of the video, and
+every later frame pays for them.
+
+By default animations are fast-forwarded without drawing; --render does a
+real render for realistic RSS figures.
+
+Usage:
+    uv run python -m render.memory
+    uv run python -m render.memory TransformerScene --render --strict
+"""
+
+import json
+import os
+import resource
+import sys
+from pathlib import Path
+
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from .common import (
+    SCENE_CLASSES,
+    FastForwardRenderer,
+    build_parser,
+    get_scene_class,
+    scene_config,
+)
+from .sections import wrap_sections
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak_rss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as fp:
+            pages = int(fp.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # No procfs (macOS): the peak is the best we have
+        return peak_rss_mb()
+
+
+def describe(mobject) -> str:
+    """Short label for a mobject, with its text when it has one."""
+    text = getattr(mobject, "text", None) or getattr(mobject, "tex_string", None)
+    label = type(mobject).__name__
+    if isinstance(text, str):
+        label += f" {text[:40]!r}"
+    return label
+
+
+def scene_stats(scene) -> dict:
+    family = scene.get_mobject_family_members()
+    return {
+        "mobjects": len(scene.mobjects),
+        "family": len(family),
+        "points": sum(len(mobject.points) for mobject in family),
+        "rss_mb": rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def track_scene(scene_cls, quality: str = "l", render: bool = False) -> list:
+    """Run a scene and return one record per section boundary."""
+    records = []
+    overrides = {"disable_caching": True} if render else {"write_to_movie": False}
+    with tempconfig(scene_config(scene_cls, quality, **overrides)):
+        renderer = CairoRenderer() if render else FastForwardRenderer()
+        scene = scene_cls(renderer=renderer)
+
+        def track(name, method):
+            def section(*args, **kwargs):
+                # Keep the mobjects alive, or ids freed in the section could be reused
+                before = {id(mobject): mobject for mobject in scene.mobjects}
+                result = method(*args, **kwargs)
+                record = {"section": name, **scene_stats(scene)}
+                record["survivors"] = [
+                    describe(mobject) for mobject in scene.mobjects
+                    if id(mobject) not in before
+                ]
+                records.append(record)
+                return result
+            return section
+
+        wrap_sections(scene, track)
+        scene.render()
+    return records
+
+
+def main():
+    parser = build_parser(
+        "Track live mobjects, bezier points and RSS at every play_* boundary.",
+        multiple_scenes=True,
+    )
+    parser.add_argument("--render", action="store_true", help="Really render instead of fast-forwarding")
+    parser.add_argument("--strict", action="store_true", help="Exit with code 1 when mobjects survive their section")
+    parser.add_argument("--output", help="JSON report path (default: media/memory/<quality>.json)")
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    report = {}
+    print(f"{'section':<52}{'mobjects':>9}{'family':>9}{'points':>10}{'rss MB':>9}{'peak MB':>9}")
+    for scene_name in scene_names:
+        report[scene_name] = track_scene(get_scene_class(scene_name), args.quality, args.render)
+        for record in report[scene_name]:
+            print(
+                f"{scene_name + '.' + record['section']:<52}{record['mobjects']:>9}"
+                f"{record['family']:>9}{record['points']:>10}"
+                f"{record['rss_mb']:>9.0f}{record['peak_rss_mb']:>9.0f}"
+            )
+            for survivor in record["survivors"]:
+                print(f"    survives its section: {survivor}")
+
+    output = Path(args.output or Path(config.media_dir) / "memory" / f"{args.quality}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(report, fp, indent=2)
+    print(f"\nReport written to {output}")
+
+    leaks = sum(len(record["survivors"]) for records in report.values() for record in records)
+    if args.strict and leaks:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Section preview stills and contact sheet.
+
+Every scene runs in its own process with a renderer that skips all
+intermediate frames. Each play_* section is rasterized once, on its final
+layout: sections end by fading everything out, so the still is taken just
+before that closing run of fade-outs. The stills are tiled into one contact
+sheet, one row per scene.
+
+Usage:
+    uv run python -m render.preview
+    uv run python -m render.preview TransformerScene ConclusionScene -q m
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import config, tempconfig
+from PIL import Image, ImageDraw, ImageFont
+
+from scenes.common import DARK_BG, TEXT_GRAY
+
+from .common import (
+    SCENE_CLASSES,
+    FastForwardRenderer,
+    build_parser,
+    get_scene_class,
+    scene_config,
+)
+from .sections import wrap_sections
+
+
+class PreviewRenderer(FastForwardRenderer):
+    """
+    Fast-forward renderer that keeps the last layout shown before the scene
+    gets cleared, i.e. before a play made only of removing animations such
+    as ``FadeOut``.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.layout = None
+        self.clearing = False
+
+    def play(self, scene, *args, **kwargs):
+        scene.compile_animation_data(*args, **kwargs)
+        clearing = all(animation.remover for animation in scene.animations)
+        if clearing and not self.clearing:
+            self.layout = self.snapshot(scene)
+        self.clearing = clearing
+        self.advance(scene)
+
+    def section_still(self, scene):
+        """Final layout of the section that just ended."""
+        still = self.layout if self.clearing and self.layout else self.snapshot(scene)
+        self.layout = None
+        self.clearing = False
+        return still
+
+
+def preview_scene(scene_name: str, quality: str, directory) -> list:
+    """Save one still per section of a scene, returns ``(section, path)`` pairs."""
+    scene_cls = get_scene_class(scene_name)
+    directory = Path(directory)
+    stills = []
+    with tempconfig(scene_config(scene_cls, quality, write_to_movie=False)):
+        renderer = PreviewRenderer()
+        scene = scene_cls(renderer=renderer)
+
+        def still(name, method):
+            def section(*args, **kwargs):
+                result = method(*args, **kwargs)
+                path = directory / f"{scene_name}.{name}.png"
+                renderer.section_still(scene).save(path)
+                stills.append((name, path))
+                return result
+            return section
+
+        wrap_sections(scene, still)
+        scene.render()
+    return stills
+
+
+def contact_sheet(rows: list, output, thumb_width: int = 480) -> Path:
+    """
+    Tile stills into one image. ``rows`` holds one ``(scene_name, stills)``
+    pair per row, as returned by ``preview_scene``; scenes without stills
+    are left out.
+    """
+    rows = [(scene_name, stills) for scene_name, stills in rows if stills]
+    if not rows:
+        raise ValueError("No section stills to tile into a contact sheet")
+    font = ImageFont.load_default(size=16)
+    label_height = 24
+    padding = 8
+
+    with Image.open(rows[0][1][0][1]) as first:
+        thumb_height = round(first.height * thumb_width / first.width)
+    columns = max(len(stills) for _, stills in rows)
+    cell_width = thumb_width + padding
+    cell_height = thumb_height + label_height + padding
+
+    sheet = Image.new(
+        "RGB",
+        (columns * cell_width + padding, len(rows) * cell_height + padding),
+        color=DARK_BG,
+    )
+    draw = ImageDraw.Draw(sheet)
+    for row, (scene_name, stills) in enumerate(rows):
+        for column, (name, path) in enumerate(stills):
+            x = padding + column * cell_width
+            y = padding + row * cell_height
+            draw.text((x, y), f"{scene_name}.{name}", fill=TEXT_GRAY, font=font)
+            with Image.open(path) as image:
+                thumb = image.convert("RGB").resize((thumb_width, thumb_height))
+            sheet.paste(thumb, (x, y + label_height))
+
+    output = Path(output)
+    sheet.save(output)
+    return output
+
+
+def main():
+    parser = build_parser(
+        "Render the final layout of every play_* section into a contact sheet.",
+        multiple_scenes=True,
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None,
+        help="Worker processes (default: one per CPU)",
+    )
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    directory = Path(config.media_dir) / "previews" / args.quality
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [
+            pool.submit(preview_scene, name, args.quality, directory)
+            for name in scene_names
+        ]
+        rows = [(name, future.result()) for name, future in zip(scene_names, futures)]
+
+    for name, stills in rows:
+        if not stills:
+            print(f"{name}: no play_* section captured, left out of the contact sheet")
+    if not any(stills for _, stills in rows):
+        raise SystemExit("No section stills captured, no contact sheet written")
+    output = contact_sheet(rows, directory / "contact_sheet.png")
+    print(f"{sum(len(stills) for _, stills in rows)} section stills, contact sheet at {output}")
+
+
+if __name__ == "__main__":
+    main()
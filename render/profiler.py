@@ -0,0 +1,149 @@
+"""
+Per-section render profiler.
+
+Renders scenes with every play_* method wrapped and reports, per section:
+wall and CPU time, frames written, and where the wall time went:
+
+- build:       scene code between play() calls (Text, TokenBox, layout...)
+- interpolate: advancing animations to each frame (update_to_time)
+- rasterize:   Cairo drawing of the frames
+- encode:      encoding and muxing frames (runs on the writer thread, so it
+               overlaps with rasterizing)
+
+Caching is disabled so every play is really rendered.
+
+Usage:
+    uv run python -m render.profiler TransformerScene
+    uv run python -m render.profiler -q h --output profile.json
+"""
+
+import json
+import time
+from pathlib import Path
+
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from .common import SCENE_CLASSES, build_parser, get_scene_class, scene_config
+from .sections import wrap_sections
+
+STAGES = ["build", "interpolate", "rasterize", "encode"]
+
+
+def new_profile() -> dict:
+    return {"wall": 0.0, "cpu": 0.0, "play": 0.0, "frames": 0, **{stage: 0.0 for stage in STAGES}}
+
+
+class ProfilingFileWriter(SceneFileWriter):
+    """Counts written frames and times the encoder, per section."""
+
+    def write_frame(self, frame_or_renderer, num_frames: int = 1):
+        self.renderer.profile["frames"] += num_frames
+        super().write_frame(frame_or_renderer, num_frames)
+
+    def encode_and_write_frame(self, frame, num_frames: int):
+        start = time.perf_counter()
+        super().encode_and_write_frame(frame, num_frames)
+        self.renderer.profile["encode"] += time.perf_counter() - start
+
+    def close_partial_movie_stream(self):
+        # Flushing the encoder at the end of each play is encoding work too
+        profile = self.renderer.profile
+        start = time.perf_counter()
+        super().close_partial_movie_stream()
+        profile["encode"] += time.perf_counter() - start
+
+
+class ProfilingRenderer(CairoRenderer):
+    """Cairo renderer that accumulates timings into the profile of the current section."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("file_writer_class", ProfilingFileWriter)
+        super().__init__(**kwargs)
+        self.profiles = {}
+        self.profile = new_profile()
+
+    def play(self, scene, *args, **kwargs):
+        start = time.perf_counter()
+        super().play(scene, *args, **kwargs)
+        self.profile["play"] += time.perf_counter() - start
+
+    def update_frame(self, *args, **kwargs):
+        start = time.perf_counter()
+        super().update_frame(*args, **kwargs)
+        self.profile["rasterize"] += time.perf_counter() - start
+
+    def track(self, name, method):
+        """``wrap_sections`` wrapper that gives each section its own profile."""
+        def section(*args, **kwargs):
+            self.profile = self.profiles[name] = new_profile()
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            result = method(*args, **kwargs)
+            self.profile["wall"] += time.perf_counter() - wall
+            self.profile["cpu"] += time.process_time() - cpu
+            self.profile["build"] = self.profile["wall"] - self.profile["play"]
+            return result
+        return section
+
+
+def profile_scene(scene_cls, quality: str = "l") -> dict:
+    """Render a scene and return ``{section: profile}``."""
+    with tempconfig(scene_config(scene_cls, quality, disable_caching=True)):
+        renderer = ProfilingRenderer()
+        scene = scene_cls(renderer=renderer)
+        wrap_sections(scene, renderer.track)
+
+        update_to_time = scene.update_to_time
+
+        def timed_update_to_time(t):
+            start = time.perf_counter()
+            update_to_time(t)
+            renderer.profile["interpolate"] += time.perf_counter() - start
+
+        scene.update_to_time = timed_update_to_time
+        scene.render()
+    return renderer.profiles
+
+
+def print_table(rows: list):
+    """Print ``(label, profile)`` rows, slowest first."""
+    header = f"{'section':<48}{'wall s':>8}{'cpu s':>8}{'frames':>8}{'ms/frame':>10}"
+    header += "".join(f"{stage:>12}" for stage in STAGES)
+    print(header)
+    print("-" * len(header))
+    for label, profile in sorted(rows, key=lambda row: row[1]["wall"], reverse=True):
+        per_frame = 1000 * profile["wall"] / profile["frames"] if profile["frames"] else 0.0
+        line = f"{label:<48}{profile['wall']:>8.2f}{profile['cpu']:>8.2f}"
+        line += f"{profile['frames']:>8}{per_frame:>10.1f}"
+        line += "".join(f"{profile[stage]:>12.2f}" for stage in STAGES)
+        print(line)
+
+
+def main():
+    parser = build_parser("Profile the render of every play_* section.", multiple_scenes=True)
+    parser.add_argument("--output", help="JSON report path (default: media/profiles/<quality>.json)")
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    report = {
+        "quality": args.quality,
+        "scenes": {name: profile_scene(get_scene_class(name), args.quality) for name in scene_names},
+    }
+
+    output = Path(args.output or Path(config.media_dir) / "profiles" / f"{args.quality}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(report, fp, indent=2)
+
+    print_table([
+        (f"{scene_name}.{section}", profile)
+        for scene_name, sections in report["scenes"].items()
+        for section, profile in sections.items()
+    ])
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
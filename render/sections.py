@@ -0,0 +1,53 @@
+"""
+Section discovery for the scenes.
+Every scene's construct() is a sequence of self.play_*() calls; each of those
+methods is a named section of the video.
+"""
+
+import ast
+import inspect
+import textwrap
+
+
+def section_names(scene_cls) -> list:
+    """Names of the ``play_*`` methods, in the order ``construct()`` calls them."""
+    source = textwrap.dedent(inspect.getsource(scene_cls.construct))
+    return construct_sections(ast.parse(source))
+
+
+def construct_sections(construct) -> list:
+    """Names of the ``play_*`` methods called in the AST of a ``construct()``."""
+    calls = []
+    for node in ast.walk(construct):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "self"
+            and node.func.attr.startswith("play_")
+        ):
+            calls.append((node.lineno, node.col_offset, node.func.attr))
+    # ast.walk is breadth-first, so restore source order
+    names = []
+    for _, _, name in sorted(calls):
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def wrap_sections(scene, wrapper):
+    """
+    Replace every ``play_*`` method of a scene instance by
+    ``wrapper(name, method)``. Only the instance is patched, so construct()
+    picks up the wrapped methods while the class stays untouched.
+    """
+    for name in section_names(type(scene)):
+        setattr(scene, name, wrapper(name, getattr(scene, name)))
+
+
+def section_title(scene_cls, name: str) -> str:
+    """First line of the docstring of a section, e.g. ``"Visualize Rotary Position Embeddings"``."""
+    doc = inspect.getdoc(getattr(scene_cls, name))
+    if not doc:
+        return name.removeprefix("play_").replace("_", " ").capitalize()
+    return doc.splitlines()[0].rstrip(".")
@@ -0,0 +1,135 @@
+"""
+Thumbnail sprite sheets for seek previews.
+
+While the scenes render, the frame on screen every N seconds of the final
+video is taken straight from the frames handed to the movie writer, shrunk,
+and kept in memory; no second pass over the movie is needed. The scenes are
+rendered one after the other with one sampler that keeps counting frames
+across them, so the sampling times and cues are those of the concatenated
+movie, whose scenes start where the previous ones end (the offsets
+render.chapters computes). At the end the movies are joined losslessly, the
+thumbnails are tiled into sprite sheets and a WebVTT file maps every
+interval of the joined movie to its tile (``sheet.jpg#xywh=x,y,w,h``), the
+format web players use for seek-bar previews.
+
+Usage:
+    uv run python -m render.thumbnails -q h
+    uv run python -m render.thumbnails IntroScene TokenizerScene -q h --interval 2 --width 240
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from PIL import Image
+
+from .chapters import vtt_timestamp
+from .common import SCENE_CLASSES, build_parser, concat_movies, get_scene_class, scene_config
+
+
+class ThumbnailSampler:
+    """Thumbnails of the frame shown every ``interval`` seconds of a stream of frames."""
+
+    def __init__(self, interval: float = 5.0, width: int = 160):
+        self.interval = interval
+        self.width = width
+        self.thumbnails = []
+        self.frame_index = 0
+
+    def add(self, frame: np.ndarray, num_frames: int, frame_rate: float):
+        # Thumbnails due within the frames just written; a static wait writes
+        # one frame many times and can cover several intervals
+        end = self.frame_index + num_frames
+        while round(len(self.thumbnails) * self.interval * frame_rate) < end:
+            self.thumbnails.append(self._shrink(frame))
+        self.frame_index = end
+
+    def _shrink(self, frame) -> Image.Image:
+        height = round(self.width * frame.shape[0] / frame.shape[1])
+        return Image.fromarray(frame).convert("RGB").resize((self.width, height), Image.BILINEAR)
+
+    def write_sprites(self, movie, frame_rate: float, columns: int = 10, rows: int = 10) -> Path:
+        """Tile the thumbnails into sheets of ``columns x rows`` next to ``movie`` and write their WebVTT file."""
+        movie = Path(movie)
+        width, height = self.thumbnails[0].size
+        duration = self.frame_index / frame_rate
+        per_sheet = columns * rows
+        cues = ["WEBVTT", ""]
+        for sheet_index in range(math.ceil(len(self.thumbnails) / per_sheet)):
+            tiles = self.thumbnails[sheet_index * per_sheet:(sheet_index + 1) * per_sheet]
+            sheet_rows = math.ceil(len(tiles) / columns)
+            sheet = Image.new("RGB", (width * min(columns, len(tiles)), height * sheet_rows))
+            name = f"{movie.stem}_thumbnails_{sheet_index:02}.jpg"
+            for i, tile in enumerate(tiles):
+                x, y = (i % columns) * width, (i // columns) * height
+                sheet.paste(tile, (x, y))
+                start = (sheet_index * per_sheet + i) * self.interval
+                cues += [
+                    f"{vtt_timestamp(start)} --> {vtt_timestamp(min(start + self.interval, duration))}",
+                    f"{name}#xywh={x},{y},{width},{height}",
+                    "",
+                ]
+            sheet.save(movie.with_name(name), quality=85)
+        vtt = movie.with_name(f"{movie.stem}_thumbnails.vtt")
+        vtt.write_text("\n".join(cues))
+        return vtt
+
+
+class ThumbnailFileWriter(SceneFileWriter):
+    """Scene file writer that also hands every frame to ``renderer.thumbnails``."""
+
+    def write_frame(self, frame_or_renderer, num_frames: int = 1):
+        super().write_frame(frame_or_renderer, num_frames)
+        if isinstance(frame_or_renderer, np.ndarray):
+            self.renderer.thumbnails.add(frame_or_renderer, num_frames, config.frame_rate)
+
+
+def render_with_thumbnails(scene_classes: list, quality: str = "h", interval: float = 5.0, width: int = 160,
+                           output=None) -> Path:
+    """
+    Render the scenes in order, join their movies into ``output`` (a single
+    scene keeps its own movie) and write the thumbnails of the joined movie
+    next to it. Returns the VTT file.
+    """
+    sampler = ThumbnailSampler(interval, width)
+    movies = []
+    for scene_cls in scene_classes:
+        # Cached plays write no frames, and would leave holes in the thumbnails
+        with tempconfig(scene_config(scene_cls, quality, disable_caching=True)):
+            frame_rate = config.frame_rate
+            renderer = CairoRenderer(file_writer_class=ThumbnailFileWriter)
+            renderer.thumbnails = sampler
+            scene_cls(renderer=renderer).render()
+            movies.append(Path(renderer.file_writer.movie_file_path))
+
+    if len(movies) == 1:
+        movie = movies[0]
+    else:
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        movie = concat_movies(movies, output)
+    if not sampler.thumbnails:
+        raise ValueError("The scenes wrote no frames to take thumbnails from")
+    return sampler.write_sprites(movie, frame_rate)
+
+
+def main():
+    parser = build_parser(
+        "Render scenes, join them and write seek-preview thumbnail sprites with WebVTT.",
+        multiple_scenes=True,
+    )
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between thumbnails")
+    parser.add_argument("--width", type=int, default=160, help="Thumbnail width in pixels")
+    args = parser.parse_args()
+
+    scene_classes = [get_scene_class(name) for name in args.scenes] or SCENE_CLASSES
+    output = Path(config.media_dir) / "thumbnails" / args.quality / "NanoChatVideo.mp4"
+    vtt = render_with_thumbnails(scene_classes, args.quality, args.interval, args.width, output)
+    print(f"Thumbnails written to {vtt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Timeline capture and replay.
+
+Capturing runs a scene's construct() once, without rasterizing anything, and
+pickles the state handed to every play() call: the mobjects on screen and the
+compiled animations. Mobjects are vector geometry, so a captured timeline can
+be replayed at any resolution or frame rate without running the scene code
+again. Replaying is pure rasterization and can be split across processes.
+
+A timeline stores a hash of the scene sources and of the benchmark results
+the scenes read; ``ensure_timeline`` captures it again once they changed.
+
+Usage:
+    uv run python -m render.timeline IntroScene
+    uv run python -m render.timeline IntroScene --replay -q l
+    uv run python -m render.timeline IntroScene --replay -q h --jobs 4
+"""
+
+import hashlib
+import json
+import math
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import ManimColor, Scene, config, tempconfig
+
+from .common import (
+    FastForwardRenderer,
+    build_parser,
+    concat_movies,
+    get_scene_class,
+    scene_config,
+)
+from .sections import wrap_sections
+
+
+SCENES_DIR = Path(__file__).resolve().parent.parent / "scenes"
+BENCHMARKS_DIR = SCENES_DIR.parent / "media" / "benchmarks"
+
+
+def timeline_dir(scene_name: str) -> Path:
+    """Where the timeline of a scene is stored: ``media/timelines/<scene>``."""
+    return Path(config.media_dir) / "timelines" / scene_name
+
+
+def source_hash() -> str:
+    """
+    Hash of every scene module and of the benchmark results they read. Scenes
+    share common.py and the compute modules, so any edit counts for all.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(SCENES_DIR.glob("*.py")) + sorted(BENCHMARKS_DIR.glob("*.json")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _unavailable(*args, **kwargs):
+    raise RuntimeError(
+        "This callable was a lambda or closure in the scene code and could not "
+        "be captured; the animation using it cannot be replayed"
+    )
+
+
+def _unavailable_reducer():
+    return _unavailable
+
+
+class TimelinePickler(pickle.Pickler):
+    """
+    Pickler that tolerates lambdas and closures held by mobjects, such as the
+    function behind ``axes.plot(lambda x: ...)``. Their points are already
+    computed, so rendering never calls them again.
+    """
+
+    def reducer_override(self, obj):
+        if _is_closure(obj):
+            return _unavailable_reducer, ()
+        return NotImplemented
+
+
+def _is_closure(obj) -> bool:
+    qualname = getattr(obj, "__qualname__", "")
+    return callable(obj) and ("<lambda>" in qualname or "<locals>" in qualname)
+
+
+def replay_closures(scene) -> list:
+    """
+    Qualified names of the closures a replay would have to call: updaters of
+    the mobjects on screen and update functions of the animations of the
+    current play. Unlike the functions behind plotted graphs, these run on
+    every frame.
+    """
+    functions = [
+        updater
+        for mobject in scene.get_mobject_family_members()
+        for updater in mobject.get_updaters()
+    ]
+    functions += [getattr(animation, "update_function", None) for animation in scene.animations]
+    return [function.__qualname__ for function in functions if _is_closure(function)]
+
+
+# =============================================================================
+# Capture
+# =============================================================================
+
+class TimelineRecorder(FastForwardRenderer):
+    """
+    Renderer that records every play() call instead of drawing it.
+
+    Animations are still advanced to their end state, so the scene code sees
+    exactly the same mobjects as during a real render.
+    """
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries = []
+        self.section = None
+        # Hashed before construct() runs, so an edit during capture counts as stale
+        self.source_hash = source_hash()
+
+    def play(self, scene, *args, **kwargs):
+        scene.compile_animation_data(*args, **kwargs)
+        closures = replay_closures(scene)
+        if closures:
+            raise RuntimeError(
+                f"{type(scene).__name__}.{self.section} animates with closures that a captured "
+                f"timeline cannot replay ({', '.join(sorted(set(closures)))}); drive the animation "
+                "with functions defined at module level, e.g. scenes.common.flipbook or "
+                "UpdateFromAlphaFunc over a functools.partial"
+            )
+
+        file_name = f"{self.num_plays:05}.pkl"
+        with (self.directory / file_name).open("wb") as fp:
+            TimelinePickler(fp, pickle.HIGHEST_PROTOCOL).dump(
+                (scene.mobjects, scene.foreground_mobjects, scene.animations)
+            )
+        self.entries.append({
+            "file": file_name,
+            "start": self.time,
+            "duration": scene.duration,
+            "frozen": scene.is_current_animation_frozen_frame(),
+            "section": self.section,
+        })
+        self.advance(scene)
+
+    def scene_finished(self, scene):
+        index = {
+            "scene": type(scene).__name__,
+            "background_color": ManimColor(self.camera.background_color).to_hex(),
+            "duration": self.time,
+            "source_hash": self.source_hash,
+            "plays": self.entries,
+        }
+        with (self.directory / "timeline.json").open("w") as fp:
+            json.dump(index, fp, indent=2)
+
+
+def capture(scene_cls, directory=None) -> Path:
+    """Run ``scene_cls.construct()`` once and store its timeline."""
+    directory = Path(directory or timeline_dir(scene_cls.__name__))
+    with tempconfig(scene_config(scene_cls, "h", write_to_movie=False)):
+        renderer = TimelineRecorder(directory)
+        scene = scene_cls(renderer=renderer)
+
+        def track(name, method):
+            def section(*args, **kwargs):
+                renderer.section = name
+                return method(*args, **kwargs)
+            return section
+
+        wrap_sections(scene, track)
+        scene.render()
+    return directory
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+def is_current(directory) -> bool:
+    """Whether a timeline was captured from the current scene sources."""
+    path = Path(directory) / "timeline.json"
+    if not path.exists():
+        return False
+    with path.open() as fp:
+        return json.load(fp).get("source_hash") == source_hash()
+
+
+def ensure_timeline(scene_cls) -> Path:
+    """The timeline of a scene, captured again when missing or stale."""
+    directory = timeline_dir(scene_cls.__name__)
+    if not is_current(directory):
+        capture(scene_cls, directory)
+    return directory
+
+
+def load_timeline(directory) -> dict:
+    with (Path(directory) / "timeline.json").open() as fp:
+        return json.load(fp)
+
+
+def play_frames(entry: dict, frame_rate: float) -> int:
+    """Number of frames a play of a timeline writes at ``frame_rate``."""
+    if entry.get("frozen"):
+        # A static wait freezes int(duration / dt) frames
+        return int(entry["duration"] * frame_rate + 1e-9)
+    # One frame per tick of np.arange(0, run_time, 1 / frame_rate)
+    return math.ceil(entry["duration"] * frame_rate - 1e-9)
+
+
+def load_play(directory, entry: dict):
+    """Return the ``(mobjects, foreground_mobjects, animations)`` of a play."""
+    with (Path(directory) / entry["file"]).open("rb") as fp:
+        return pickle.load(fp)
+
+
+class TimelineScene(Scene):
+    """Scene whose construct() replays plays ``start:stop`` of a stored timeline."""
+
+    directory = None
+    start = 0
+    stop = None
+
+    def construct(self):
+        timeline = load_timeline(self.directory)
+        self.camera.background_color = timeline["background_color"]
+        for entry in timeline["plays"][self.start:self.stop]:
+            mobjects, foreground_mobjects, animations = load_play(self.directory, entry)
+            self.mobjects = mobjects
+            self.foreground_mobjects = foreground_mobjects
+            self.play(*animations)
+
+
+def _replay_scene_class(scene_name: str, directory, start=0, stop=None):
+    # Named after the captured scene so output files keep the usual names
+    return type(scene_name, (TimelineScene,), {
+        "directory": Path(directory),
+        "start": start,
+        "stop": stop,
+    })
+
+
+def _replay_chunk(scene_name, directory, quality, start, stop, chunk):
+    scene_cls = get_scene_class(scene_name)
+    overrides = {
+        "output_file": f"{scene_name}_chunk{chunk:02}",
+        "partial_movie_dir": f"{{video_dir}}/partial_movie_files/{{scene_name}}/chunk{chunk:02}",
+        "disable_caching": True,
+    }
+    with tempconfig(scene_config(scene_cls, quality, **overrides)):
+        scene = _replay_scene_class(scene_name, directory, start, stop)()
+        scene.render()
+        return scene.renderer.file_writer.movie_file_path
+
+
+def split_plays(plays: list, jobs: int) -> list:
+    """Split plays into at most ``jobs`` contiguous ``(start, stop)`` ranges of similar duration."""
+    total = sum(entry["duration"] for entry in plays)
+    ranges = []
+    start = 0
+    elapsed = 0.0
+    for i, entry in enumerate(plays):
+        elapsed += entry["duration"]
+        if elapsed >= total * (len(ranges) + 1) / jobs and len(ranges) < jobs - 1:
+            ranges.append((start, i + 1))
+            start = i + 1
+    if start < len(plays):
+        ranges.append((start, len(plays)))
+    return ranges
+
+
+def replay(scene_name: str, quality: str = "l", jobs: int = 1, directory=None) -> Path:
+    """Rasterize a captured timeline at ``quality``, optionally in ``jobs`` processes."""
+    scene_cls = get_scene_class(scene_name)
+    directory = Path(directory or timeline_dir(scene_name))
+
+    if jobs <= 1:
+        with tempconfig(scene_config(scene_cls, quality)):
+            scene = _replay_scene_class(scene_name, directory)()
+            scene.render()
+            return scene.renderer.file_writer.movie_file_path
+
+    ranges = split_plays(load_timeline(directory)["plays"], jobs)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(_replay_chunk, scene_name, directory, quality, start, stop, chunk)
+            for chunk, (start, stop) in enumerate(ranges)
+        ]
+        chunks = [future.result() for future in futures]
+
+    output = concat_movies(chunks, chunks[0].with_name(f"{scene_name}{chunks[0].suffix}"))
+    for chunk in chunks:
+        chunk.unlink()
+    return output
+
+
+def main():
+    parser = build_parser("Capture a scene timeline once, replay it at any quality.")
+    parser.add_argument(
+        "--replay", action="store_true",
+        help="Rasterize the stored timeline instead of capturing it",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Replay in N processes and join the chunks losslessly",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        output = replay(args.scene, args.quality, args.jobs)
+        print(f"Replayed to {output}")
+    else:
+        directory = capture(get_scene_class(args.scene))
+        print(f"Timeline written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
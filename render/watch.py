@@ -0,0 +1,393 @@
+"""
+Hot-reload preview of edited sections.
+
+Watches every module of scenes/. On every save the sources are parsed again
+and compared with the previous version, method by method:
+
+- an edited play_* method re-renders its section,
+- an edited helper method re-renders the sections that call it,
+- an edited function, class or constant of common.py or of a compute module
+  (rope.py, kv_cache.py, ...) re-renders the sections that use it, directly,
+  through other definitions or through the modules importing it,
+- edited imports or top-level code of a module count as an edit of every
+  definition in it,
+- an edited construct() or scene module preamble re-renders the whole scene.
+
+Sections render in background processes at preview quality and are spliced,
+losslessly, into one preview movie that is rewritten after every batch.
+Sections after an edited one are not re-rendered; if an edit changes what a
+section leaves on screen, save the following section too.
+
+Usage:
+    uv run python -m render.watch
+    uv run python -m render.watch TransformerScene -q m
+"""
+
+import ast
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import config, tempconfig
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .common import (
+    SCENE_CLASSES,
+    SectionRenderer,
+    build_parser,
+    concat_movies,
+    get_scene_class,
+    scene_config,
+)
+from .sections import construct_sections, wrap_sections
+
+SCENES_DIR = Path(__file__).resolve().parent.parent / "scenes"
+
+
+# =============================================================================
+# Source analysis
+# =============================================================================
+
+def _defined_names(node) -> list:
+    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, ast.Assign):
+        return [target.id for target in node.targets if isinstance(target, ast.Name)]
+    if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+        return [node.target.id]
+    return []
+
+
+def _used_names(node) -> set:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+def _self_attributes(node) -> set:
+    return {
+        child.attr for child in ast.walk(node)
+        if isinstance(child, ast.Attribute)
+        and isinstance(child.value, ast.Name)
+        and child.value.id == "self"
+    }
+
+
+def _imports(tree) -> tuple:
+    """Names imported with ``from ... import``, as local name to (module, name), and star-imported modules."""
+    named, star = {}, []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ImportFrom) or not node.module:
+            continue
+        for alias in node.names:
+            if alias.name == "*":
+                star.append(node.module)
+            else:
+                named[alias.asname or alias.name] = (node.module, alias.name)
+    return named, star
+
+
+def _is_top_level_code(node) -> bool:
+    """Module statements that are not definitions, docstrings or the ``__main__`` block."""
+    if _defined_names(node):
+        return False
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+        return False
+    return not (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+    )
+
+
+class SourceIndex:
+    """
+    AST snapshot of the scene sources: a dump of every top-level definition
+    of every module of scenes/ and of every method of every scene class, with
+    the names each one uses and the names every module imports.
+    """
+
+    def __init__(self, directory=SCENES_DIR):
+        directory = Path(directory)
+        self.modules = {}
+        self.module_code = {}
+        self.imports = {}
+        self.scene_modules = {}
+        self.preambles = {}
+        self.classes = {}
+        self.sections = {}
+        for path in sorted(directory.glob("*.py")):
+            if path.name == "__init__.py":
+                continue
+            module = path.stem
+            tree = ast.parse(path.read_text())
+            self.imports[module] = _imports(tree)
+            self.module_code[module] = ast.dump(ast.Module(
+                body=[node for node in tree.body if _is_top_level_code(node)], type_ignores=[]
+            ))
+            self.modules[module] = {
+                name: (ast.dump(node), _used_names(node))
+                for node in tree.body
+                for name in _defined_names(node)
+            }
+            if not module.startswith("scene_"):
+                continue
+
+            preamble = [node for node in tree.body if not isinstance(node, ast.ClassDef)]
+            for node in tree.body:
+                if not isinstance(node, ast.ClassDef):
+                    continue
+                self.scene_modules[node.name] = module
+                self.preambles[node.name] = ast.dump(ast.Module(body=preamble, type_ignores=[]))
+                methods = {}
+                for item in node.body:
+                    if isinstance(item, ast.FunctionDef):
+                        methods[item.name] = (
+                            ast.dump(item), _used_names(item), _self_attributes(item)
+                        )
+                        if item.name == "construct":
+                            self.sections[node.name] = construct_sections(item)
+                self.classes[node.name] = methods
+
+    def _changed_locals(self, module: str, changed: set) -> set:
+        """Names visible in ``module`` that refer to a changed definition."""
+        named, star = self.imports.get(module, ({}, []))
+        return (
+            {name for owner, name in changed if owner == module or owner in star}
+            | {alias for alias, target in named.items() if target in changed}
+        )
+
+    def changed_definitions(self, previous) -> set:
+        """(module, name) of every definition that changed, or that uses one that did."""
+        changed = set()
+        for module in set(self.modules) | set(previous.modules):
+            definitions = self.modules.get(module, {})
+            old_definitions = previous.modules.get(module, {})
+            names = set(definitions) | set(old_definitions)
+            if self.module_code.get(module) != previous.module_code.get(module):
+                changed |= {(module, name) for name in names}
+                continue
+            changed |= {
+                (module, name) for name in names
+                if definitions.get(name, (None,))[0] != old_definitions.get(name, (None,))[0]
+            }
+        while True:
+            users = set()
+            for module, definitions in self.modules.items():
+                used_changed = self._changed_locals(module, changed)
+                users |= {
+                    (module, name) for name, (_, used) in definitions.items()
+                    if (module, name) not in changed and used & used_changed
+                }
+            if not users:
+                return changed
+            changed |= users
+
+    def changed_sections(self, previous) -> dict:
+        """Scene class name to the list of its sections affected by the edit."""
+        changed = self.changed_definitions(previous)
+        affected = {}
+        for scene_name, methods in self.classes.items():
+            old_methods = previous.classes.get(scene_name)
+            sections = self.sections.get(scene_name, [])
+            if (
+                old_methods is None
+                or self.preambles[scene_name] != previous.preambles.get(scene_name)
+                or methods.get("construct") != old_methods.get("construct")
+            ):
+                if sections:
+                    affected[scene_name] = sections
+                continue
+
+            changed_names = self._changed_locals(self.scene_modules[scene_name], changed)
+            dirty = {
+                name for name, (dump, used, _) in methods.items()
+                if old_methods.get(name, (None,))[0] != dump or used & changed_names
+            }
+            hit = [section for section in sections if self._reaches(methods, section, dirty)]
+            if hit:
+                affected[scene_name] = hit
+        return affected
+
+    @staticmethod
+    def _reaches(methods: dict, start: str, dirty: set) -> bool:
+        seen = set()
+        stack = [start]
+        while stack:
+            name = stack.pop()
+            if name in dirty:
+                return True
+            if name in seen or name not in methods:
+                continue
+            seen.add(name)
+            stack.extend(methods[name][2])
+        return False
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+def render_section(scene_name: str, section: str, quality: str, output) -> Path:
+    """Render one section of a scene to ``output`` (a path without extension)."""
+    scene_cls = get_scene_class(scene_name)
+    overrides = {
+        "output_file": str(output),
+        # Sections render concurrently, keep their cached partial files apart
+        "partial_movie_dir": f"{{video_dir}}/partial_movie_files/{{scene_name}}/{section}",
+    }
+    with tempconfig(scene_config(scene_cls, quality, **overrides)):
+        renderer = SectionRenderer(section)
+        scene = scene_cls(renderer=renderer)
+        wrap_sections(scene, renderer.track)
+        scene.render()
+        return renderer.file_writer.movie_file_path
+
+
+class PreviewWatcher:
+    """Keeps one clip per section up to date and splices them into a preview movie."""
+
+    def __init__(self, scene_names: list, quality: str, directory, jobs=None):
+        self.scene_names = scene_names
+        self.quality = quality
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.preview = self.directory / "preview.mp4"
+        self.index = SourceIndex()
+        # A fresh process per render, so every render imports the edited code
+        self.pool = ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1)
+        self.pending = {}
+        # Sections edited again while their render was already running
+        self.rerun = set()
+
+    def clip(self, scene_name: str, section: str) -> Path:
+        return self.directory / f"{scene_name}.{section}.mp4"
+
+    def submit(self, scene_name: str, section: str):
+        key = (scene_name, section)
+        previous = self.pending.get(key)
+        if previous is not None and not previous.cancel() and not previous.done():
+            # A running render writes the same clip and partial movie files:
+            # render again once it is done rather than next to it
+            self.rerun.add(key)
+            print(f"Queued {scene_name}.{section} after the render in progress")
+            return
+        output = self.clip(scene_name, section).with_suffix("")
+        print(f"Rendering {scene_name}.{section}")
+        self.pending[key] = self.pool.submit(
+            render_section, scene_name, section, self.quality, output
+        )
+
+    def start(self):
+        """Render every section that has no clip yet."""
+        for scene_name in self.scene_names:
+            for section in self.index.sections.get(scene_name, []):
+                if not self.clip(scene_name, section).exists():
+                    self.submit(scene_name, section)
+        if not self.pending:
+            self.splice()
+
+    def refresh(self):
+        """Re-parse the sources and re-render the sections an edit touched."""
+        try:
+            index = SourceIndex()
+        except SyntaxError as error:
+            print(f"Not rendering, syntax error: {error}")
+            return
+        affected = index.changed_sections(self.index)
+        self.index = index
+        for scene_name in self.scene_names:
+            for section in affected.get(scene_name, []):
+                self.submit(scene_name, section)
+
+    def poll(self):
+        """Collect finished renders, splice the preview once a batch is done."""
+        finished = [key for key, future in self.pending.items() if future.done()]
+        for key in finished:
+            error = self.pending.pop(key).exception()
+            if error is not None:
+                print(f"{key[0]}.{key[1]} failed, keeping the previous clip: {error}")
+            if key in self.rerun:
+                self.rerun.discard(key)
+                self.submit(*key)
+        if finished and not self.pending:
+            self.splice()
+
+    def splice(self):
+        clips = [
+            self.clip(scene_name, section)
+            for scene_name in self.scene_names
+            for section in self.index.sections.get(scene_name, [])
+            if self.clip(scene_name, section).exists()
+        ]
+        if not clips:
+            return
+        spliced = concat_movies(clips, self.directory / "preview_next.mp4")
+        spliced.replace(self.preview)
+        print(f"Preview updated: {self.preview} ({len(clips)} sections)")
+
+
+class SourceChangeHandler(FileSystemEventHandler):
+    def __init__(self, events: queue.Queue):
+        super().__init__()
+        self.events = events
+
+    def on_any_event(self, event):
+        # Editors often save by writing a new file and moving it into place
+        if event.is_directory or event.event_type not in ("modified", "created", "moved"):
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if path.endswith(".py"):
+            self.events.put(path)
+
+
+def main():
+    parser = build_parser(
+        "Re-render only the play_* sections touched by an edit and keep a spliced preview.",
+        multiple_scenes=True,
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel section renders")
+    parser.add_argument(
+        "--debounce", type=float, default=0.5,
+        help="Seconds without further saves before re-rendering",
+    )
+    args = parser.parse_args()
+
+    scene_names = args.scenes or [cls.__name__ for cls in SCENE_CLASSES]
+    watcher = PreviewWatcher(
+        scene_names,
+        args.quality,
+        Path(config.media_dir) / "watch" / args.quality,
+        args.jobs,
+    )
+    watcher.start()
+
+    events = queue.Queue()
+    observer = Observer()
+    observer.schedule(SourceChangeHandler(events), str(SCENES_DIR))
+    observer.start()
+    print(f"Watching {SCENES_DIR}")
+    try:
+        while True:
+            try:
+                events.get(timeout=0.2)
+            except queue.Empty:
+                watcher.poll()
+                continue
+            # Wait for the burst of events of a save to settle
+            while True:
+                try:
+                    events.get(timeout=args.debounce)
+                except queue.Empty:
+                    break
+            watcher.refresh()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+        watcher.pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Byte-level BPE training with an indexed max-heap.
+
+Text is split into chunks (words with their leading space, numbers,
+punctuation runs, whitespace) like the GPT-4 tokenizer does, identical chunks
+are counted once, and merges are learned incrementally:
+
+- pair counts and an index from every pair to the chunks containing it are
+  built once,
+- the most frequent pair comes from a max-heap; entries are never updated in
+  place, a popped entry whose count is out of date is pushed back with the
+  current count (lazy invalidation),
+- a merge only rewrites the chunks that contain the pair and adjusts the
+  counts of the pairs around it.
+
+This trains thousands of merges on megabytes of text in seconds.
+
+Two encoders apply the merges: a naive pure-Python one, and one that encodes
+every distinct chunk once, all chunks together, with NumPy (pair ranks come
+from a sorted table of merge keys). With --benchmark both encode the corpus
+and their throughput is written to media/benchmarks/tokenizer.json, which
+the tokenizer scene reads for its speed comparison.
+
+Usage:
+    uv run python scenes/bpe.py input.txt --merges 5000
+    uv run python scenes/bpe.py input.txt --merges 5000 --benchmark
+"""
+
+import heapq
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+# GPT-4 style pre-tokenization, without the Unicode classes \p{L} and \p{N}
+SPLIT_PATTERN = re.compile(
+    r"""'(?i:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+"""
+)
+
+
+BENCHMARK_FILE = Path(__file__).resolve().parent.parent / "media" / "benchmarks" / "tokenizer.json"
+
+
+class Merge(NamedTuple):
+    pair: tuple
+    token: int
+    count: int
+
+
+def split_chunks(text: str) -> list:
+    """The byte strings BPE merges within; merges never cross chunks."""
+    return [chunk.encode("utf-8") for chunk in SPLIT_PATTERN.findall(text)]
+
+
+def _pairs(ids: list) -> Counter:
+    return Counter(zip(ids, ids[1:]))
+
+
+def _merge(ids: list, pair: tuple, token: int) -> list:
+    merged = []
+    i = 0
+    while i < len(ids):
+        if i + 1 < len(ids) and ids[i] == pair[0] and ids[i + 1] == pair[1]:
+            merged.append(token)
+            i += 2
+        else:
+            merged.append(ids[i])
+            i += 1
+    return merged
+
+
+def train_bpe(text: str, num_merges: int) -> list:
+    """Learn up to ``num_merges`` merges from ``text``; token ids start at 256."""
+    chunk_counts = Counter(split_chunks(text))
+    words = [list(chunk) for chunk in chunk_counts]
+    counts = list(chunk_counts.values())
+
+    pair_counts = Counter()
+    where = defaultdict(set)
+    for index, (ids, count) in enumerate(zip(words, counts)):
+        for pair, n in _pairs(ids).items():
+            pair_counts[pair] += n * count
+            where[pair].add(index)
+
+    # Ties go to the smallest pair, so training is deterministic
+    heap = [(-count, pair) for pair, count in pair_counts.items()]
+    heapq.heapify(heap)
+
+    merges = []
+    while heap and len(merges) < num_merges:
+        negative_count, pair = heapq.heappop(heap)
+        count = pair_counts.get(pair, 0)
+        if count <= 0:
+            continue
+        if count != -negative_count:
+            # Stale entry: the count changed since it was pushed
+            heapq.heappush(heap, (-count, pair))
+            continue
+
+        token = 256 + len(merges)
+        merges.append(Merge(pair, token, count))
+
+        changed = set()
+        for index in where.pop(pair):
+            ids = words[index]
+            before = _pairs(ids)
+            if pair not in before:
+                continue
+            words[index] = ids = _merge(ids, pair, token)
+            after = _pairs(ids)
+            for other in before.keys() | after.keys():
+                delta = after.get(other, 0) - before.get(other, 0)
+                if delta:
+                    pair_counts[other] += delta * counts[index]
+                    changed.add(other)
+                    if other in after:
+                        where[other].add(index)
+        del pair_counts[pair]
+        changed.discard(pair)
+        for other in changed:
+            if pair_counts[other] > 0:
+                # Counts that dropped are fixed up lazily when their old entry is popped
+                heapq.heappush(heap, (-pair_counts[other], other))
+            else:
+                del pair_counts[other]
+    return merges
+
+
+def vocabulary(merges: list) -> dict:
+    """Bytes of every token: the 256 single bytes and one token per merge."""
+    vocab = {i: bytes([i]) for i in range(256)}
+    for merge in merges:
+        vocab[merge.token] = vocab[merge.pair[0]] + vocab[merge.pair[1]]
+    return vocab
+
+
+def printable(token: bytes) -> str:
+    """Token bytes as text to display, with visible spaces."""
+    return token.decode("utf-8", errors="replace").replace(" ", "␣")
+
+
+def merge_trace(text: str, num_merges: int) -> list:
+    """
+    Train on ``text`` and replay the merges on it. The first step holds the
+    raw bytes of ``text``, every following one a merge and the result:
+    ``ids`` and ``tokens`` (their bytes) of the whole text, and ``merged``,
+    the positions of the tokens the merge produced.
+    """
+    merges = train_bpe(text, num_merges)
+    vocab = vocabulary(merges)
+    chunks = [list(chunk) for chunk in split_chunks(text)]
+    steps = []
+    for merge in [None] + merges:
+        if merge is not None:
+            chunks = [_merge(ids, merge.pair, merge.token) for ids in chunks]
+        ids = [i for chunk in chunks for i in chunk]
+        steps.append({
+            "merge": merge,
+            "ids": ids,
+            "tokens": [vocab[i] for i in ids],
+            # New token ids are unique, so they mark exactly the merged positions
+            "merged": [position for position, i in enumerate(ids) if merge and i == merge.token],
+        })
+    return steps
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+def encode_naive(text: str, merges: list) -> list:
+    """Encode chunk by chunk, applying the lowest-ranked pair until none is left."""
+    ranks = {merge.pair: merge.token for merge in merges}
+    ids = []
+    for chunk in split_chunks(text):
+        chunk_ids = list(chunk)
+        while len(chunk_ids) >= 2:
+            pair = min(_pairs(chunk_ids), key=lambda p: ranks.get(p, float("inf")))
+            if pair not in ranks:
+                break
+            chunk_ids = _merge(chunk_ids, pair, ranks[pair])
+        ids.extend(chunk_ids)
+    return ids
+
+
+class Encoder:
+    """
+    Encodes with the merges of ``train_bpe``. Every distinct chunk is encoded
+    once, and all of them at the same time: each round looks up the rank of
+    every adjacent pair in one search over the sorted merge keys and merges
+    the lowest-ranked pair of every chunk.
+    """
+
+    def __init__(self, merges: list):
+        # Merge ids increase with rank, so the id of a merge is its rank
+        keys = np.array([self._key(*merge.pair) for merge in merges], dtype=np.int64)
+        order = np.argsort(keys)
+        self.keys = keys[order]
+        self.tokens = np.array([merge.token for merge in merges], dtype=np.int64)[order]
+
+    @staticmethod
+    def _key(left, right):
+        return left * 2**32 + right
+
+    def encode(self, text: str) -> list:
+        chunk_index = {}
+        chunks = [chunk_index.setdefault(chunk, len(chunk_index)) for chunk in split_chunks(text)]
+        encoded = self.encode_chunks(list(chunk_index))
+        return [i for chunk in chunks for i in encoded[chunk]]
+
+    def encode_chunks(self, chunks: list) -> list:
+        none = np.iinfo(np.int64).max
+        lengths = np.fromiter(map(len, chunks), dtype=np.int64, count=len(chunks))
+        ids = np.frombuffer(b"".join(chunks), dtype=np.uint8).astype(np.int64)
+        owner = np.repeat(np.arange(len(chunks)), lengths)
+        while len(self.keys) and len(ids) > 1:
+            keys = self._key(ids[:-1], ids[1:])
+            found = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            hit = (owner[:-1] == owner[1:]) & (self.keys[found] == keys)
+            if not hit.any():
+                break
+            ranks = np.full(len(ids), none)
+            ranks[:-1][hit] = self.tokens[found[hit]]
+            first = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+            best = np.minimum.reduceat(ranks, first)[owner]
+            starts = np.flatnonzero((ranks == best) & (ranks != none))
+            starts = starts[self._leftmost(starts)]
+            ids[starts] = ranks[starts]
+            keep = np.ones(len(ids), dtype=bool)
+            keep[starts + 1] = False
+            ids, owner = ids[keep], owner[keep]
+        offsets = np.r_[0, np.cumsum(np.bincount(owner, minlength=len(chunks)))]
+        return [ids[start:end].tolist() for start, end in zip(offsets, offsets[1:])]
+
+    @staticmethod
+    def _leftmost(starts):
+        """Mask of the merges to apply when a pair overlaps itself ("aaa"), left to right."""
+        keep = np.ones(len(starts), dtype=bool)
+        overlapping = np.diff(starts) == 1
+        if overlapping.any():
+            run_start = np.r_[True, ~overlapping]
+            run_first = np.flatnonzero(run_start)[np.cumsum(run_start) - 1]
+            keep = (np.arange(len(starts)) - run_first) % 2 == 0
+        return keep
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def benchmark(text: str, merges: list) -> dict:
+    """Encode ``text`` with both encoders and compare their throughput."""
+    results = {"corpus_bytes": len(text.encode("utf-8")), "merges": len(merges)}
+    encoded = {}
+    encoders = {
+        "naive": lambda: encode_naive(text, merges),
+        "optimized": lambda: Encoder(merges).encode(text),
+    }
+    for name, encode in encoders.items():
+        start = time.perf_counter()
+        encoded[name] = encode()
+        seconds = time.perf_counter() - start
+        results[name] = {
+            "seconds": seconds,
+            "tokens": len(encoded[name]),
+            "tokens_per_second": len(encoded[name]) / seconds,
+            "mb_per_second": results["corpus_bytes"] / 2**20 / seconds,
+        }
+    if encoded["naive"] != encoded["optimized"]:
+        raise ValueError("The optimized encoder does not match the naive one")
+    results["speedup"] = results["naive"]["seconds"] / results["optimized"]["seconds"]
+    return results
+
+
+def load_benchmark(path=BENCHMARK_FILE):
+    """Results written by ``--benchmark``, or None before it ran."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train byte-level BPE merges on a text file.")
+    parser.add_argument("input", help="UTF-8 text file")
+    parser.add_argument("--merges", type=int, default=5000)
+    parser.add_argument("--benchmark", action="store_true", help="Compare the naive and optimized encoders on the input")
+    parser.add_argument("--output", default=BENCHMARK_FILE, help=f"Benchmark JSON path (default: {BENCHMARK_FILE})")
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as fp:
+        text = fp.read()
+    start = time.perf_counter()
+    merges = train_bpe(text, args.merges)
+    elapsed = time.perf_counter() - start
+    vocab = vocabulary(merges)
+    print(f"{len(merges)} merges on {len(text.encode('utf-8')) / 2**20:.1f} MB in {elapsed:.2f}s")
+    for merge in merges[:10]:
+        print(f"  {merge.token}: {vocab[merge.token]!r} ({merge.count})")
+    if not args.benchmark:
+        return
+
+    results = benchmark(text, merges)
+    print(f"\n{'encoder':<12}{'seconds':>10}{'tokens/s':>14}{'MB/s':>8}")
+    for name in ("naive", "optimized"):
+        stats = results[name]
+        print(f"{name:<12}{stats['seconds']:>10.2f}{stats['tokens_per_second']:>14,.0f}{stats['mb_per_second']:>8.2f}")
+    print(f"speedup: {results['speedup']:.1f}x")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump({"input": Path(args.input).name, **results}, fp, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,12 @@ Follows 3Blue1Brown aesthetic.
 """
 
 from manim import *
+import functools
 import numpy as np
+try:
+    from .attention import self_attention
+except ImportError:
+    from attention import self_attention
 
 # =============================================================================
 # Color Palette (3Blue1Brown inspired)
@@ -279,22 +284,80 @@ def wave_in(mobject, direction=UP, amplitude=0.5):
     return mobject.animate.shift(direction * amplitude).set_opacity(1)
 
 
+def show_frame(mobject, alpha, frames):
+    """Turn ``mobject`` into the frame of ``frames`` reached at ``alpha``."""
+    mobject.become(frames[int(round(alpha * (len(frames) - 1)))])
+
+
+def flipbook(mobject, frames, **kwargs):
+    """
+    Show precomputed ``frames`` one after the other in place of ``mobject``.
+    Unlike ``always_redraw``, the animation holds no closure, so timelines
+    captured by render.timeline can replay it.
+    """
+    return UpdateFromAlphaFunc(mobject, functools.partial(show_frame, frames=frames), **kwargs)
+
+
 # =============================================================================
 # Math Helpers
 # =============================================================================
 
-def create_attention_weights(seq_len, causal=True):
-    """Create attention weight matrix for visualization."""
-    weights = np.random.rand(seq_len, seq_len)
-    if causal:
-        mask = np.triu(np.ones((seq_len, seq_len)), k=1)
-        weights = np.where(mask, 0, weights)
-    # Normalize rows
-    weights = weights / weights.sum(axis=1, keepdims=True)
-    return weights
+def create_attention_weights(seq_len, causal=True, n_head=1, n_kv_head=None, head=0, seed=0):
+    """Attention weight matrix of one head, computed on deterministic embeddings."""
+    _, weights = self_attention(seq_len, n_head, n_kv_head, causal=causal, seed=seed)
+    return weights[head]
 
 
 def softmax(x):
     """Compute softmax values."""
     e_x = np.exp(x - np.max(x))
     return e_x / e_x.sum()
+
+
+def lr_multiplier(x, warmup_ratio=0.0, warmdown_ratio=0.2, final_lr_frac=0.0):
+    """Learning rate multiplier at training progress ``x`` in [0, 1], for arrays of ``x``."""
+    x = np.asarray(x, dtype=float)
+    return np.piecewise(
+        x,
+        [x < warmup_ratio, x > 1 - warmdown_ratio],
+        [
+            lambda x: x / warmup_ratio,
+            lambda x: (1 - x) / warmdown_ratio * (1 - final_lr_frac) + final_lr_frac,
+            1.0,
+        ]
+    )
+
+
+# =============================================================================
+# Plotting Helpers
+# =============================================================================
+
+def adaptive_samples(x_range, breakpoints=(), samples=64, refine=8):
+    """
+    Sample positions over ``x_range``: evenly spaced, plus the breakpoints and
+    points closing in on them geometrically from both sides.
+    """
+    x_min, x_max = x_range[:2]
+    offsets = (x_max - x_min) / samples * 0.5 ** np.arange(1, refine + 1)
+    breakpoints = np.asarray(breakpoints, dtype=float).reshape(-1, 1)
+    near = (breakpoints + np.concatenate([-offsets, [0.0], offsets])).ravel()
+    xs = np.concatenate([np.linspace(x_min, x_max, samples + 1), near])
+    return np.unique(xs[(xs >= x_min) & (xs <= x_max)])
+
+
+def plot_vectorized(axes, func, x_range, breakpoints=(), samples=64, color=CYAN_ACCENT, stroke_width=3):
+    """
+    Graph of a vectorized function: ``func`` is called once on every sample
+    position and the path is built from the resulting array of points.
+    """
+    xs = adaptive_samples(x_range, breakpoints, samples)
+    graph = VMobject(color=color, stroke_width=stroke_width)
+    graph.set_points_as_corners(axes.c2p(xs, func(xs)).T)
+    return graph
+
+
+def area_vectorized(axes, func, x_range, breakpoints=(), samples=64, color=CYAN_ACCENT, opacity=0.3):
+    """Area between the x-axis and a vectorized function over ``x_range``."""
+    xs = adaptive_samples(x_range, breakpoints, samples)
+    points = axes.c2p(np.concatenate([xs, xs[::-1]]), np.concatenate([func(xs), np.zeros_like(xs)])).T
+    return Polygon(*points, stroke_width=0, fill_color=color, fill_opacity=opacity)
@@ -0,0 +1,290 @@
+"""
+Streaming token data loader over on-disk shards, as in nanochat pretraining.
+
+Shards are read lazily through generators: NumPy shards (``.npy``, uint16
+token ids) are memory-mapped and sliced into chunks, Parquet shards (a
+``tokens`` column, one row group per chunk) are read one row group at a
+time with pyarrow, which is only needed for Parquet. Chunks are dealt to the
+ranks round-robin (chunk ``i`` of all shards goes to rank ``i % world_size``),
+like the row groups of nanochat's loader: a rank slices or reads only its
+own chunks and skips the others without reading them.
+
+Every rank has a background thread that reads its chunks, cuts them into
+``(batch_size, sequence_len)`` inputs and targets, and keeps up to
+``prefetch`` batches ready in a queue. A training step takes one batch from
+every rank; the benchmark records the tokens delivered to every rank and the
+depth of every queue over time, and the tokens/sec of the whole pipeline.
+
+Usage:
+    uv run python scenes/data_loader.py --world-size 8 --shards 8 --tokens-per-shard 4194304
+    uv run python scenes/data_loader.py --format parquet --step-ms 5
+"""
+
+import json
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+BENCHMARK_FILE = Path(__file__).resolve().parent.parent / "media" / "benchmarks" / "data_loader.json"
+
+VOCAB_SIZE = 65536
+FORMATS = ("npy", "parquet")
+
+
+def _require_pyarrow():
+    if pq is None:
+        raise ImportError("Parquet shards need pyarrow: uv pip install pyarrow")
+
+
+def write_shards(directory, num_shards: int = 8, tokens_per_shard: int = 2**20, chunk_tokens: int = 2**16,
+                 fmt: str = "npy", seed: int = 0) -> list:
+    """Write synthetic shards of random token ids and return their paths."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown shard format {fmt!r}, expected one of {FORMATS}")
+    if fmt == "parquet":
+        _require_pyarrow()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for index in range(num_shards):
+        tokens = rng.integers(0, VOCAB_SIZE, tokens_per_shard, dtype=np.uint16)
+        path = directory / f"shard_{index:05d}.{fmt}"
+        if fmt == "npy":
+            np.save(path, tokens)
+        else:
+            pq.write_table(pa.table({"tokens": tokens}), path, row_group_size=chunk_tokens)
+        paths.append(path)
+    return paths
+
+
+def shard_chunks(path, chunk_tokens: int = 2**16) -> int:
+    """Number of chunks of a shard, from its metadata or header only."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        _require_pyarrow()
+        return pq.ParquetFile(path).num_row_groups
+    return -(-len(np.load(path, mmap_mode="r")) // chunk_tokens)
+
+
+def read_shard(path, chunk_tokens: int = 2**16, rank: int = 0, world_size: int = 1, offset: int = 0):
+    """
+    Yield the tokens of a shard chunk by chunk, without loading it whole.
+    Only the chunks of ``rank`` are read, those whose index counted from
+    ``offset`` (the chunks of the previous shards) is ``rank`` modulo
+    ``world_size``.
+    """
+    path = Path(path)
+    first = (rank - offset) % world_size
+    if path.suffix == ".parquet":
+        _require_pyarrow()
+        shard = pq.ParquetFile(path)
+        for row_group in range(first, shard.num_row_groups, world_size):
+            yield shard.read_row_group(row_group, columns=["tokens"]).column(0).to_numpy()
+    else:
+        tokens = np.load(path, mmap_mode="r")
+        for start in range(first * chunk_tokens, len(tokens), world_size * chunk_tokens):
+            yield np.array(tokens[start:start + chunk_tokens])
+
+
+def rank_chunks(paths, rank: int, world_size: int, chunk_tokens: int = 2**16):
+    """Chunks of every shard in order, keeping every ``world_size``-th one from ``rank``."""
+    offset = 0
+    for path in paths:
+        yield from read_shard(path, chunk_tokens, rank, world_size, offset)
+        offset += shard_chunks(path, chunk_tokens)
+
+
+def batches(chunks, batch_size: int, sequence_len: int):
+    """Inputs and targets ``(batch_size, sequence_len)`` from a stream of chunks."""
+    needed = batch_size * sequence_len + 1
+    buffer = np.empty(0, dtype=np.uint16)
+    for chunk in chunks:
+        buffer = np.concatenate([buffer, chunk])
+        while len(buffer) >= needed:
+            tokens = buffer[:needed].astype(np.int64)
+            # The last token of a batch is only a target, so it starts the next one
+            buffer = buffer[needed - 1:]
+            yield tokens[:-1].reshape(batch_size, sequence_len), tokens[1:].reshape(batch_size, sequence_len)
+
+
+class Prefetcher:
+    """
+    Runs a generator in a background thread, keeping up to ``depth`` items
+    ready. An exception raised by the generator is raised again by ``next``.
+    """
+
+    _DONE = object()
+
+    def __init__(self, iterable, depth: int = 4):
+        self.queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._fill, args=(iter(iterable),), daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        # Time out now and then so that close() stops a thread waiting on a full queue
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self, iterator):
+        try:
+            for item in iterator:
+                if not self._put(item):
+                    return
+        except BaseException as error:
+            # A truncated shard or an I/O error: hand it to the consumer
+            self._error = error
+        finally:
+            self._put(self._DONE)
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def next(self):
+        """The next item, or None when the generator is exhausted."""
+        while True:
+            try:
+                item = self.queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                # The thread always ends with _DONE, unless it was closed
+                if not self._thread.is_alive() and self.queue.empty():
+                    item = self._DONE
+                    break
+        if item is self._DONE:
+            if self._error is not None:
+                raise RuntimeError("Prefetching failed") from self._error
+            return None
+        return item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def stream(paths, world_size: int = 8, batch_size: int = 8, sequence_len: int = 2048, prefetch: int = 4,
+           chunk_tokens: int = 2**16, step_ms: float = 0.0) -> dict:
+    """
+    Run training steps over the shards until a rank runs out of tokens,
+    taking one batch from every rank per step, with ``step_ms`` of simulated
+    compute per step. Returns the tokens/sec and the trace of every step.
+    """
+    start = time.perf_counter()
+    loaders = [
+        Prefetcher(batches(rank_chunks(paths, rank, world_size, chunk_tokens), batch_size, sequence_len), prefetch)
+        for rank in range(world_size)
+    ]
+    tokens = np.zeros(world_size, dtype=np.int64)
+    trace = []
+    try:
+        while True:
+            # Queue depths as the step begins, before its batches are taken
+            depths = [loader.depth() for loader in loaders]
+            step = [loader.next() for loader in loaders]
+            if any(batch is None for batch in step):
+                break
+            tokens += [inputs.size for inputs, _ in step]
+            if step_ms:
+                time.sleep(step_ms / 1000)
+            trace.append({
+                "time": time.perf_counter() - start,
+                "tokens": tokens.tolist(),
+                "queue_depth": depths,
+            })
+    finally:
+        for loader in loaders:
+            loader.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "steps": len(trace),
+        "elapsed": elapsed,
+        "tokens_per_second": float(tokens.sum()) / elapsed if trace else 0.0,
+        "trace": trace,
+    }
+
+
+def benchmark(world_size: int = 8, num_shards: int = 8, tokens_per_shard: int = 2**22, batch_size: int = 8,
+              sequence_len: int = 2048, prefetch: int = 4, chunk_tokens: int = 2**16, step_ms: float = 0.0,
+              fmt: str = "npy", directory=None, seed: int = 0) -> dict:
+    """Stream synthetic shards, written to ``directory`` or a temporary one."""
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = write_shards(directory or scratch, num_shards, tokens_per_shard, chunk_tokens, fmt, seed)
+        results = stream(paths, world_size, batch_size, sequence_len, prefetch, chunk_tokens, step_ms)
+    return {
+        "format": fmt,
+        "world_size": world_size,
+        "shards": num_shards,
+        "tokens_per_shard": tokens_per_shard,
+        "batch_size": batch_size,
+        "sequence_len": sequence_len,
+        "prefetch": prefetch,
+        "step_ms": step_ms,
+        **results,
+    }
+
+
+def load_benchmark(path=BENCHMARK_FILE):
+    """Results written by this module, or None before it ran."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark a streaming token loader on synthetic shards.")
+    parser.add_argument("--world-size", type=int, default=8, help="Ranks (GPUs) to shard the chunks over")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--tokens-per-shard", type=int, default=2**22)
+    parser.add_argument("--batch-size", type=int, default=8, help="Sequences per rank and step")
+    parser.add_argument("--sequence-len", type=int, default=2048)
+    parser.add_argument("--prefetch", type=int, default=4, help="Batches kept ready per rank")
+    parser.add_argument("--step-ms", type=float, default=0.0, help="Simulated compute per step")
+    parser.add_argument("--format", choices=FORMATS, default="npy")
+    parser.add_argument("--directory", help="Keep the shards here instead of a temporary directory")
+    parser.add_argument("--output", default=BENCHMARK_FILE, help=f"Results JSON path (default: {BENCHMARK_FILE})")
+    args = parser.parse_args()
+
+    results = benchmark(
+        args.world_size, args.shards, args.tokens_per_shard, args.batch_size, args.sequence_len,
+        args.prefetch, step_ms=args.step_ms, fmt=args.format, directory=args.directory,
+    )
+    trace = results["trace"]
+    print(f"{'step':>6}{'ms':>10}{'tokens/rank':>13}{'mean queue':>12}")
+    for step in range(0, len(trace), max(len(trace) // 8, 1)):
+        entry = trace[step]
+        print(
+            f"{step + 1:>6}{entry['time'] * 1000:>10.1f}{entry['tokens'][0]:>13,}"
+            f"{np.mean(entry['queue_depth']):>12.2f}"
+        )
+    print(f"{results['steps']} steps, {results['tokens_per_second']:,.0f} tokens/s over {args.world_size} ranks")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(results, fp)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
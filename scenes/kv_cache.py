@@ -0,0 +1,238 @@
+"""
+Toy NumPy decoder with and without a KV cache.
+
+A small GPT (token embeddings, pre-norm causal attention and ReLU² MLP
+blocks, RoPE and QK norm) generates greedily in two ways:
+
+- without a cache, every new token runs the whole context through the model
+  again, so a token costs O(n) projections and O(n²) attention,
+- with a ``KVCache``, only the new token is projected and its query attends
+  to the cached keys and values, O(n) per token.
+
+The cache is preallocated and either grows by doubling (every key and value
+kept, like the nanochat engine) or is a ring buffer of a fixed number of
+positions (sliding-window attention over the most recent tokens).
+
+Every generated token records its latency and the bytes of keys and values
+it needed, so the curves in the inference scene are measured.
+
+Usage:
+    uv run python scenes/kv_cache.py --tokens 512
+    uv run python scenes/kv_cache.py --tokens 512 --ring 128
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .attention import causal_attention, rms_norm
+    from .rope import apply_rotary, rotary_cache
+except ImportError:
+    from attention import causal_attention, rms_norm
+    from rope import apply_rotary, rotary_cache
+
+BENCHMARK_FILE = Path(__file__).resolve().parent.parent / "media" / "benchmarks" / "kv_cache.json"
+
+
+class KVCache:
+    """
+    Keys and values of every layer, ``(n_layer, n_kv_head, capacity, head_dim)``.
+    Grows by doubling, or with ``ring=True`` keeps the last ``capacity``
+    positions and overwrites the oldest.
+    """
+
+    def __init__(self, n_layer: int, n_kv_head: int, head_dim: int, capacity: int = 4, ring: bool = False):
+        shape = (n_layer, n_kv_head, capacity, head_dim)
+        self.k = np.zeros(shape, dtype=np.float32)
+        self.v = np.zeros(shape, dtype=np.float32)
+        self.ring = ring
+        self.length = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.k.shape[2]
+
+    @property
+    def nbytes(self) -> int:
+        return self.k.nbytes + self.v.nbytes
+
+    def slot(self) -> int:
+        """Slot of the next position, growing the cache when it is full."""
+        if self.length < self.capacity:
+            return self.length
+        if self.ring:
+            return self.length % self.capacity
+        # Doubling keeps the number of copies per token constant on average
+        self.k = np.concatenate([self.k, np.zeros_like(self.k)], axis=2)
+        self.v = np.concatenate([self.v, np.zeros_like(self.v)], axis=2)
+        return self.length
+
+    def put(self, layer: int, slot: int, k: np.ndarray, v: np.ndarray):
+        self.k[layer, :, slot] = k
+        self.v[layer, :, slot] = v
+
+    def view(self, layer: int):
+        """Cached keys and values of a layer, new position included."""
+        used = min(self.length + 1, self.capacity)
+        return self.k[layer, :, :used], self.v[layer, :, :used]
+
+
+class ToyDecoder:
+    """A small GPT with deterministic weights."""
+
+    def __init__(self, vocab_size: int = 256, n_layer: int = 4, n_head: int = 4, n_kv_head: int = None,
+                 head_dim: int = 32, max_sequence_len: int = 4096, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.n_layer = n_layer
+        self.n_head = n_head
+        self.n_kv_head = n_kv_head or n_head
+        self.head_dim = head_dim
+        n_embd = n_head * head_dim
+
+        def weight(*shape):
+            return rng.standard_normal(shape, dtype=np.float32) / math.sqrt(shape[0])
+
+        self.wte = rng.standard_normal((vocab_size, n_embd), dtype=np.float32)
+        self.layers = [
+            {
+                "q": weight(n_embd, n_head * head_dim),
+                "kv": weight(n_embd, 2 * self.n_kv_head * head_dim),
+                "proj": weight(n_head * head_dim, n_embd),
+                "fc": weight(n_embd, 4 * n_embd),
+                "out": weight(4 * n_embd, n_embd),
+            }
+            for _ in range(n_layer)
+        ]
+        self.lm_head = weight(n_embd, vocab_size)
+        self.cos, self.sin = rotary_cache(max_sequence_len, head_dim)
+
+    def _qkv(self, layer: dict, x: np.ndarray, start: int = 0):
+        """
+        Queries ``(n_head, T, head_dim)`` and keys and values
+        ``(n_kv_head, T, head_dim)`` of positions ``start`` to ``start + T``.
+        """
+        x = rms_norm(x)
+        q = (x @ layer["q"]).reshape(len(x), self.n_head, self.head_dim).transpose(1, 0, 2)
+        kv = (x @ layer["kv"]).reshape(len(x), 2, self.n_kv_head, self.head_dim).transpose(1, 2, 0, 3)
+        q, k = apply_rotary(q, self.cos, self.sin, start), apply_rotary(kv[0], self.cos, self.sin, start)
+        return rms_norm(q), rms_norm(k), kv[1]
+
+    def _block(self, layer: dict, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        x = x + y.transpose(1, 0, 2).reshape(len(x), -1) @ layer["proj"]
+        return x + np.square(np.maximum(rms_norm(x) @ layer["fc"], 0)) @ layer["out"]
+
+    def forward(self, ids: list) -> np.ndarray:
+        """Logits of the last position, recomputing the whole context."""
+        x = self.wte[ids]
+        for layer in self.layers:
+            q, k, v = self._qkv(layer, x)
+            x = self._block(layer, x, causal_attention(q, k, v))
+        return rms_norm(x[-1]) @ self.lm_head
+
+    def forward_cached(self, token: int, cache: KVCache) -> np.ndarray:
+        """Logits of one new token, attending to the cached keys and values."""
+        x = self.wte[[token]]
+        slot = cache.slot()
+        for index, layer in enumerate(self.layers):
+            # Keys are rotated by their position before caching, so a ring
+            # buffer can overwrite old slots without re-rotating the others
+            q, k, v = self._qkv(layer, x, start=cache.length)
+            cache.put(index, slot, k[:, 0], v[:, 0])
+            keys, values = cache.view(index)
+            x = self._block(layer, x, causal_attention(q, keys, values))
+        cache.length += 1
+        return rms_norm(x[-1]) @ self.lm_head
+
+    def kv_bytes_per_token(self) -> int:
+        return 2 * self.n_layer * self.n_kv_head * self.head_dim * np.dtype(np.float32).itemsize
+
+
+def generate(model: ToyDecoder, prompt: list, tokens: int, cache: KVCache = None) -> dict:
+    """
+    Greedy generation of ``tokens`` tokens, with a trace of every token: its
+    context length, latency, and the bytes of keys and values held (the
+    cache allocation, or the keys and values recomputed without a cache).
+    """
+    ids = list(prompt)
+    trace = []
+    if cache is not None:
+        for token in ids[:-1]:
+            model.forward_cached(token, cache)
+    for _ in range(tokens):
+        start = time.perf_counter()
+        logits = model.forward(ids) if cache is None else model.forward_cached(ids[-1], cache)
+        latency = time.perf_counter() - start
+        trace.append({
+            "context": len(ids),
+            "latency_ms": latency * 1000,
+            "kv_bytes": cache.nbytes if cache is not None else len(ids) * model.kv_bytes_per_token(),
+            "cached": cache.length if cache is not None else 0,
+            "capacity": cache.capacity if cache is not None else 0,
+        })
+        ids.append(int(np.argmax(logits)))
+    return {"ids": ids, "trace": trace}
+
+
+def benchmark(tokens: int = 256, ring: int = None, seed: int = 0) -> dict:
+    """Generate ``tokens`` tokens without a cache and with one, from the same prompt."""
+    model = ToyDecoder(seed=seed)
+    prompt = [seed % 256]
+    runs = {
+        "no_cache": generate(model, prompt, tokens),
+        "cache": generate(
+            model, prompt, tokens,
+            KVCache(model.n_layer, model.n_kv_head, model.head_dim, capacity=ring or 4, ring=ring is not None),
+        ),
+    }
+    if ring is None and runs["no_cache"]["ids"] != runs["cache"]["ids"]:
+        raise ValueError("Generation with the KV cache differs from generation without it")
+    return {
+        "tokens": tokens,
+        "ring": ring,
+        "kv_bytes_per_token": model.kv_bytes_per_token(),
+        **{name: run["trace"] for name, run in runs.items()},
+    }
+
+
+def load_benchmark(path=BENCHMARK_FILE):
+    """Results written by this module, or None before it ran."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure generation with and without a KV cache.")
+    parser.add_argument("--tokens", type=int, default=512, help="Tokens to generate")
+    parser.add_argument("--ring", type=int, help="Ring buffer of this many positions instead of a growing cache")
+    parser.add_argument("--output", default=BENCHMARK_FILE, help=f"Results JSON path (default: {BENCHMARK_FILE})")
+    args = parser.parse_args()
+
+    results = benchmark(args.tokens, args.ring)
+    print(f"{'context':>8}{'no cache ms':>13}{'cache ms':>10}{'cache KB':>10}")
+    step = max(args.tokens // 8, 1)
+    for without, cached in list(zip(results["no_cache"], results["cache"]))[::step]:
+        print(
+            f"{without['context']:>8}{without['latency_ms']:>13.2f}"
+            f"{cached['latency_ms']:>10.2f}{cached['kv_bytes'] / 1024:>10.0f}"
+        )
+    total = {name: sum(entry["latency_ms"] for entry in results[name]) for name in ("no_cache", "cache")}
+    print(f"total: {total['no_cache']:.0f} ms without cache, {total['cache']:.0f} ms with cache")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(results, fp, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Quintic Newton-Schulz orthogonalization, as in the Muon optimizer.
+
+``orthogonalize`` runs the iteration
+
+    X <- aX + b(XXᵀ)X + c(XXᵀ)²X,    (a, b, c) = (3.4445, -4.7750, 2.0315)
+
+on a batch of matrices at once (``(batch, rows, cols)``), after scaling
+every matrix to unit Frobenius norm. Every singular value of X is pushed
+towards 1 while the singular vectors stay the same, so the result
+approximates UVᵀ of the update.
+
+Every step is timed, and the singular values can be recorded after each
+step, which the base-training scene animates. The script doubles as a CPU
+benchmark of the iteration on nanochat-sized matrices (d20: 1280 x 5120 for
+the MLP).
+
+Usage:
+    uv run python scenes/newton_schulz.py --shape 1280 5120 --batch 2
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+COEFFICIENTS = (3.4445, -4.7750, 2.0315)
+BENCHMARK_FILE = Path(__file__).resolve().parent.parent / "media" / "benchmarks" / "newton_schulz.json"
+
+
+def random_matrices(batch: int, rows: int, cols: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((batch, rows, cols), dtype=np.float32)
+
+
+def singular_values(x: np.ndarray) -> np.ndarray:
+    """Singular values of every matrix of a batch, in decreasing order."""
+    return np.linalg.svd(x, compute_uv=False)
+
+
+def orthogonalize(g: np.ndarray, steps: int = 5, eps: float = 1e-7, record_spectra: bool = False):
+    """
+    Orthogonalize a batch of matrices ``(..., rows, cols)``. Returns the
+    result, the time of every step in seconds, and with ``record_spectra``
+    the singular values before the first step and after every step.
+    """
+    a, b, c = COEFFICIENTS
+    x = g / (np.linalg.norm(g, axis=(-2, -1), keepdims=True) + eps)
+    # Iterate on the wide orientation, so XXᵀ is the smaller Gram matrix
+    tall = x.shape[-2] > x.shape[-1]
+    if tall:
+        x = x.swapaxes(-2, -1)
+    spectra = [singular_values(x)] if record_spectra else None
+    times = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        gram = x @ x.swapaxes(-2, -1)
+        polynomial = b * gram + c * (gram @ gram)
+        x = a * x + polynomial @ x
+        times.append(time.perf_counter() - start)
+        if record_spectra:
+            spectra.append(singular_values(x))
+    if tall:
+        x = x.swapaxes(-2, -1)
+    return x, times, spectra
+
+
+def benchmark(shape=(1280, 5120), batch: int = 1, steps: int = 5, seed: int = 0) -> dict:
+    """Orthogonalize a batch of random matrices, with step times and the spectra of the first."""
+    g = random_matrices(batch, *shape, seed=seed)
+    _, times, spectra = orthogonalize(g, steps, record_spectra=True)
+    return {
+        "shape": list(shape),
+        "batch": batch,
+        "coefficients": list(COEFFICIENTS),
+        "step_ms": [seconds * 1000 for seconds in times],
+        "spectra": [spectrum[0].tolist() for spectrum in spectra],
+    }
+
+
+def load_benchmark(path=BENCHMARK_FILE):
+    """Results written by this module, or None before it ran."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark Newton-Schulz orthogonalization on random matrices.")
+    parser.add_argument("--shape", type=int, nargs=2, default=[1280, 5120], metavar=("ROWS", "COLS"))
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--output", default=BENCHMARK_FILE, help=f"Results JSON path (default: {BENCHMARK_FILE})")
+    args = parser.parse_args()
+
+    results = benchmark(tuple(args.shape), args.batch, args.steps)
+    print(f"{args.batch} x {args.shape[0]}x{args.shape[1]}")
+    print(f"{'step':>6}{'ms':>10}{'min σ':>10}{'max σ':>10}")
+    spectra = results["spectra"]
+    print(f"{0:>6}{'':>10}{min(spectra[0]):>10.4f}{max(spectra[0]):>10.4f}")
+    for step, (ms, spectrum) in enumerate(zip(results["step_ms"], spectra[1:]), 1):
+        print(f"{step:>6}{ms:>10.1f}{min(spectrum):>10.4f}{max(spectrum):>10.4f}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(results, fp)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Rotary position embeddings (RoPE) from precomputed cos/sin tables.
+
+A head of ``head_dim`` channels is split into ``head_dim / 2`` pairs, the
+first half of the channels paired with the second half as in nanochat. Pair
+``i`` at position ``p`` is rotated by the angle ``p * base^(-2i / head_dim)``:
+the first pairs spin fast with the position, the last ones barely move.
+
+``rotary_cache`` computes the cos/sin tables ``(sequence_len, head_dim / 2)``
+once per ``(sequence_len, head_dim, base)`` and keeps them, and
+``apply_rotary`` rotates every pair of a whole batch ``(..., T, head_dim)``
+with two multiply-adds, no Python loop. The attention module applies it to
+queries and keys, and the transformer scene animates the angles.
+
+Usage:
+    uv run python scenes/rope.py --sequence-len 2048 --head-dim 128 --n-head 10
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+BASE = 10000
+
+
+def inverse_frequencies(head_dim: int, base: float = BASE) -> np.ndarray:
+    """Rotation speed of every pair, in radians per position, ``(head_dim / 2,)``."""
+    if head_dim % 2:
+        raise ValueError(f"head_dim ({head_dim}) must be even")
+    return base ** -(np.arange(0, head_dim, 2, dtype=np.float64) / head_dim)
+
+
+def angles(positions, head_dim: int, base: float = BASE) -> np.ndarray:
+    """Angle of every pair at every position, ``(len(positions), head_dim / 2)``."""
+    return np.outer(np.asarray(positions, dtype=np.float64), inverse_frequencies(head_dim, base))
+
+
+@lru_cache(maxsize=16)
+def rotary_cache(sequence_len: int, head_dim: int, base: float = BASE):
+    """
+    Read-only cos and sin tables ``(sequence_len, head_dim / 2)`` in float32,
+    computed once per arguments.
+    """
+    theta = angles(np.arange(sequence_len), head_dim, base)
+    cos, sin = np.cos(theta).astype(np.float32), np.sin(theta).astype(np.float32)
+    cos.flags.writeable = False
+    sin.flags.writeable = False
+    return cos, sin
+
+
+def apply_rotary(x: np.ndarray, cos: np.ndarray, sin: np.ndarray, start: int = 0) -> np.ndarray:
+    """
+    Rotate the pairs of ``x`` ``(..., T, head_dim)`` by the angles of
+    positions ``start`` to ``start + T`` of the tables.
+    """
+    sequence_len, half = x.shape[-2], x.shape[-1] // 2
+    if start + sequence_len > len(cos):
+        raise ValueError(f"positions up to {start + sequence_len} but the cache has {len(cos)}")
+    cos, sin = cos[start:start + sequence_len], sin[start:start + sequence_len]
+    x1, x2 = x[..., :half], x[..., half:]
+    return np.concatenate([x1 * cos - x2 * sin, x1 * sin + x2 * cos], axis=-1)
+
+
+def pair_trajectories(vectors, positions, base: float = BASE) -> np.ndarray:
+    """
+    Every pair of ``vectors`` ``(..., head_dim)`` rotated to every position,
+    as 2D points ``(..., len(positions), head_dim / 2, 2)``.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    positions = np.asarray(positions)
+    head_dim = vectors.shape[-1]
+    cos, sin = rotary_cache(int(positions.max()) + 1, head_dim, base)
+    x = np.broadcast_to(vectors[..., None, :], vectors.shape[:-1] + (len(positions), head_dim))
+    rotated = apply_rotary(x, cos[positions], sin[positions])
+    return np.stack([rotated[..., :head_dim // 2], rotated[..., head_dim // 2:]], axis=-1)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Time RoPE from precomputed tables.")
+    parser.add_argument("--sequence-len", type=int, default=2048)
+    parser.add_argument("--head-dim", type=int, default=128)
+    parser.add_argument("--n-head", type=int, default=10)
+    parser.add_argument("--base", type=float, default=BASE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cos, sin = rotary_cache(args.sequence_len, args.head_dim, args.base)
+    cached = time.perf_counter()
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((args.n_head, args.sequence_len, args.head_dim), dtype=np.float32)
+    applied = time.perf_counter()
+    y = apply_rotary(x, cos, sin)
+    done = time.perf_counter()
+    # Rotations keep the norms of the vectors
+    assert np.allclose(np.linalg.norm(y, axis=-1), np.linalg.norm(x, axis=-1), rtol=1e-4)
+    print(
+        f"T={args.sequence_len} head_dim={args.head_dim} heads={args.n_head}: "
+        f"tables {(cached - start) * 1000:.1f} ms, rotation {(done - applied) * 1000:.1f} ms"
+    )
+    speeds = inverse_frequencies(args.head_dim, args.base)
+    print(f"pair 0 turns every {2 * np.pi / speeds[0]:.1f} positions, the last every {2 * np.pi / speeds[-1]:,.0f}")
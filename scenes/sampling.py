@@ -0,0 +1,128 @@
+"""
+Temperature, top-k and top-p sampling, batched over temperatures.
+
+``distributions`` turns one row of logits into the sampling distribution for
+every temperature at once, ``(temperatures, vocab_size)``: the top-k filter
+uses ``argpartition`` (no full sort), top-p sorts only the tokens that are
+left, and the softmax is computed stably for all rows together. ``sample``
+draws Monte-Carlo samples from every row in one ``searchsorted``.
+
+A temperature sweep over the 65,536-token vocabulary of nanochat is a single
+call, which the inference scene animates.
+
+Usage:
+    uv run python scenes/sampling.py --temperatures 0.1 1.0 2.0 --top-k 50
+"""
+
+import numpy as np
+
+VOCAB_SIZE = 65536
+
+# Tokens shown in the scene, with the highest logits of the example
+EXAMPLE_TOKENS = ["the", "a", "blue", "sky", "is"]
+EXAMPLE_LOGITS = [9.0, 8.1, 7.8, 7.4, 6.7]
+
+
+def example_logits(vocab_size: int = VOCAB_SIZE, seed: int = 0) -> np.ndarray:
+    """Logits with ``EXAMPLE_TOKENS`` as the most likely tokens and a long tail."""
+    rng = np.random.default_rng(seed)
+    logits = rng.normal(-6.0, 1.5, vocab_size)
+    logits[:len(EXAMPLE_LOGITS)] = EXAMPLE_LOGITS
+    return logits
+
+
+def distributions(logits, temperatures, top_k: int = None, top_p: float = None) -> np.ndarray:
+    """
+    Sampling distribution of ``logits`` (vocab_size,) at every temperature,
+    ``(len(temperatures), vocab_size)``. A temperature of 0 is greedy.
+    """
+    logits = np.asarray(logits, dtype=np.float64)
+    temperatures = np.asarray(temperatures, dtype=np.float64).reshape(-1, 1)
+    if top_k is not None and top_k < logits.shape[-1]:
+        # The k largest logits do not depend on the temperature
+        keep = np.argpartition(logits, -top_k)[-top_k:]
+        masked = np.full_like(logits, -np.inf)
+        masked[keep] = logits[keep]
+        logits = masked
+
+    greedy = temperatures == 0
+    scaled = logits / np.where(greedy, 1.0, temperatures)
+    scaled -= scaled.max(axis=-1, keepdims=True)
+    probs = np.exp(scaled)
+    probs /= probs.sum(axis=-1, keepdims=True)
+    probs[greedy[:, 0]] = np.eye(1, logits.shape[-1], int(np.argmax(logits)))[0]
+
+    if top_p is not None:
+        candidates = np.flatnonzero(np.isfinite(logits))
+        order = candidates[np.argsort(-probs[:, candidates], axis=-1, kind="stable")]
+        sorted_probs = np.take_along_axis(probs, order, axis=-1)
+        # Keep the smallest prefix reaching top_p; the first token always stays
+        outside = np.cumsum(sorted_probs, axis=-1) - sorted_probs >= top_p
+        np.put_along_axis(probs, order, np.where(outside, 0.0, sorted_probs), axis=-1)
+        probs /= probs.sum(axis=-1, keepdims=True)
+    return probs
+
+
+def sample(probs: np.ndarray, num_samples: int, seed: int = 0) -> np.ndarray:
+    """``num_samples`` token ids drawn from every row of ``probs``, ``(rows, num_samples)``."""
+    probs = np.atleast_2d(probs)
+    rows, vocab_size = probs.shape
+    rng = np.random.default_rng(seed)
+    # Shifting row r of the CDFs to [r, r + 1] makes them one sorted array
+    offsets = np.arange(rows)[:, None]
+    cdf = np.cumsum(probs, axis=-1)
+    cdf /= cdf[:, -1:]
+    cdf += offsets
+    draws = rng.random((rows, num_samples)) + offsets
+    ids = np.searchsorted(cdf.ravel(), draws.ravel(), side="right").reshape(rows, num_samples)
+    return np.minimum(ids - offsets * vocab_size, vocab_size - 1)
+
+
+def frequencies(samples: np.ndarray, tokens) -> np.ndarray:
+    """Fraction of the samples of every row equal to each of ``tokens``."""
+    return (samples[..., None] == np.asarray(tokens)).mean(axis=-2)
+
+
+def entropy(probs: np.ndarray) -> np.ndarray:
+    """Entropy of every row, in bits."""
+    logs = np.log2(probs, out=np.zeros_like(probs), where=probs > 0)
+    return np.maximum(-(probs * logs).sum(axis=-1), 0.0)
+
+
+def temperature_sweep(temperatures, num_samples: int = 1000, top_k: int = None, top_p: float = None,
+                      vocab_size: int = VOCAB_SIZE, seed: int = 0) -> dict:
+    """Distributions of the example logits over ``temperatures``, with Monte-Carlo samples."""
+    probs = distributions(example_logits(vocab_size, seed), temperatures, top_k, top_p)
+    samples = sample(probs, num_samples, seed)
+    shown = np.arange(len(EXAMPLE_TOKENS))
+    return {
+        "temperatures": np.asarray(temperatures, dtype=np.float64),
+        "probs": probs[:, shown],
+        "rest": 1 - probs[:, shown].sum(axis=-1),
+        "sampled": frequencies(samples, shown),
+        "entropy": entropy(probs),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sampling distributions of the example logits.")
+    parser.add_argument("--temperatures", type=float, nargs="+", default=[0.1, 1.0, 2.0])
+    parser.add_argument("--top-k", type=int)
+    parser.add_argument("--top-p", type=float)
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sweep = temperature_sweep(args.temperatures, args.samples, args.top_k, args.top_p)
+    elapsed = time.perf_counter() - start
+    print(f"{'T':>6}" + "".join(f"{token:>8}" for token in EXAMPLE_TOKENS) + f"{'rest':>8}{'bits':>8}")
+    for i, temperature in enumerate(sweep["temperatures"]):
+        print(
+            f"{temperature:>6.2f}" + "".join(f"{p:>8.3f}" for p in sweep["probs"][i])
+            + f"{sweep['rest'][i]:>8.3f}{sweep['entropy'][i]:>8.2f}"
+        )
+        print(f"{'':>6}" + "".join(f"{f:>8.3f}" for f in sweep["sampled"][i]) + "  (sampled)")
+    print(f"{len(sweep['temperatures'])} temperatures over {VOCAB_SIZE:,} tokens in {elapsed * 1000:.0f} ms")
@@ -8,12 +8,20 @@ try:
     from .common import *
 except ImportError:
     from common import *
+try:
+    from .bpe import load_benchmark, merge_trace, printable
+except ImportError:
+    from bpe import load_benchmark, merge_trace, printable
 import numpy as np
 
 
 class TokenizerScene(Scene):
     """Deep dive into the BPE tokenizer."""
     
+    # Text the BPE merges are learned on and shown for
+    bpe_text = "hello yellow"
+    bpe_merges = 3
+    
     def construct(self):
         configure_scene(self)
         
@@ -93,32 +101,24 @@ class TokenizerScene(Scene):
         
         self.play(Write(title), run_time=0.8)
         
+        # Merges actually learned on the text, replayed on it
+        trace = merge_trace(self.bpe_text, self.bpe_merges)
+        
         # Step-by-step BPE explanation
         step1_title = Text("Step 1: Start with bytes", font_size=32, color=BLUE_PRIMARY)
         step1_title.next_to(title, DOWN, buff=0.8)
         
-        # Show "hello" as individual bytes
-        word = "hello"
-        byte_boxes = VGroup()
-        
-        for char in word:
-            box = TokenBox(char, color=PURPLE_PRIMARY, font_size=36)
-            byte_boxes.add(box)
-        
-        byte_boxes.arrange(RIGHT, buff=0.1)
-        byte_boxes.move_to(ORIGIN)
-        
-        # Byte values below
-        byte_values = VGroup()
-        for i, char in enumerate(word):
-            val = Text(str(ord(char)), font_size=18, color=TEXT_GRAY)
-            val.next_to(byte_boxes[i], DOWN, buff=0.15)
-            byte_values.add(val)
+        # Show the text as individual bytes, with their values below
+        byte_boxes, byte_values = self.bpe_token_row(trace[0])
         
         self.play(FadeIn(step1_title), run_time=0.4)
-        
-        for box, val in zip(byte_boxes, byte_values):
-            self.play(FadeIn(box), FadeIn(val), run_time=0.2)
+        self.play(
+            LaggedStart(
+                *[FadeIn(VGroup(box, val)) for box, val in zip(byte_boxes, byte_values)],
+                lag_ratio=0.3
+            ),
+            run_time=1
+        )
         
         self.wait(1)
         
@@ -132,67 +132,79 @@ class TokenizerScene(Scene):
             run_time=0.4
         )
         
-        # Highlight 'l' and 'l' pair
-        highlight_rect = SurroundingRectangle(
-            VGroup(byte_boxes[2], byte_boxes[3]),
-            color=CYAN_ACCENT,
-            buff=0.1
-        )
-        
-        pair_label = Text("'ll' appears most often!", font_size=24, color=CYAN_ACCENT)
-        pair_label.next_to(byte_boxes, DOWN, buff=0.8)
-        
-        self.play(Create(highlight_rect), run_time=0.5)
-        self.play(FadeIn(pair_label), run_time=0.3)
-        self.wait(1)
-        
-        # Step 3: Merge the pair
-        step3_title = Text("Step 3: Merge into new token", font_size=32, color=BLUE_PRIMARY)
-        step3_title.next_to(title, DOWN, buff=0.8)
-        
-        self.play(
-            FadeOut(step2_title),
-            FadeIn(step3_title),
-            FadeOut(pair_label),
-            run_time=0.4
-        )
-        
-        # Create merged token
-        merged = TokenBox("ll", color=GREEN_ACCENT, font_size=36)
-        merged.move_to(VGroup(byte_boxes[2], byte_boxes[3]).get_center())
-        
-        merge_label = Text("Token 256", font_size=18, color=GREEN_ACCENT)
-        merge_label.next_to(merged, DOWN, buff=0.15)
-        
-        # Animate merge
-        self.play(
-            FadeOut(byte_boxes[2]),
-            FadeOut(byte_boxes[3]),
-            FadeOut(byte_values[2]),
-            FadeOut(byte_values[3]),
-            FadeOut(highlight_rect),
-            run_time=0.3
-        )
-        self.play(
-            FadeIn(merged, scale=1.2),
-            FadeIn(merge_label),
-            run_time=0.4
-        )
+        step_title = step2_title
+        boxes, values = byte_boxes, byte_values
+        for i, step in enumerate(trace[1:]):
+            merge = step["merge"]
+            sources = self.bpe_merge_sources(step)
+            pair_text = printable(step["tokens"][step["merged"][0]])
+            
+            # Highlight every occurrence of the pair
+            highlight_rects = VGroup(*[
+                SurroundingRectangle(
+                    VGroup(*[boxes[j] for j in sources[position]]),
+                    color=CYAN_ACCENT,
+                    buff=0.05
+                )
+                for position in step["merged"]
+            ])
+            
+            pair_label = Text(
+                f"'{pair_text}' appears most often ({merge.count}×)",
+                font_size=24,
+                color=CYAN_ACCENT
+            )
+            pair_label.next_to(boxes, DOWN, buff=0.8)
+            
+            self.play(Create(highlight_rects), run_time=0.5 if i == 0 else 0.3)
+            self.play(FadeIn(pair_label), run_time=0.3)
+            self.wait(1 if i == 0 else 0.5)
+            
+            # Step 3: Merge the pair
+            if i == 0:
+                step3_title = Text("Step 3: Merge into new token", font_size=32, color=BLUE_PRIMARY)
+                step3_title.next_to(title, DOWN, buff=0.8)
+                self.play(
+                    FadeOut(step_title),
+                    FadeIn(step3_title),
+                    run_time=0.4
+                )
+                step_title = step3_title
+            
+            new_boxes, new_values = self.bpe_token_row(step)
+            self.play(
+                FadeOut(pair_label),
+                FadeOut(highlight_rects),
+                *[
+                    ReplacementTransform(VGroup(*[boxes[j] for j in source]), new_boxes[position])
+                    for position, source in enumerate(sources)
+                ],
+                *[
+                    ReplacementTransform(VGroup(*[values[j] for j in source]), new_values[position])
+                    for position, source in enumerate(sources)
+                ],
+                run_time=0.7 if i == 0 else 0.5
+            )
+            
+            merge_label = Text(
+                f"Token {merge.token} = '{pair_text}'",
+                font_size=24,
+                color=GREEN_ACCENT
+            )
+            merge_label.next_to(new_boxes, DOWN, buff=0.8)
+            self.play(FadeIn(merge_label), run_time=0.3)
+            self.wait(1 if i == 0 else 0.5)
+            self.play(FadeOut(merge_label), run_time=0.3)
+            
+            boxes, values = new_boxes, new_values
         
-        # Show new sequence
-        new_sequence = VGroup(
-            byte_boxes[0].copy(),
-            byte_boxes[1].copy(),
-            merged.copy(),
-            byte_boxes[4].copy(),
+        new_label = Text(
+            f"New sequence: {len(trace[-1]['ids'])} tokens instead of {len(trace[0]['ids'])}",
+            font_size=24,
+            color=TEXT_GRAY
         )
-        new_sequence.arrange(RIGHT, buff=0.1)
-        new_sequence.move_to(DOWN * 1.5)
-        
-        new_label = Text("New sequence: 4 tokens instead of 5", font_size=24, color=TEXT_GRAY)
-        new_label.next_to(new_sequence, DOWN, buff=0.5)
+        new_label.next_to(boxes, DOWN, buff=0.8)
         
-        self.play(FadeIn(new_sequence), run_time=0.5)
         self.play(FadeIn(new_label), run_time=0.3)
         
         self.wait(1.5)
@@ -211,21 +223,43 @@ class TokenizerScene(Scene):
         # Clear all
         self.play(
             FadeOut(title),
-            FadeOut(step3_title),
-            FadeOut(byte_boxes[0]),
-            FadeOut(byte_boxes[1]),
-            FadeOut(byte_boxes[4]),
-            FadeOut(byte_values[0]),
-            FadeOut(byte_values[1]),
-            FadeOut(byte_values[4]),
-            FadeOut(merged),
-            FadeOut(merge_label),
-            FadeOut(new_sequence),
+            FadeOut(step_title),
+            FadeOut(boxes),
+            FadeOut(values),
             FadeOut(new_label),
             FadeOut(iteration_text),
             run_time=1
         )
     
+    def bpe_token_row(self, step):
+        """Token boxes of a merge trace step, with their ids below."""
+        boxes = VGroup()
+        for token, token_id in zip(step["tokens"], step["ids"]):
+            color = PURPLE_PRIMARY if token_id < 256 else GREEN_ACCENT
+            boxes.add(TokenBox(printable(token), color=color, font_size=36))
+        
+        boxes.arrange(RIGHT, buff=0.1)
+        if boxes.width > config.frame_width - 1:
+            boxes.scale_to_fit_width(config.frame_width - 1)
+        boxes.move_to(ORIGIN)
+        
+        values = VGroup()
+        for box, token_id in zip(boxes, step["ids"]):
+            val = Text(str(token_id), font_size=18, color=TEXT_GRAY)
+            val.next_to(box, DOWN, buff=0.15)
+            values.add(val)
+        return boxes, values
+    
+    def bpe_merge_sources(self, step):
+        """Positions in the previous step each token of ``step`` comes from."""
+        sources = []
+        previous = 0
+        for position in range(len(step["ids"])):
+            width = 2 if position in step["merged"] else 1
+            sources.append(list(range(previous, previous + width)))
+            previous += width
+        return sources
+    
     def play_special_tokens(self):
         """Show the special tokens used in nanochat."""
         
@@ -287,8 +321,22 @@ class TokenizerScene(Scene):
         title = Text("Rust BPE: Speed Matters", font_size=48, color=CYAN_ACCENT)
         title.to_edge(UP, buff=0.6)
         
-        # Performance comparison
-        comparison_title = Text("Training Time Comparison", font_size=32, color=TEXT_WHITE)
+        # Performance comparison, measured by `scenes/bpe.py --benchmark` when it ran
+        results = load_benchmark()
+        if results:
+            comparison_title_text = "Encoding Time Comparison (measured)"
+            slow_text = f"Naive Python: {results['naive']['seconds']:.1f} s"
+            fast_text = f"Optimized: {results['optimized']['seconds']:.2f} s"
+            speedup_text = f"{results['speedup']:.0f}× faster!"
+            fast_width = max(5 / results["speedup"], 0.2)
+        else:
+            comparison_title_text = "Training Time Comparison"
+            slow_text = "Python: ~30 min"
+            fast_text = "Rust: ~2 min"
+            speedup_text = "15× faster!"
+            fast_width = 1.5
+        
+        comparison_title = Text(comparison_title_text, font_size=32, color=TEXT_WHITE)
         comparison_title.next_to(title, DOWN, buff=0.6)
         
         # Bar chart
@@ -304,24 +352,24 @@ class TokenizerScene(Scene):
         python_bar.move_to(LEFT * 0.5 + UP * 0.5)
         
         rust_bar = RoundedRectangle(
-            corner_radius=0.1,
-            width=1.5,
+            corner_radius=min(0.1, fast_width / 2),
+            width=fast_width,
             height=0.6,
             fill_color=GREEN_ACCENT,
             fill_opacity=0.6,
             stroke_color=GREEN_ACCENT,
             stroke_width=2
         )
+        rust_bar.move_to(DOWN * 0.5)
         rust_bar.align_to(python_bar, LEFT)
-        rust_bar.move_to(LEFT * 2.25 + DOWN * 0.5)
         
-        python_label = Text("Python: ~30 min", font_size=20, color=TEXT_WHITE)
+        python_label = Text(slow_text, font_size=20, color=TEXT_WHITE)
         python_label.next_to(python_bar, RIGHT, buff=0.3)
         
-        rust_label = Text("Rust: ~2 min", font_size=20, color=TEXT_WHITE)
+        rust_label = Text(fast_text, font_size=20, color=TEXT_WHITE)
         rust_label.next_to(rust_bar, RIGHT, buff=0.3)
         
-        speedup = Text("15× faster!", font_size=36, color=GREEN_ACCENT, weight=BOLD)
+        speedup = Text(speedup_text, font_size=36, color=GREEN_ACCENT, weight=BOLD)
         speedup.move_to(DOWN * 1.8)
         
         # Key features
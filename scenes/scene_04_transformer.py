@@ -8,9 +8,31 @@ try:
     from .common import *
 except ImportError:
     from common import *
+try:
+    from .rope import inverse_frequencies, pair_trajectories
+except ImportError:
+    from rope import inverse_frequencies, pair_trajectories
+import functools
 import numpy as np
 
 
+# Update functions live at module level: render.timeline pickles every
+# animation, and closures cannot be pickled
+
+def rope_position_label(position):
+    """Counter of the position the RoPE dials are turned to."""
+    return Text(f"position = {position}", font_size=32, color=TEXT_WHITE).move_to(RIGHT * 3.5 + UP * 1.2)
+
+
+def turn_rope_hands(dial_state, alpha, points, centers, radius):
+    """Turn the hands of ``dial_state`` to the position ``alpha`` of the way through ``points``."""
+    hands, label = dial_state
+    position = int(round(alpha * (len(points) - 1)))
+    for hand, center, (x, y) in zip(hands, centers, points[position]):
+        hand.put_start_and_end_on(center, center + radius * (x * RIGHT + y * UP))
+    label.become(rope_position_label(position))
+
+
 class TransformerScene(Scene):
     """Deep dive into the Transformer architecture."""
     
@@ -25,6 +47,7 @@ class TransformerScene(Scene):
         
         # Part 3: Rotary Position Embeddings
         self.play_rope()
+        self.play_rope_frequencies()
         
         # Part 4: Attention mechanism
         self.play_attention()
@@ -246,19 +269,16 @@ class TransformerScene(Scene):
         original_label = Text("x", font_size=24, color=BLUE_PRIMARY)
         original_label.next_to(original_vec.get_end(), UR, buff=0.1)
         
-        # Rotated vectors for different positions
-        angles = [0.3, 0.6, 0.9]
+        # Rotated vectors for different positions: the pair of a 64-dim head
+        # that turns by ~0.32 rad per position, rotated from the RoPE tables
+        head = np.zeros(64)
+        head[4], head[36] = 1.5, 0.5
+        rotated = pair_trajectories(head, [1, 2, 3])[:, 4]
         colors = [GREEN_ACCENT, ORANGE_ACCENT, RED_ACCENT]
         rotated_vecs = VGroup()
         pos_labels = VGroup()
         
-        for i, (angle, color) in enumerate(zip(angles, colors)):
-            # Rotate the vector
-            cos_a, sin_a = np.cos(angle), np.sin(angle)
-            x, y = 1.5, 0.5
-            new_x = x * cos_a - y * sin_a
-            new_y = x * sin_a + y * cos_a
-            
+        for i, ((new_x, new_y), color) in enumerate(zip(rotated, colors)):
             vec = Arrow(
                 axes.c2p(0, 0),
                 axes.c2p(new_x, new_y),
@@ -332,6 +352,109 @@ class TransformerScene(Scene):
             run_time=1
         )
     
+    def play_rope_frequencies(self):
+        """Rotate every pair of several heads across positions at once."""
+        
+        title = Text("RoPE Across Positions", font_size=44, color=CYAN_ACCENT)
+        title.to_edge(UP, buff=0.6)
+        
+        n_head, head_dim, positions = 4, 128, 256
+        subtitle = Text(
+            f"{n_head} heads × {head_dim // 2} pairs, rotated from one cos/sin table",
+            font_size=24,
+            color=TEXT_GRAY
+        )
+        subtitle.next_to(title, DOWN, buff=0.3)
+        
+        # Every pair of every head at every position: (positions, n_head * pairs, 2),
+        # normalized so that only the angle shows
+        vectors = np.random.default_rng(0).standard_normal((n_head, head_dim))
+        points = pair_trajectories(vectors, np.arange(positions))
+        points = points.transpose(1, 0, 2, 3).reshape(positions, -1, 2)
+        points /= np.linalg.norm(points, axis=-1, keepdims=True)
+        
+        # A 16 x 16 grid of clocks: 4 rows per head, pair index along the rows
+        head_colors = [BLUE_PRIMARY, PURPLE_PRIMARY, GREEN_ACCENT, ORANGE_ACCENT]
+        cols, spacing, radius = 16, 0.32, 0.13
+        origin = LEFT * 3.2 + DOWN * 0.4 + (LEFT + UP) * spacing * (cols - 1) / 2
+        centers = [
+            origin + RIGHT * spacing * (index % cols) + DOWN * spacing * (index // cols)
+            for index in range(points.shape[1])
+        ]
+        dials = VGroup(*[
+            Circle(radius=radius, color=TEXT_DIM, stroke_width=1).move_to(center)
+            for center in centers
+        ])
+        hands = VGroup(*[
+            Line(
+                center, center + radius * RIGHT,
+                color=head_colors[index // (head_dim // 2)],
+                stroke_width=2
+            )
+            for index, center in enumerate(centers)
+        ])
+        
+        head_labels = VGroup(*[
+            Text(f"head {head}", font_size=16, color=color).next_to(
+                dials[head * (head_dim // 2)], LEFT, buff=0.15
+            ).shift(DOWN * spacing * 1.5)
+            for head, color in enumerate(head_colors)
+        ])
+        
+        # Position counter and pair speeds
+        position_label = rope_position_label(0)
+        dial_state = VGroup(hands, position_label)
+        turn_rope_hands(dial_state, 0, points, centers, radius)
+        
+        speeds = inverse_frequencies(head_dim)
+        speed_notes = VGroup(
+            Text(f"pair 0: a turn every {2 * np.pi / speeds[0]:.1f} positions", font_size=20, color=TEXT_WHITE),
+            Text(f"pair 16: every {2 * np.pi / speeds[16]:,.0f} positions", font_size=20, color=TEXT_WHITE),
+            Text(f"pair 63: every {2 * np.pi / speeds[-1]:,.0f} positions", font_size=20, color=TEXT_WHITE),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.25)
+        speed_notes.move_to(RIGHT * 3.5 + DOWN * 0.3)
+        
+        insight = Text(
+            "Fast pairs track nearby tokens, slow pairs distant ones",
+            font_size=24,
+            color=GREEN_ACCENT
+        )
+        insight.to_edge(DOWN, buff=0.5)
+        
+        # Animate
+        self.play(Write(title), FadeIn(subtitle), run_time=0.8)
+        self.play(
+            LaggedStart(*[Create(dial) for dial in dials], lag_ratio=0.004),
+            FadeIn(hands),
+            FadeIn(head_labels),
+            run_time=1.2
+        )
+        self.play(FadeIn(position_label), FadeIn(speed_notes), run_time=0.5)
+        self.play(
+            UpdateFromAlphaFunc(
+                dial_state,
+                functools.partial(turn_rope_hands, points=points, centers=centers, radius=radius)
+            ),
+            run_time=8,
+            rate_func=linear
+        )
+        self.play(FadeIn(insight, shift=UP * 0.2), run_time=0.5)
+        
+        self.wait(2)
+        
+        # Transition
+        self.play(
+            FadeOut(title),
+            FadeOut(subtitle),
+            FadeOut(dials),
+            FadeOut(hands),
+            FadeOut(head_labels),
+            FadeOut(position_label),
+            FadeOut(speed_notes),
+            FadeOut(insight),
+            run_time=1
+        )
+    
     def play_attention(self):
         """Visualize the attention mechanism with QK norm and GQA."""
         
@@ -378,11 +501,13 @@ class TransformerScene(Scene):
         # Create causal attention matrix
         matrix_size = 5
         attention_matrix = VGroup()
+        weights = create_attention_weights(matrix_size)
         
         for i in range(matrix_size):
             for j in range(matrix_size):
                 if j <= i:  # Causal mask
-                    opacity = 0.3 + 0.7 * np.random.random()
+                    # Relative to the strongest key of the row, so later rows stay visible
+                    opacity = 0.15 + 0.85 * weights[i, j] / weights[i].max()
                     color = BLUE_PRIMARY
                 else:
                     opacity = 0
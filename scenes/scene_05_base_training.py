@@ -8,9 +8,88 @@ try:
     from .common import *
 except ImportError:
     from common import *
+try:
+    from .data_loader import benchmark as data_loader_benchmark, load_benchmark as load_data_loader_benchmark
+except ImportError:
+    from data_loader import benchmark as data_loader_benchmark, load_benchmark as load_data_loader_benchmark
+try:
+    from .newton_schulz import benchmark as newton_schulz_benchmark, load_benchmark as load_newton_schulz_benchmark
+except ImportError:
+    from newton_schulz import benchmark as newton_schulz_benchmark, load_benchmark as load_newton_schulz_benchmark
+import functools
 import numpy as np
 
 
+# Update functions live at module level: render.timeline pickles every
+# animation, and closures cannot be pickled
+
+def lr_schedule(axes, warmdown_ratio, final_lr_frac):
+    """LR curve, warmdown area and parameter label of one schedule."""
+    func = functools.partial(
+        lr_multiplier, warmup_ratio=0.0, warmdown_ratio=warmdown_ratio, final_lr_frac=final_lr_frac
+    )
+    curve = plot_vectorized(
+        axes,
+        func,
+        x_range=[0, 1],
+        breakpoints=[0.0, 1 - warmdown_ratio],
+        color=CYAN_ACCENT,
+        stroke_width=3
+    )
+    area = area_vectorized(
+        axes,
+        func,
+        x_range=[1 - warmdown_ratio, 1.0],
+        color=ORANGE_ACCENT,
+        opacity=0.3
+    )
+    label = Text(
+        f"warmdown_ratio = {warmdown_ratio:.2f}   final_lr_frac = {final_lr_frac:.2f}",
+        font_size=20,
+        color=ORANGE_ACCENT
+    ).next_to(axes, UP, buff=0.2)
+    return VGroup(curve, area, label)
+
+
+def sweep_lr_schedule(schedule, alpha, axes, start, end):
+    """Redraw ``schedule`` with its parameters moved from ``start`` to ``end`` by ``alpha``."""
+    warmdown_ratio, final_lr_frac = interpolate(np.array(start), np.array(end), alpha)
+    for mobject, target in zip(schedule, lr_schedule(axes, warmdown_ratio, final_lr_frac)):
+        mobject.become(target)
+
+
+def loader_flow_frame(trace, index, slots, row_y, bar_left, bar_width, final_tokens):
+    """Filled queue slots, token bars and throughput of step ``index`` of a loader trace."""
+    entry = trace[index]
+    fill = VGroup(*[
+        slot.copy().set_fill(ORANGE_ACCENT, opacity=0.8 if j < depth else 0)
+        for row, depth in zip(slots, entry["queue_depth"])
+        for j, slot in enumerate(row)
+    ])
+    bars = VGroup()
+    for tokens, y in zip(entry["tokens"], row_y):
+        width = max(bar_width * tokens / final_tokens, 0.01)
+        bar = Rectangle(
+            width=width, height=0.3,
+            fill_color=GREEN_ACCENT, fill_opacity=0.6, stroke_width=0
+        )
+        bar.move_to(RIGHT * (bar_left + width / 2) + UP * y)
+        bars.add(bar)
+    rate = sum(entry["tokens"]) / max(entry["time"], 1e-9)
+    stats = Text(
+        f"step {index + 1}   {rate / 1e6:,.1f}M tokens/s",
+        font_size=22,
+        color=TEXT_WHITE
+    ).to_edge(DOWN, buff=0.5)
+    return VGroup(fill, bars, stats)
+
+
+def show_loader_step(flow, alpha, trace, **layout):
+    """Redraw ``flow`` at the step ``alpha`` of the way through ``trace``."""
+    index = int(round(alpha * (len(trace) - 1)))
+    flow.become(loader_flow_frame(trace, index, **layout))
+
+
 class BaseTrainingScene(Scene):
     """Base model pretraining visualization."""
     
@@ -19,9 +98,11 @@ class BaseTrainingScene(Scene):
         
         # Part 1: Data pipeline
         self.play_data_pipeline()
+        self.play_loader_flow()
         
         # Part 2: Muon optimizer
         self.play_muon_optimizer()
+        self.play_newton_schulz_spectra()
         
         # Part 3: Training loop
         self.play_training_loop()
@@ -160,6 +241,94 @@ class BaseTrainingScene(Scene):
             run_time=1
         )
     
+    def play_loader_flow(self):
+        """Animate measured token flow and prefetch queues of every rank."""
+        
+        title = Text("Streaming Shards to Every GPU", font_size=44, color=CYAN_ACCENT)
+        title.to_edge(UP, buff=0.6)
+        
+        # Written by `scenes/data_loader.py`, or smaller shards streamed now
+        results = load_data_loader_benchmark() or data_loader_benchmark(tokens_per_shard=2**20, step_ms=2)
+        trace = results["trace"]
+        world_size, prefetch = results["world_size"], results["prefetch"]
+        final_tokens = max(trace[-1]["tokens"])
+        
+        row_y = [1.7 - i * 4.1 / max(world_size - 1, 1) for i in range(world_size)]
+        
+        # Shards on the left, dealt round-robin to the ranks
+        shards = VGroup()
+        for i in range(results["shards"]):
+            shard = RoundedRectangle(
+                corner_radius=0.08, width=1.1, height=0.36,
+                fill_color=PURPLE_PRIMARY, fill_opacity=0.3,
+                stroke_color=PURPLE_PRIMARY, stroke_width=2
+            )
+            shard_text = Text(f"shard {i}", font_size=14, color=TEXT_WHITE)
+            shard_text.move_to(shard.get_center())
+            shards.add(VGroup(shard, shard_text))
+        shards.arrange(DOWN, buff=0.12)
+        shards.move_to(LEFT * 5.6 + DOWN * 0.35)
+        
+        rank_labels = VGroup(*[
+            Text(f"GPU {rank}", font_size=18, color=GREEN_ACCENT).move_to(LEFT * 3.6 + UP * y)
+            for rank, y in enumerate(row_y)
+        ])
+        
+        # Prefetch queue of every rank: one slot per batch kept ready
+        slot_size = 0.28
+        slots = VGroup(*[
+            VGroup(*[
+                Square(side_length=slot_size, stroke_color=TEXT_DIM, stroke_width=1)
+                .move_to(LEFT * 2.6 + RIGHT * (slot_size + 0.06) * j + UP * y)
+                for j in range(prefetch)
+            ])
+            for y in row_y
+        ])
+        queue_header = Text("prefetch queue", font_size=16, color=TEXT_GRAY)
+        queue_header.next_to(slots[0], UP, buff=0.2)
+        
+        bar_left, bar_width = -0.6 + prefetch * 0.1, 5.2
+        tokens_header = Text("tokens delivered", font_size=16, color=TEXT_GRAY)
+        tokens_header.move_to(RIGHT * (bar_left + 1) + UP * (row_y[0] + 0.4))
+        
+        layout = dict(slots=slots, row_y=row_y, bar_left=bar_left, bar_width=bar_width, final_tokens=final_tokens)
+        flow = loader_flow_frame(trace, 0, **layout)
+        
+        # A few chunks dealt round-robin: chunk i goes to GPU i % world_size
+        chunks = VGroup()
+        moves = []
+        for i in range(2 * world_size):
+            dot = Dot(shards[0].get_right(), radius=0.06, color=ORANGE_ACCENT)
+            chunks.add(dot)
+            moves.append(dot.animate.move_to(slots[i % world_size][0].get_center()))
+        
+        # Animate
+        self.play(Write(title), run_time=0.8)
+        self.play(FadeIn(shards), FadeIn(rank_labels), run_time=0.5)
+        self.play(FadeIn(slots), FadeIn(queue_header), FadeIn(tokens_header), run_time=0.4)
+        self.add(chunks)
+        self.play(LaggedStart(*moves, lag_ratio=0.15), run_time=2)
+        self.play(FadeOut(chunks), FadeIn(flow), run_time=0.4)
+        self.play(
+            UpdateFromAlphaFunc(flow, functools.partial(show_loader_step, trace=trace, **layout)),
+            run_time=6,
+            rate_func=linear
+        )
+        
+        self.wait(2)
+        
+        # Transition
+        self.play(
+            FadeOut(title),
+            FadeOut(shards),
+            FadeOut(rank_labels),
+            FadeOut(slots),
+            FadeOut(queue_header),
+            FadeOut(tokens_header),
+            FadeOut(flow),
+            run_time=1
+        )
+    
     def play_muon_optimizer(self):
         """Visualize the Muon optimizer with Newton-Schulz."""
         
@@ -270,6 +439,114 @@ class BaseTrainingScene(Scene):
             run_time=1
         )
     
+    def play_newton_schulz_spectra(self):
+        """Animate measured singular values collapsing toward 1 under Newton-Schulz."""
+        
+        title = Text("Newton-Schulz in Action", font_size=48, color=CYAN_ACCENT)
+        title.to_edge(UP, buff=0.6)
+        
+        # Written by `scenes/newton_schulz.py`, or a smaller matrix run now
+        results = load_newton_schulz_benchmark() or newton_schulz_benchmark(shape=(128, 512))
+        rows, cols = results["shape"]
+        
+        subtitle = Text(
+            f"Singular values of a random {rows}×{cols} update",
+            font_size=24,
+            color=TEXT_GRAY
+        )
+        subtitle.next_to(title, DOWN, buff=0.3)
+        
+        axes = Axes(
+            x_range=[0, 1, 0.25],
+            y_range=[0, 1.4, 0.2],
+            x_length=8,
+            y_length=3.8,
+            axis_config={"color": TEXT_DIM, "include_tip": False},
+            y_axis_config={"numbers_to_include": [0, 0.5, 1.0]},
+        )
+        axes.move_to(DOWN * 0.6)
+        
+        x_label = Text("Singular value rank", font_size=18, color=TEXT_GRAY)
+        x_label.next_to(axes.x_axis, DOWN, buff=0.3)
+        
+        y_label = Text("σ", font_size=22, color=TEXT_GRAY)
+        y_label.next_to(axes.y_axis, LEFT, buff=0.3)
+        
+        target = DashedLine(
+            axes.c2p(0, 1),
+            axes.c2p(1, 1),
+            color=GREEN_ACCENT,
+            stroke_width=2
+        )
+        target_label = Text("σ = 1", font_size=18, color=GREEN_ACCENT)
+        target_label.next_to(target, RIGHT, buff=0.1)
+        
+        def spectrum_curve(spectrum, color):
+            # At most 128 points along the sorted spectrum
+            spectrum = np.asarray(spectrum)
+            picks = np.unique(np.linspace(0, len(spectrum) - 1, 128).round().astype(int))
+            return axes.plot_line_graph(
+                picks / max(len(spectrum) - 1, 1),
+                spectrum[picks],
+                line_color=color,
+                add_vertex_dots=False,
+                stroke_width=3
+            )
+        
+        def step_text(step):
+            if step == 0:
+                text = "Before: G / ‖G‖"
+            else:
+                text = f"Step {step}: {results['step_ms'][step - 1]:.0f} ms"
+            label = Text(text, font_size=22, color=PURPLE_PRIMARY)
+            label.next_to(axes, UP, buff=0.2).align_to(axes, LEFT)
+            return label
+        
+        total = Text(
+            f"{len(results['step_ms'])} steps in {sum(results['step_ms']):.0f} ms on CPU",
+            font_size=22,
+            color=ORANGE_ACCENT
+        )
+        total.to_edge(DOWN, buff=0.5)
+        
+        # Animate
+        self.play(Write(title), run_time=0.8)
+        self.play(FadeIn(subtitle), run_time=0.4)
+        self.play(Create(axes), FadeIn(x_label), FadeIn(y_label), run_time=0.5)
+        self.play(Create(target), FadeIn(target_label), run_time=0.4)
+        
+        curve = spectrum_curve(results["spectra"][0], BLUE_PRIMARY)
+        label = step_text(0)
+        self.play(Create(curve), FadeIn(label), run_time=0.6)
+        self.wait(0.5)
+        
+        for step, spectrum in enumerate(results["spectra"][1:], 1):
+            self.play(
+                Transform(curve, spectrum_curve(spectrum, PURPLE_PRIMARY)),
+                Transform(label, step_text(step)),
+                run_time=0.6
+            )
+            self.wait(0.3)
+        
+        self.play(FadeIn(total, shift=UP * 0.2), run_time=0.4)
+        
+        self.wait(2)
+        
+        # Transition
+        self.play(
+            FadeOut(title),
+            FadeOut(subtitle),
+            FadeOut(axes),
+            FadeOut(x_label),
+            FadeOut(y_label),
+            FadeOut(target),
+            FadeOut(target_label),
+            FadeOut(curve),
+            FadeOut(label),
+            FadeOut(total),
+            run_time=1
+        )
+    
     def play_training_loop(self):
         """Visualize the training loop."""
         
@@ -411,33 +688,9 @@ class BaseTrainingScene(Scene):
         y_label = Text("LR Multiplier", font_size=18, color=TEXT_GRAY)
         y_label.next_to(axes.y_axis, LEFT, buff=0.3).rotate(90 * DEGREES)
         
-        # LR curve with warmup and warmdown
-        warmup_ratio = 0.0
-        warmdown_ratio = 0.2
-        
-        def lr_func(x):
-            if x < warmup_ratio:
-                return x / warmup_ratio if warmup_ratio > 0 else 1.0
-            elif x > 1 - warmdown_ratio:
-                progress = (1 - x) / warmdown_ratio
-                return progress
-            else:
-                return 1.0
-        
-        lr_curve = axes.plot(
-            lr_func,
-            x_range=[0, 1, 0.01],
-            color=CYAN_ACCENT,
-            stroke_width=3
-        )
-        
-        # Annotations
-        warmdown_region = axes.get_area(
-            lr_curve,
-            x_range=[0.8, 1.0],
-            color=ORANGE_ACCENT,
-            opacity=0.3
-        )
+        # LR curve with warmup and warmdown, and the label of the sweep below
+        schedule = lr_schedule(axes, warmdown_ratio=0.2, final_lr_frac=0.0)
+        lr_curve, warmdown_region, sweep_label = schedule
         
         warmdown_label = Text("Warmdown\n(20%)", font_size=18, color=ORANGE_ACCENT)
         warmdown_label.move_to(axes.c2p(0.9, 0.7))
@@ -463,6 +716,23 @@ class BaseTrainingScene(Scene):
         
         self.wait(2)
         
+        # Sweep the warmdown length, then the final learning rate
+        self.play(FadeOut(warmdown_label), FadeIn(sweep_label), run_time=0.3)
+        for start, end, run_time in [
+            ((0.2, 0.0), (0.5, 0.0), 1.5),
+            ((0.5, 0.0), (0.2, 0.0), 1),
+            ((0.2, 0.0), (0.2, 0.3), 1.2),
+            ((0.2, 0.3), (0.2, 0.0), 0.8),
+        ]:
+            self.play(
+                UpdateFromAlphaFunc(
+                    schedule,
+                    functools.partial(sweep_lr_schedule, axes=axes, start=start, end=end)
+                ),
+                run_time=run_time
+            )
+        self.play(FadeOut(sweep_label), FadeIn(warmdown_label), run_time=0.3)
+        
         # Transition
         self.play(
             FadeOut(title),
@@ -8,6 +8,10 @@ try:
     from .common import *
 except ImportError:
     from common import *
+try:
+    from .reinforce import load_results as load_reinforce_results, simulate as simulate_reinforce
+except ImportError:
+    from reinforce import load_results as load_reinforce_results, simulate as simulate_reinforce
 import numpy as np
 
 
@@ -25,6 +29,7 @@ class RLScene(Scene):
         
         # Part 3: GSM8K example
         self.play_gsm8k_example()
+        self.play_reward_progress()
         
         # Part 4: Results
         self.play_rl_results()
@@ -180,34 +185,25 @@ class RLScene(Scene):
         problem_label.next_to(problem_box, UP, buff=0.05, aligned_edge=LEFT)
         problem_label.shift(LEFT * 4.5)
         
+        # The example problem of the REINFORCE simulation, sampled before training
+        results = self.reinforce_results()
+        example = results["example"]
+        sample_data = example["before"]
+        
         problem_text = Text(
-            "Janet's ducks lay 16 eggs per day. She sells the eggs\nat $2/dozen. How much does she make per week?",
+            f"Janet's ducks lay {example['eggs']} eggs per day. She sells the eggs\n"
+            f"at ${example['price']}/dozen. How much does she make per week?",
             font_size=20,
             color=TEXT_WHITE
         )
         problem_text.move_to(problem_box.get_center())
         
         # Multiple samples
-        samples_title = Text("16 samples generated:", font_size=20, color=TEXT_WHITE)
-        samples_title.next_to(problem_box, DOWN, buff=0.4)
-        
-        samples = VGroup()
-        sample_data = [
-            ("✓ $18.67", GREEN_ACCENT),
-            ("✗ $224", RED_ACCENT),
-            ("✓ $18.67", GREEN_ACCENT),
-            ("✗ $32", RED_ACCENT),
-            ("✓ $18.67", GREEN_ACCENT),
-            ("✗ $19", RED_ACCENT),
-            ("✓ $18.67", GREEN_ACCENT),
-            ("✗ $112", RED_ACCENT),
-        ]
         
-        for text, color in sample_data:
-            sample = Text(text, font_size=18, color=color)
-            samples.add(sample)
+        samples_title = Text(f"{len(sample_data)} samples generated:", font_size=20, color=TEXT_WHITE)
+        samples_title.next_to(problem_box, DOWN, buff=0.4)
         
-        samples.arrange_in_grid(rows=2, cols=4, buff=(0.5, 0.3))
+        samples = self.sample_grid(sample_data)
         samples.next_to(samples_title, DOWN, buff=0.3)
         
         # Reward calculation
@@ -218,9 +214,11 @@ class RLScene(Scene):
         )
         reward_box.move_to(DOWN * 2)
         
+        correct = sum(sample["correct"] for sample in sample_data)
+        mean_reward = correct / len(sample_data)
         reward_text = VGroup(
-            Text("Mean reward = 4/8 = 0.5", font_size=20, color=TEXT_WHITE),
-            Text("Correct samples get advantage +0.5", font_size=18, color=GREEN_ACCENT),
+            Text(f"Mean reward = {correct}/{len(sample_data)} = {mean_reward:.2f}", font_size=20, color=TEXT_WHITE),
+            Text(f"Correct samples get advantage +{1 - mean_reward:.2f}", font_size=18, color=GREEN_ACCENT),
         )
         reward_text.arrange(DOWN, buff=0.1)
         reward_text.move_to(reward_box.get_center())
@@ -231,8 +229,10 @@ class RLScene(Scene):
         self.play(FadeIn(problem_text), run_time=0.4)
         self.play(FadeIn(samples_title), run_time=0.3)
         
-        for sample in samples:
-            self.play(FadeIn(sample, scale=0.9), run_time=0.1)
+        self.play(
+            LaggedStart(*[FadeIn(sample, scale=0.9) for sample in samples], lag_ratio=0.3),
+            run_time=0.8
+        )
         
         self.play(FadeIn(reward_box), FadeIn(reward_text), run_time=0.5)
         
@@ -251,6 +251,119 @@ class RLScene(Scene):
             run_time=1
         )
     
+    def reinforce_results(self):
+        """Written by `scenes/reinforce.py`, or simulated now (well under a second)."""
+        if not hasattr(self, "_reinforce_results"):
+            self._reinforce_results = load_reinforce_results() or simulate_reinforce()
+        return self._reinforce_results
+    
+    def sample_grid(self, sample_data, cols=8):
+        """Pass/fail answers of sampled solutions, in a grid."""
+        samples = VGroup()
+        for sample in sample_data:
+            mark = "✓" if sample["correct"] else "✗"
+            color = GREEN_ACCENT if sample["correct"] else RED_ACCENT
+            samples.add(Text(f"{mark} ${sample['answer']:g}", font_size=16, color=color))
+        samples.arrange_in_grid(cols=cols, buff=(0.35, 0.3))
+        return samples
+    
+    def play_reward_progress(self):
+        """Animate the measured reward of the REINFORCE simulation."""
+        
+        title = Text("Reward During Training", font_size=48, color=CYAN_ACCENT)
+        title.to_edge(UP, buff=0.6)
+        
+        results = self.reinforce_results()
+        rewards = results["reward"]
+        
+        subtitle = Text(
+            f"Toy simulation: {results['batch_size']} problems × {results['group_size']} samples per step",
+            font_size=22,
+            color=TEXT_GRAY
+        )
+        subtitle.next_to(title, DOWN, buff=0.3)
+        
+        axes = Axes(
+            x_range=[0, len(rewards), max(len(rewards) // 4, 1)],
+            y_range=[0, 1, 0.25],
+            x_length=6,
+            y_length=3.5,
+            axis_config={"color": TEXT_DIM, "include_tip": False},
+            x_axis_config={"numbers_to_include": [0, len(rewards)]},
+            y_axis_config={"numbers_to_include": [0, 0.5, 1]},
+        )
+        axes.move_to(LEFT * 3 + DOWN * 0.6)
+        
+        x_label = Text("Step", font_size=18, color=TEXT_GRAY)
+        x_label.next_to(axes.x_axis, DOWN, buff=0.3)
+        
+        y_label = Text("Mean reward", font_size=18, color=TEXT_GRAY)
+        y_label.next_to(axes.y_axis, LEFT, buff=0.3).rotate(90 * DEGREES)
+        
+        reward_curve = axes.plot_line_graph(
+            np.arange(1, len(rewards) + 1),
+            rewards,
+            line_color=ORANGE_ACCENT,
+            add_vertex_dots=False,
+            stroke_width=2
+        )
+        
+        eval_dots = VGroup(*[
+            Dot(axes.c2p(entry["step"], entry["pass_rate"]), radius=0.05, color=GREEN_ACCENT)
+            for entry in results["eval"]
+        ])
+        
+        legend = VGroup(
+            Text("Batch reward", font_size=16, color=ORANGE_ACCENT),
+            Text("Held-out pass rate", font_size=16, color=GREEN_ACCENT),
+        )
+        legend.arrange(DOWN, aligned_edge=LEFT, buff=0.1)
+        legend.next_to(axes, UP, buff=0.2).align_to(axes, LEFT)
+        
+        # The example problem again, after training
+        after_title = Text("Same problem, after training:", font_size=20, color=TEXT_WHITE)
+        after = self.sample_grid(results["example"]["after"], cols=4)
+        after_group = VGroup(after_title, after).arrange(DOWN, buff=0.3)
+        after_group.move_to(RIGHT * 3.8 + DOWN * 0.4)
+        
+        first, last = results["eval"][0]["pass_rate"], results["eval"][-1]["pass_rate"]
+        summary = Text(
+            f"Held-out pass rate: {first:.0%} → {last:.0%}",
+            font_size=24,
+            color=GREEN_ACCENT
+        )
+        summary.to_edge(DOWN, buff=0.5)
+        
+        # Animate
+        self.play(Write(title), run_time=0.8)
+        self.play(FadeIn(subtitle), run_time=0.4)
+        self.play(Create(axes), FadeIn(x_label), FadeIn(y_label), FadeIn(legend), run_time=0.5)
+        self.play(Create(reward_curve), run_time=2, rate_func=linear)
+        self.play(LaggedStart(*[FadeIn(dot, scale=0.5) for dot in eval_dots], lag_ratio=0.2), run_time=0.8)
+        self.play(FadeIn(after_title), run_time=0.3)
+        self.play(
+            LaggedStart(*[FadeIn(sample, scale=0.9) for sample in after], lag_ratio=0.3),
+            run_time=0.8
+        )
+        self.play(FadeIn(summary, shift=UP * 0.2), run_time=0.4)
+        
+        self.wait(2)
+        
+        # Transition
+        self.play(
+            FadeOut(title),
+            FadeOut(subtitle),
+            FadeOut(axes),
+            FadeOut(x_label),
+            FadeOut(y_label),
+            FadeOut(legend),
+            FadeOut(reward_curve),
+            FadeOut(eval_dots),
+            FadeOut(after_group),
+            FadeOut(summary),
+            run_time=1
+        )
+    
     def play_rl_results(self):
         """Show RL training results."""
         
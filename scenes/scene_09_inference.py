@@ -8,6 +8,14 @@ try:
     from .common import *
 except ImportError:
     from common import *
+try:
+    from .kv_cache import benchmark as kv_cache_benchmark, load_benchmark as load_kv_cache_benchmark
+except ImportError:
+    from kv_cache import benchmark as kv_cache_benchmark, load_benchmark as load_kv_cache_benchmark
+try:
+    from .sampling import EXAMPLE_TOKENS, temperature_sweep
+except ImportError:
+    from sampling import EXAMPLE_TOKENS, temperature_sweep
 import numpy as np
 
 
@@ -22,6 +30,7 @@ class InferenceScene(Scene):
         
         # Part 2: KV Cache
         self.play_kv_cache()
+        self.play_kv_cache_trace()
         
         # Part 3: Sampling strategies
         self.play_sampling()
@@ -256,6 +265,150 @@ class InferenceScene(Scene):
             run_time=1
         )
     
+    def play_kv_cache_trace(self):
+        """Plot measured per-token latency and animate the KV cache filling."""
+        
+        title = Text("KV Cache, Measured", font_size=48, color=CYAN_ACCENT)
+        title.to_edge(UP, buff=0.6)
+        
+        # Written by `scenes/kv_cache.py`, or a short run of the toy decoder
+        results = load_kv_cache_benchmark() or kv_cache_benchmark(tokens=128)
+        without = results["no_cache"]
+        cached = results["cache"]
+        
+        # Latency per generated token
+        contexts = [entry["context"] for entry in without]
+        max_latency = max(entry["latency_ms"] for entry in without + cached)
+        axes = Axes(
+            x_range=[0, contexts[-1], max(contexts[-1] // 4, 1)],
+            y_range=[0, max_latency * 1.1, max_latency * 1.1 / 4],
+            x_length=6,
+            y_length=3.5,
+            axis_config={"color": TEXT_DIM, "include_tip": False},
+            x_axis_config={"numbers_to_include": [0, contexts[-1]]},
+        )
+        axes.move_to(LEFT * 2.8 + DOWN * 0.4)
+        
+        x_label = Text("Context length", font_size=18, color=TEXT_GRAY)
+        x_label.next_to(axes.x_axis, DOWN, buff=0.3)
+        
+        y_label = Text("ms / token", font_size=18, color=TEXT_GRAY)
+        y_label.next_to(axes.y_axis, LEFT, buff=0.3).rotate(90 * DEGREES)
+        
+        curves = VGroup()
+        for trace, color in [(without, RED_ACCENT), (cached, GREEN_ACCENT)]:
+            curves.add(axes.plot_line_graph(
+                [entry["context"] for entry in trace],
+                [entry["latency_ms"] for entry in trace],
+                line_color=color,
+                add_vertex_dots=False,
+                stroke_width=2
+            ))
+        
+        legend = VGroup(
+            Text("Without cache", font_size=16, color=RED_ACCENT),
+            Text("With KV cache", font_size=16, color=GREEN_ACCENT),
+        )
+        legend.arrange(DOWN, aligned_edge=LEFT, buff=0.1)
+        legend.next_to(axes, UP, buff=0.2).align_to(axes, LEFT)
+        
+        # Cache slots for the first tokens; a full cache doubles its capacity.
+        # At most 32 squares are drawn (a ring buffer can hold hundreds of
+        # positions), each one standing for per_slot positions
+        fill_steps = cached[:16]
+        max_capacity = max(entry["capacity"] for entry in fill_steps)
+        per_slot = -(-max_capacity // 32)
+        slot_count = -(-max_capacity // per_slot)
+        slots = VGroup(*[
+            Square(
+                side_length=0.35,
+                fill_color=TEXT_DIM,
+                fill_opacity=0.1,
+                stroke_color=TEXT_DIM,
+                stroke_width=0.5
+            )
+            for _ in range(slot_count)
+        ])
+        slots.arrange_in_grid(cols=8, buff=0.05)
+        slots.move_to(RIGHT * 3.5 + UP * 0.5)
+        
+        cache_title = Text("Cache slots", font_size=22, color=TEXT_WHITE)
+        cache_title.next_to(slots, UP, buff=0.3)
+        
+        def capacity_text(entry):
+            text = Text(
+                f"{entry['cached']} tokens · capacity {entry['capacity']} · {entry['kv_bytes'] / 1024:.0f} KB"
+                + (f"\n1 square = {per_slot} positions" if per_slot > 1 else ""),
+                font_size=18,
+                color=TEXT_GRAY
+            )
+            text.next_to(slots, DOWN, buff=0.3)
+            return text
+        
+        total_without = sum(entry["latency_ms"] for entry in without)
+        total_cached = sum(entry["latency_ms"] for entry in cached)
+        perf_note = Text(
+            f"{len(cached)} tokens: {total_without:.0f} ms without cache, {total_cached:.0f} ms with it "
+            f"({total_without / total_cached:.1f}× faster)",
+            font_size=22,
+            color=ORANGE_ACCENT
+        )
+        perf_note.to_edge(DOWN, buff=0.5)
+        
+        # Animate
+        self.play(Write(title), run_time=0.8)
+        self.play(Create(axes), FadeIn(x_label), FadeIn(y_label), run_time=0.5)
+        self.play(FadeIn(legend), run_time=0.3)
+        self.play(*[Create(curve) for curve in curves], run_time=1.5)
+        
+        def drawn(capacity):
+            return -(-capacity // per_slot)
+        
+        shown = drawn(fill_steps[0]["capacity"])
+        self.play(FadeIn(cache_title), FadeIn(slots[:shown]), run_time=0.4)
+        label = capacity_text(fill_steps[0])
+        self.play(FadeIn(label), run_time=0.2)
+        filled = set()
+        for entry in fill_steps:
+            animations = []
+            if drawn(entry["capacity"]) > shown:
+                # Grown by doubling: the new slots appear
+                animations.append(FadeIn(slots[shown:drawn(entry["capacity"])], scale=0.8))
+                shown = drawn(entry["capacity"])
+            position = (entry["cached"] - 1) % entry["capacity"]
+            filled.add(position)
+            index = position // per_slot
+            slot = slots[index]
+            new_label = capacity_text(entry)
+            self.play(
+                *animations,
+                slot.animate.set_fill(GREEN_ACCENT, opacity=0.6),
+                Transform(label, new_label),
+                run_time=0.15
+            )
+            # A square shades in as the positions it stands for fill up
+            used = sum(1 for p in filled if p // per_slot == index)
+            slot.set_fill(BLUE_PRIMARY, opacity=0.15 + 0.45 * used / per_slot)
+        
+        self.play(FadeIn(perf_note, shift=UP * 0.2), run_time=0.4)
+        
+        self.wait(2)
+        
+        # Transition
+        self.play(
+            FadeOut(title),
+            FadeOut(axes),
+            FadeOut(x_label),
+            FadeOut(y_label),
+            FadeOut(curves),
+            FadeOut(legend),
+            FadeOut(cache_title),
+            FadeOut(slots[:shown]),
+            FadeOut(label),
+            FadeOut(perf_note),
+            run_time=1
+        )
+    
     def play_sampling(self):
         """Show temperature and top-k sampling."""
         
@@ -266,22 +419,25 @@ class InferenceScene(Scene):
         temp_label = Text("Temperature Controls Randomness", font_size=26, color=TEXT_WHITE)
         temp_label.next_to(title, DOWN, buff=0.5)
         
-        # Create probability distributions
-        def create_prob_bars(probs, label, color, position):
+        # Create probability distributions; the last bar holds the rest of
+        # the 65,536-token vocabulary, white ticks the sampled frequencies
+        def create_prob_bars(probs, label, color, position, rest=None, sampled=None):
             group = VGroup()
             bar_group = VGroup()
             
-            tokens = ["the", "a", "blue", "sky", "is"]
+            tokens = EXAMPLE_TOKENS + (["…"] if rest is not None else [])
+            probs = list(probs) + ([rest] if rest is not None else [])
             max_height = 2
             bar_width = 0.4
             
             for i, (token, prob) in enumerate(zip(tokens, probs)):
+                bar_color = TEXT_DIM if i == len(EXAMPLE_TOKENS) else color
                 bar = Rectangle(
                     width=bar_width,
-                    height=prob * max_height,
-                    fill_color=color,
+                    height=max(prob * max_height, 0.01),
+                    fill_color=bar_color,
                     fill_opacity=0.7,
-                    stroke_color=color,
+                    stroke_color=bar_color,
                     stroke_width=1
                 )
                 bar.align_to(ORIGIN, DOWN)
@@ -292,6 +448,12 @@ class InferenceScene(Scene):
                 
                 bar_group.add(VGroup(bar, token_label))
             
+            if sampled is not None:
+                for (bar, _), frequency in zip(bar_group, sampled):
+                    tick = Line(LEFT * bar_width / 2, RIGHT * bar_width / 2, color=TEXT_WHITE, stroke_width=2)
+                    tick.move_to(bar.get_bottom() + UP * frequency * max_height)
+                    bar_group.add(tick)
+            
             bar_group.move_to(position)
             
             title_text = Text(label, font_size=18, color=color, weight=BOLD)
@@ -300,27 +462,38 @@ class InferenceScene(Scene):
             group.add(bar_group, title_text)
             return group
         
-        # Different temperatures
-        low_temp = create_prob_bars(
-            [0.9, 0.05, 0.02, 0.02, 0.01],
-            "T=0.1 (Focused)",
-            BLUE_PRIMARY,
-            LEFT * 3.5 + DOWN * 0.5
-        )
-        
-        mid_temp = create_prob_bars(
-            [0.5, 0.2, 0.15, 0.1, 0.05],
-            "T=1.0 (Balanced)",
-            PURPLE_PRIMARY,
-            DOWN * 0.5
-        )
-        
-        high_temp = create_prob_bars(
-            [0.25, 0.22, 0.2, 0.18, 0.15],
-            "T=2.0 (Random)",
-            RED_ACCENT,
-            RIGHT * 3.5 + DOWN * 0.5
-        )
+        # Different temperatures, with 1,000 samples each
+        temperatures = temperature_sweep([0.1, 1.0, 2.0])
+        
+        charts = VGroup()
+        for i, (label, color, position) in enumerate([
+            ("T=0.1 (Focused)", BLUE_PRIMARY, LEFT * 3.5 + DOWN * 0.5),
+            ("T=1.0 (Balanced)", PURPLE_PRIMARY, DOWN * 0.5),
+            ("T=2.0 (Random)", RED_ACCENT, RIGHT * 3.5 + DOWN * 0.5),
+        ]):
+            charts.add(create_prob_bars(
+                temperatures["probs"][i],
+                label,
+                color,
+                position,
+                rest=temperatures["rest"][i],
+                sampled=temperatures["sampled"][i]
+            ))
+        low_temp, mid_temp, high_temp = charts
+        
+        # Smooth sweep, every temperature computed in one batched call
+        sweep = temperature_sweep(np.linspace(0.1, 2.0, 96))
+        sweep_charts = [
+            create_prob_bars(
+                sweep["probs"][i],
+                f"T={temperature:.2f} · entropy {sweep['entropy'][i]:.1f} bits",
+                ORANGE_ACCENT,
+                DOWN * 0.5,
+                rest=sweep["rest"][i]
+            )
+            for i, temperature in enumerate(sweep["temperatures"])
+        ]
+        sweep_group = sweep_charts[0].copy()
         
         # Top-k explanation
         topk_text = Text(
@@ -330,6 +503,16 @@ class InferenceScene(Scene):
         )
         topk_text.to_edge(DOWN, buff=0.8)
         
+        top_k = temperature_sweep([2.0], top_k=50)
+        topk_chart = create_prob_bars(
+            top_k["probs"][0],
+            "T=2.0, top-k=50",
+            GREEN_ACCENT,
+            DOWN * 0.5,
+            rest=top_k["rest"][0],
+            sampled=top_k["sampled"][0]
+        )
+        
         # Animate
         self.play(Write(title), run_time=0.8)
         self.play(FadeIn(temp_label), run_time=0.4)
@@ -338,7 +521,15 @@ class InferenceScene(Scene):
         self.play(FadeIn(mid_temp), run_time=0.4)
         self.play(FadeIn(high_temp), run_time=0.4)
         
+        self.wait(2)
+        
+        self.play(FadeOut(charts), run_time=0.4)
+        self.add(sweep_group)
+        self.play(flipbook(sweep_group, sweep_charts), run_time=3, rate_func=linear)
+        self.wait(0.5)
+        
         self.play(FadeIn(topk_text), run_time=0.4)
+        self.play(ReplacementTransform(sweep_group, topk_chart), run_time=0.6)
         
         self.wait(2)
         
@@ -346,9 +537,7 @@ class InferenceScene(Scene):
         self.play(
             FadeOut(title),
             FadeOut(temp_label),
-            FadeOut(low_temp),
-            FadeOut(mid_temp),
-            FadeOut(high_temp),
+            FadeOut(topk_chart),
             FadeOut(topk_text),
             run_time=1
         )